@@ -0,0 +1,3 @@
+"""
+Video Spell Checker - бенчмарки производительности
+"""
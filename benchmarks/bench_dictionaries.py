@@ -0,0 +1,86 @@
+"""
+Бенчмарк загрузки словарей Hunspell: разбор текста против загрузки снимков
+
+Словари копируются во временный каталог, поэтому снимки в dictionaries/
+не создаются и не используются.
+
+Использование:
+    python -m benchmarks.bench_dictionaries
+    python -m benchmarks.bench_dictionaries --repeat 5 --dictionaries path/to/dictionaries
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from spylls.hunspell import Dictionary
+
+from src.dict_snapshot import load_dictionaries_async, load_dictionary, snapshot_path
+
+LANGUAGES = {'ru': 'ru_RU', 'en': 'en_US'}
+
+
+def best_of(repeat, func):
+    """Минимальное время выполнения func из repeat запусков, сек"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк загрузки словарей")
+    parser.add_argument("--dictionaries", default=str(Path(__file__).parent.parent / "dictionaries"),
+                        help="Каталог со словарями ru_RU и en_US")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов (берется лучшее время)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {}
+        for language, name in LANGUAGES.items():
+            for suffix in ('.aff', '.dic'):
+                shutil.copy2(Path(args.dictionaries) / f"{name}{suffix}", tmp_dir)
+            paths[language] = Path(tmp_dir) / name
+
+        def parse_text():
+            for path in paths.values():
+                Dictionary.from_files(str(path))
+
+        def build_snapshots():
+            for path in paths.values():
+                snapshot_path(path).unlink(missing_ok=True)
+                load_dictionary(path)
+
+        def load_sequential():
+            for path in paths.values():
+                _, from_snapshot = load_dictionary(path)
+                assert from_snapshot
+
+        def load_parallel():
+            for future in load_dictionaries_async(paths).values():
+                _, from_snapshot = future.result()
+                assert from_snapshot
+
+        rows = [
+            ("разбор .aff/.dic (как раньше)", best_of(args.repeat, parse_text)),
+            ("первый запуск: разбор + снимок", best_of(args.repeat, build_snapshots)),
+            ("снимки, последовательно", best_of(args.repeat, load_sequential)),
+            ("снимки, параллельно", best_of(args.repeat, load_parallel)),
+        ]
+        sizes = ", ".join(f"{snapshot_path(path).name} {snapshot_path(path).stat().st_size / 1e6:.1f} МБ"
+                          for path in paths.values())
+
+    baseline = rows[0][1]
+    print(f"\nЗагрузка словарей {' + '.join(LANGUAGES.values())} (лучшее из {args.repeat})\n")
+    print(f"{'способ':>32} | {'время, с':>8} | {'ускорение':>9}")
+    print("-" * 56)
+    for title, seconds in rows:
+        print(f"{title:>32} | {seconds:8.2f} | {baseline / seconds:8.1f}x")
+    print(f"\nРазмер снимков: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
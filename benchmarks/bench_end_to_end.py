@@ -0,0 +1,330 @@
+"""
+Сквозной бенчмарк проверки: синтетические видео с известным текстом и опечатками
+
+Для каждого сценария генерируется ролик (benchmarks.synthetic): слайды с
+русскими и английскими фразами, в часть слов которых внесены опечатки,
+статичные и часто меняющиеся слайды, субтитры, несколько разрешений и
+длительностей. Ролик проверяется VideoSpellChecker.process_video() так же,
+как из командной строки, и записываются:
+
+- скорость (обработанных кадров в секунду) и время работы стадий конвейера;
+- пиковый RSS процесса;
+- точность и полнота по внесенным опечаткам (по различным словам).
+
+Результаты сохраняются в JSON (с версией кода из git), который можно
+сравнить с результатами другого коммита (--compare). Нужен только CPU;
+модели EasyOCR и словари должны быть загружены заранее (первым обычным
+запуском), после этого бенчмарк работает без сети.
+
+Использование:
+    python -m benchmarks.bench_end_to_end
+    python -m benchmarks.bench_end_to_end --suite full --output bench.json
+    python -m benchmarks.bench_end_to_end --scenarios static-720p --compare bench-old.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+from benchmarks.synthetic import Slide, TextRenderer, write_slides_video
+from src import ocr
+from src.ocr_profiles import DEFAULT_PROFILE, OCR_PROFILES
+from src.tokenizer import normalize
+
+# Версия формата файла результатов
+BENCH_FORMAT = 1
+
+SENTENCES_RU = [
+    "Проверка орфографии в видео",
+    "Распознавание текста на кадрах",
+    "Добро пожаловать на наш курс",
+    "Сегодня мы изучим основы программирования",
+    "Переменные и типы данных",
+    "Условные операторы и циклы",
+    "Функции возвращают значение",
+    "Домашнее задание к следующему уроку",
+    "Результаты работы программы",
+    "Спасибо за внимание",
+]
+SENTENCES_EN = [
+    "Video spell checking",
+    "Text recognition on frames",
+    "Welcome to the course",
+    "Today we learn programming basics",
+    "Variables and data types",
+    "Functions return a value",
+    "Thank you for watching",
+]
+VOWELS = "аеиоуыэюяaeiou"
+
+
+class Scenario(NamedTuple):
+    """Сценарий бенчмарка"""
+    name: str
+    size: Tuple[int, int]   # Ширина и высота кадра
+    slides: int             # Количество слайдов
+    seconds: float          # Длительность показа слайда
+    caption: bool = False   # Субтитры внизу кадра вместо текста по центру
+    background: bool = True  # Движущийся фон (кадры меняются и без смены слайда)
+
+
+SUITES = {
+    'quick': [
+        Scenario('static-720p', (1280, 720), 3, 8.0, background=False),
+        Scenario('changing-720p', (1280, 720), 12, 2.0),
+        Scenario('captions-360p', (640, 360), 8, 3.0, caption=True),
+        Scenario('static-1080p', (1920, 1080), 3, 8.0, background=False),
+    ],
+}
+SUITES['full'] = SUITES['quick'] + [
+    Scenario('long-720p', (1280, 720), 40, 6.0),
+    Scenario('captions-1080p', (1920, 1080), 30, 2.0, caption=True),
+    Scenario('static-4k', (3840, 2160), 3, 8.0, background=False),
+]
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Опечатка в слове: перестановка, пропуск, удвоение буквы или замена гласной"""
+    letters = list(word)
+    position = rng.randrange(1, len(letters) - 1)
+    operation = rng.choice(('swap', 'drop', 'double', 'vowel'))
+    if operation == 'swap':
+        letters[position], letters[position + 1] = letters[position + 1], letters[position]
+    elif operation == 'drop':
+        del letters[position]
+    elif operation == 'double':
+        letters.insert(position, letters[position])
+    else:
+        vowels = [idx for idx, letter in enumerate(letters) if letter.lower() in VOWELS and idx > 0]
+        if vowels:
+            idx = rng.choice(vowels)
+            letters[idx] = rng.choice([vowel for vowel in VOWELS if vowel != letters[idx].lower()
+                                       and vowel.isascii() == letters[idx].isascii()])
+    return ''.join(letters)
+
+
+def plant_typo(line: str, checker, rng: random.Random) -> Tuple[str, Optional[str]]:
+    """
+    Вносит опечатку в одно из слов строки
+
+    Опечатка принимается, только если проверка считает ее ошибкой (а не
+    другим словарным словом).
+
+    Returns:
+        Строка и слово с опечаткой (None, если подходящей опечатки не нашлось)
+    """
+    words = [word for word in line.split() if len(word) >= 5 and word.isalpha()]
+    for _ in range(20):
+        if not words:
+            break
+        word = rng.choice(words)
+        typo = misspell(word, rng)
+        if typo != word and [m.word for m in checker.find_misspellings(typo)] == [typo]:
+            return line.replace(word, typo, 1), typo
+    return line, None
+
+
+def make_slides(scenario: Scenario, sentences: List[str], checker, typo_rate: float,
+                rng: random.Random) -> Tuple[List[Slide], Set[str]]:
+    """Слайды сценария и внесенные опечатки (нормализованные слова)"""
+    slides, planted = [], set()
+    for _ in range(scenario.slides):
+        lines = rng.sample(sentences, 1 if scenario.caption else 2)
+        if rng.random() < typo_rate:
+            idx = rng.randrange(len(lines))
+            lines[idx], typo = plant_typo(lines[idx], checker, rng)
+            if typo:
+                planted.add(normalize(typo))
+        slides.append(Slide(tuple(lines), scenario.seconds, caption=scenario.caption))
+    return slides, planted
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Пиковый RSS процесса в МБ (None, если не удалось определить)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux - в КБ, macOS - в байтах
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / (1024 * 1024)
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def git_revision() -> Optional[str]:
+    """Текущий коммит (с пометкой -dirty при незакоммиченных изменениях)"""
+    try:
+        root = Path(__file__).parent.parent
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(checker, scenario: Scenario, work_dir: Path, renderer: TextRenderer, args) -> dict:
+    """Генерирует ролик сценария, проверяет его и возвращает измерения"""
+    from src.spelling import DEFAULT_VERDICT_CACHE_SIZE, LruCache, SuggestionCache
+
+    rng = random.Random(f"{args.seed}:{scenario.name}")
+    sentences = SENTENCES_RU + SENTENCES_EN if renderer.supports_cyrillic else SENTENCES_EN
+    slides, planted = make_slides(scenario, sentences, checker, args.typo_rate, rng)
+    video_path = work_dir / f"{scenario.name}.mp4"
+    write_slides_video(str(video_path), slides, size=scenario.size, background=scenario.background,
+                       renderer=renderer)
+
+    # Кэши проверки слов - пустые в каждом сценарии
+    checker.verdict_cache = LruCache(DEFAULT_VERDICT_CACHE_SIZE)
+    checker.suggestion_cache = SuggestionCache()
+    view = checker.with_output(work_dir / scenario.name, log=lambda _: None)
+
+    started = time.perf_counter()
+    result = view.process_video(str(video_path), interval=args.interval, ocr_batch=args.ocr_batch)
+    elapsed = time.perf_counter() - started
+
+    flagged = {normalize(error['word']) for error in result['errors_details']}
+    peak_rss = peak_rss_mb()
+    true_positives = planted & flagged
+    return {
+        'name': scenario.name,
+        'size': list(scenario.size),
+        'duration_s': scenario.slides * scenario.seconds,
+        'slides': scenario.slides,
+        'caption': scenario.caption,
+        'background': scenario.background,
+        'frames': result['total_frames'],
+        'ocr_skipped': result['ocr_skipped'],
+        'elapsed_s': round(elapsed, 3),
+        'frames_per_s': round(result['total_frames'] / elapsed, 3) if elapsed else 0.0,
+        # Время собственной работы стадий: доля времени конвейера * время обработки
+        'stages_s': {name: round(utilization * elapsed, 3)
+                     for name, utilization in result['stage_utilization'].items()},
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'planted': len(planted),
+        'flagged': len(flagged),
+        'true_positives': len(true_positives),
+        'precision': round(len(true_positives) / len(flagged), 4) if flagged else None,
+        'recall': round(len(true_positives) / len(planted), 4) if planted else None,
+        'missed': sorted(planted - flagged),
+        'false_positives': sorted(flagged - planted)[:50],
+    }
+
+
+def print_table(scenarios: List[dict], baseline: dict = None):
+    """Таблица результатов; с baseline - отношение скорости к базовому запуску"""
+    previous = {item['name']: item for item in (baseline or {}).get('scenarios', [])}
+    print(f"\n{'сценарий':>15} | {'кадров':>6} | {'кадров/с':>8} | {'RSS, МБ':>8} | "
+          f"{'точность':>8} | {'полнота':>7}" + (" | к базовому" if baseline else ""))
+    print("-" * (78 if baseline else 66))
+    for item in scenarios:
+        precision = f"{item['precision']:.0%}" if item['precision'] is not None else "-"
+        recall = f"{item['recall']:.0%}" if item['recall'] is not None else "-"
+        rss = f"{item['peak_rss_mb']:.0f}" if item['peak_rss_mb'] else "-"
+        row = (f"{item['name']:>15} | {item['frames']:6d} | {item['frames_per_s']:8.2f} | {rss:>8} | "
+               f"{precision:>8} | {recall:>7}")
+        if baseline:
+            old = previous.get(item['name'])
+            ratio = f"{item['frames_per_s'] / old['frames_per_s']:.2f}x" if old and old['frames_per_s'] else "-"
+            row += f" | {ratio:>11}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк проверки на синтетических видео")
+    parser.add_argument("--suite", choices=list(SUITES), default="quick",
+                        help="Набор сценариев (quick - 4 ролика, full - 7, включая 4K)")
+    parser.add_argument("--scenarios", nargs="+", metavar="NAME", help="Только указанные сценарии")
+    parser.add_argument("--interval", type=int, default=1, help="Интервал между кадрами, сек")
+    parser.add_argument("--profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE, help="Профиль OCR")
+    parser.add_argument("--ocr-batch", type=int, default=ocr.DEFAULT_OCR_BATCH, metavar="K")
+    parser.add_argument("--workers", type=int, default=1, metavar="N", help="Процессов OCR")
+    parser.add_argument("--typo-rate", type=float, default=0.6, help="Доля слайдов с опечаткой")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="Файл результатов JSON (по умолчанию bench-e2e-<коммит>-<дата>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="Сравнить с результатами другого запуска")
+    args = parser.parse_args()
+
+    from src.video_speller import VideoSpellChecker
+
+    scenarios = SUITES['full'] if args.scenarios else SUITES[args.suite]
+    if args.scenarios:
+        unknown = set(args.scenarios) - {scenario.name for scenario in scenarios}
+        if unknown:
+            parser.error(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenarios]
+    # Сценарии по возрастанию размера кадра: пиковый RSS процесса относится к текущему сценарию
+    scenarios = sorted(scenarios, key=lambda scenario: scenario.size[0] * scenario.size[1])
+
+    revision = git_revision()
+    renderer = TextRenderer()
+    report = {
+        'format': BENCH_FORMAT,
+        'revision': revision,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'suite': args.suite, 'interval': args.interval, 'profile': args.profile,
+                     'ocr_batch': args.ocr_batch, 'workers': args.workers, 'typo_rate': args.typo_rate,
+                     'seed': args.seed, 'cyrillic': renderer.supports_cyrillic},
+        'scenarios': [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(tmp_dir)
+        custom_dictionary = work_dir / "custom_dictionary.txt"
+        custom_dictionary.write_text("", encoding='utf-8')
+
+        started = time.perf_counter()
+        checker = VideoSpellChecker(output_dir=str(work_dir / "out"), custom_dict_path=str(custom_dictionary),
+                                    ocr_profile=args.profile, workers=args.workers)
+        report['load_s'] = round(time.perf_counter() - started, 3)
+        try:
+            for scenario in scenarios:
+                print(f"Сценарий {scenario.name}: {scenario.size[0]}x{scenario.size[1]}, "
+                      f"{scenario.slides} слайдов по {scenario.seconds:g} с...")
+                report['scenarios'].append(run_scenario(checker, scenario, work_dir, renderer, args))
+        finally:
+            checker.close()
+
+    output = Path(args.output or f"bench-e2e-{revision or 'unknown'}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    baseline = json.loads(Path(args.compare).read_text(encoding='utf-8')) if args.compare else None
+    print(f"\nЗагрузка моделей и словарей: {report['load_s']:.1f} с, версия: {revision or 'неизвестна'}")
+    if baseline:
+        print(f"Базовый запуск: {baseline.get('revision') or 'неизвестна'} ({baseline.get('date')})")
+    print_table(report['scenarios'], baseline)
+    print(f"\nРезультаты сохранены: {output}")
+
+
+if __name__ == "__main__":
+    main()
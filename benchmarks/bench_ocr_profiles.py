@@ -0,0 +1,98 @@
+"""
+Бенчмарк профилей OCR: кадров в секунду и полнота распознавания слов
+
+На эталонном синтетическом ролике с известным текстом для каждого профиля
+измеряется скорость распознавания и доля слов эталона, найденных OCR.
+
+Использование:
+    python -m benchmarks.bench_ocr_profiles
+    python -m benchmarks.bench_ocr_profiles --size 3840x2160 --profiles fast balanced
+    python -m benchmarks.bench_ocr_profiles --ocr-batch 1 4 8
+"""
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import Slide, TextRenderer, slide_at, write_slides_video
+from src import ocr
+from src.frame_source import FrameSource
+from src.ocr_profiles import OCR_PROFILES
+
+SLIDES_RU = [
+    Slide(("Проверка орфографии в видео", "Распознавание текста на кадрах"), 4),
+    Slide(("Добро пожаловать на курс",), 4, caption=True),
+    Slide(("Сегодня мы изучим основы программирования",), 4, caption=True),
+    Slide(("Глава первая", "Переменные и типы данных"), 4),
+]
+SLIDES_EN = [
+    Slide(("Video spell checking", "Text recognition on frames"), 4),
+    Slide(("Welcome to the course",), 4, caption=True),
+    Slide(("Today we learn programming basics",), 4, caption=True),
+    Slide(("Chapter one", "Variables and data types"), 4),
+]
+
+WORD_PATTERN = re.compile(r'[а-яёa-z]{3,}')
+
+
+def words(text: str) -> set:
+    return set(WORD_PATTERN.findall(text.lower().replace('ё', 'е')))
+
+
+def run_profile(reader, video_path, spans, profile_name, interval, ocr_batch=1):
+    """Возвращает (кадров в секунду, полнота)"""
+    profile = OCR_PROFILES[profile_name]
+    source = FrameSource(video_path, interval, sampling='seek', log=lambda _: None)
+    sampled = list(source)
+    expected_total = found_total = 0
+    elapsed = 0.0
+
+    for start in range(0, len(sampled), ocr_batch):
+        chunk = sampled[start:start + ocr_batch]
+        started = time.perf_counter()
+        batch_results = ocr.recognize_batch(reader, [frame for _, _, frame in chunk], None, profile)
+        elapsed += time.perf_counter() - started
+
+        for (frame_num, _, _), results in zip(chunk, batch_results):
+            slide = slide_at(spans, frame_num)
+            expected = words(' '.join(slide.lines)) if slide else set()
+            recognized = words(' '.join(text for _, text, _ in results))
+            expected_total += len(expected)
+            found_total += len(expected & recognized)
+
+    return len(sampled) / elapsed if elapsed else 0.0, found_total / expected_total if expected_total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк профилей OCR")
+    parser.add_argument("--size", default="1920x1080", help="Размер кадра эталонного ролика")
+    parser.add_argument("--interval", type=float, default=1, help="Интервал между кадрами, сек")
+    parser.add_argument("--profiles", nargs="+", choices=list(OCR_PROFILES), default=list(OCR_PROFILES))
+    parser.add_argument("--ocr-batch", nargs="+", type=int, default=[1], metavar="K",
+                        help="Размеры пакета кадров для сравнения (по умолчанию 1)")
+    args = parser.parse_args()
+
+    import easyocr
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    renderer = TextRenderer()
+    slides = SLIDES_RU + SLIDES_EN if renderer.supports_cyrillic else SLIDES_EN
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        video_path = str(Path(tmp_dir) / "reference.mp4")
+        spans = write_slides_video(video_path, slides, size=(width, height), renderer=renderer)
+
+        print("Загрузка моделей OCR...")
+        reader = easyocr.Reader(['ru', 'en'], gpu=False, verbose=False)
+
+        print(f"\nЭталонный ролик {width}x{height}, интервал {args.interval} с\n")
+        print(f"{'профиль':>10} | {'пакет':>5} | {'кадров/с':>9} | {'полнота':>8}")
+        print("-" * 42)
+        for name in args.profiles:
+            for ocr_batch in args.ocr_batch:
+                fps, recall = run_profile(reader, video_path, spans, name, args.interval, ocr_batch)
+                print(f"{name:>10} | {ocr_batch:>5} | {fps:9.2f} | {recall:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Бенчмарк режимов выборки кадров (read / grab / seek)
+
+Измеряет время декодирования в пересчете на один выбранный кадр.
+
+Использование:
+    python -m benchmarks.bench_sampling                  # синтетическое видео
+    python -m benchmarks.bench_sampling video.mp4 2 5 10 # свое видео и интервалы
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.frame_source import FrameSource
+
+MODES = ('read', 'grab', 'seek')
+
+
+def make_test_video(path: str, seconds: int = 120, fps: int = 25, size=(1280, 720)):
+    """Создает синтетическое видео с меняющимся содержимым"""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+    for i in range(seconds * fps):
+        frame = np.roll(noise, i * 4, axis=1)
+        cv2.putText(frame, f"Frame {i}", (50, height // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                    2, (255, 255, 255), 3)
+        writer.write(frame)
+
+    writer.release()
+
+
+def measure(video_path: str, interval: float, mode: str):
+    """Возвращает (количество кадров, мс на выбранный кадр)"""
+    source = FrameSource(video_path, interval, sampling=mode, log=lambda _: None)
+    started = time.perf_counter()
+    count = sum(1 for _ in source)
+    elapsed = time.perf_counter() - started
+    return count, elapsed / count * 1000 if count else 0.0
+
+
+def main():
+    intervals = [float(x) for x in sys.argv[2:]] or [1, 2, 5, 10]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            video_path = sys.argv[1]
+        else:
+            video_path = str(Path(tmp_dir) / "synthetic.mp4")
+            print("Создание синтетического видео 1280x720, 120 с...")
+            make_test_video(video_path)
+
+        print(f"\n{'интервал':>9} | " + " | ".join(f"{m:>16}" for m in MODES) + " | auto")
+        print("-" * 72)
+        for interval in intervals:
+            cells = []
+            for mode in MODES:
+                count, ms = measure(video_path, interval, mode)
+                cells.append(f"{ms:9.1f} мс/кадр")
+            auto_mode = FrameSource(video_path, interval, log=lambda _: None)
+            auto_mode.release()
+            print(f"{interval:>8}s | " + " | ".join(f"{c:>16}" for c in cells)
+                  + f" | {auto_mode.sampling}")
+        print(f"\nВыбрано кадров при последнем интервале: {count}")
+
+
+if __name__ == "__main__":
+    main()
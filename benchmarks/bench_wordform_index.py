@@ -0,0 +1,82 @@
+"""
+Бенчмарк проверки слов: аффиксный анализ spylls против индекса словоформ
+
+Выборка слов - случайные формы из индекса (через раскрытие основ словаря)
+и те же слова с одной опечаткой, чтобы учесть и промахи индекса. Скорость
+"индекс + spylls" соответствует проверке в find_misspellings(): при промахе
+индекса слово проверяется spylls.
+
+Индексы должны быть построены заранее:
+    python -m src.wordform_index
+
+Использование:
+    python -m benchmarks.bench_wordform_index
+    python -m benchmarks.bench_wordform_index --words 5000 --dictionaries path/to/dictionaries
+"""
+import argparse
+import random
+import time
+from itertools import islice
+from pathlib import Path
+
+from src.dict_snapshot import load_dictionary
+from src.wordform_index import WordFormIndex, expand_forms
+
+LANGUAGES = {'ru': 'ru_RU', 'en': 'en_US'}
+
+
+def make_typo(word: str, rng: random.Random) -> str:
+    """Слово с переставленными соседними буквами"""
+    if len(word) < 4:
+        return word + word[-1]
+    position = rng.randrange(1, len(word) - 2)
+    return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+
+def lookups_per_second(words, check):
+    """Количество проверок в секунду и количество принятых слов"""
+    started = time.perf_counter()
+    accepted = sum(1 for word in words if check(word))
+    return len(words) / (time.perf_counter() - started), accepted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк индекса словоформ")
+    parser.add_argument("--dictionaries", default=str(Path(__file__).parent.parent / "dictionaries"),
+                        help="Каталог со словарями ru_RU и en_US")
+    parser.add_argument("--words", type=int, default=2000, help="Слов в выборке на язык")
+    parser.add_argument("--typos", type=float, default=0.2, help="Доля слов с опечаткой")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"\nПроверка слов: {args.words} на язык, опечаток {args.typos:.0%}\n")
+    print(f"{'язык':>4} | {'способ':>14} | {'слов/с':>10} | {'ускорение':>9} | {'принято':>7}")
+    print("-" * 58)
+
+    for language, name in LANGUAGES.items():
+        base_path = Path(args.dictionaries) / name
+        index = WordFormIndex.load(base_path)
+        if index is None:
+            print(f"{language:>4} | индекс не построен: python -m src.wordform_index")
+            continue
+        dictionary, _ = load_dictionary(base_path)
+
+        forms = list(islice(expand_forms(dictionary), 200000))
+        words = [form for form in rng.sample(forms, min(args.words, len(forms))) if form.isalpha()]
+        words = [make_typo(word, rng) if rng.random() < args.typos else word for word in words]
+
+        rows = [
+            ("spylls", lookups_per_second(words, dictionary.lookup)),
+            ("индекс", lookups_per_second(words, index.__contains__)),
+            ("индекс + spylls", lookups_per_second(words, lambda word: word in index or dictionary.lookup(word))),
+        ]
+        baseline = rows[0][1][0]
+        for title, (rate, accepted) in rows:
+            print(f"{language:>4} | {title:>14} | {rate:10.0f} | {rate / baseline:8.1f}x | {accepted:7d}")
+
+    print("\nСтолбец \"принято\" для spylls и \"индекс + spylls\" должен совпадать.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Генерация синтетических видео с известным текстом для бенчмарков
+"""
+import os
+import sys
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Шрифты с кириллицей в типичных системных каталогах
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+]
+
+
+class Slide(NamedTuple):
+    """Слайд синтетического видео"""
+    lines: Tuple[str, ...]  # Строки текста (сверху вниз)
+    seconds: float          # Длительность показа
+    caption: bool = False   # True - строки внизу кадра (субтитры), False - по центру
+
+
+class SlideSpan(NamedTuple):
+    """Положение слайда в видео"""
+    start_frame: int
+    end_frame: int  # Не включительно
+    slide: Slide
+
+
+def find_font() -> Optional[str]:
+    """Путь к TTF-шрифту с кириллицей (переменная BENCH_FONT или системный шрифт)"""
+    candidates = [os.environ.get("BENCH_FONT")] + FONT_CANDIDATES
+    for path in candidates:
+        if path and Path(path).exists():
+            return path
+    return None
+
+
+class TextRenderer:
+    """Отрисовка текста на кадре: PIL с TTF-шрифтом или cv2.putText (только латиница)"""
+
+    def __init__(self, font_path: str = None):
+        self.font_path = font_path or find_font()
+        self._fonts = {}
+        if self.font_path is None:
+            print("WARNING Шрифт с кириллицей не найден (задайте BENCH_FONT), "
+                  "используется cv2.putText - кириллица не отрисуется", file=sys.stderr)
+
+    @property
+    def supports_cyrillic(self) -> bool:
+        return self.font_path is not None
+
+    def _font(self, height: int):
+        from PIL import ImageFont
+        if height not in self._fonts:
+            self._fonts[height] = ImageFont.truetype(self.font_path, height)
+        return self._fonts[height]
+
+    def draw(self, frame: np.ndarray, lines: List[str], text_height: int, caption: bool):
+        """Рисует строки по центру или внизу кадра (субтитры)"""
+        height, width = frame.shape[:2]
+        step = int(text_height * 1.6)
+        top = height - step * len(lines) - text_height if caption else (height - step * len(lines)) // 2
+
+        if self.font_path is None:
+            scale = text_height / 22.0
+            for idx, line in enumerate(lines):
+                y = top + idx * step + text_height
+                cv2.putText(frame, line, (width // 10, y), cv2.FONT_HERSHEY_SIMPLEX,
+                            scale, (255, 255, 255), max(1, int(scale * 2)), cv2.LINE_AA)
+            return frame
+
+        from PIL import Image, ImageDraw
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        draw = ImageDraw.Draw(image)
+        font = self._font(text_height)
+        for idx, line in enumerate(lines):
+            draw.text((width // 10, top + idx * step), line, font=font, fill=(255, 255, 255))
+        frame[:] = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+        return frame
+
+
+def write_slides_video(path: str, slides: List[Slide], size=(1280, 720), fps: int = 25,
+                       text_height: int = None, background: bool = True,
+                       renderer: TextRenderer = None) -> List[SlideSpan]:
+    """
+    Записывает видео из слайдов с текстом
+
+    Args:
+        path: Путь к выходному файлу (.mp4 или .avi)
+        slides: Слайды по порядку
+        size: Размер кадра (ширина, высота)
+        fps: Частота кадров
+        text_height: Высота текста в пикселях (по умолчанию 1/18 высоты кадра)
+        background: Добавлять медленно движущийся фон (иначе фон однотонный)
+        renderer: Отрисовщик текста
+
+    Returns:
+        Положение каждого слайда в видео (в кадрах)
+    """
+    width, height = size
+    text_height = text_height or max(12, height // 18)
+    renderer = renderer or TextRenderer()
+    fourcc = cv2.VideoWriter_fourcc(*('MJPG' if path.lower().endswith('.avi') else 'mp4v'))
+    writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Не удалось создать видео: {path}")
+
+    # Градиентный фон, который медленно сдвигается (имитация движения в кадре)
+    gradient = np.tile(np.linspace(20, 90, width, dtype=np.uint8), (height, 1))
+    gradient = cv2.merge([gradient, np.full_like(gradient, 40), gradient[:, ::-1]])
+
+    spans = []
+    frame_num = 0
+    for slide in slides:
+        count = max(1, int(round(slide.seconds * fps)))
+        base = np.full((height, width, 3), 32, dtype=np.uint8)
+        text_layer = renderer.draw(base.copy(), list(slide.lines), text_height, slide.caption)
+        mask = np.any(text_layer != base, axis=2)
+
+        for i in range(count):
+            frame = np.roll(gradient, (frame_num + i) * 2, axis=1) if background else base.copy()
+            frame[mask] = text_layer[mask]
+            writer.write(frame)
+
+        spans.append(SlideSpan(frame_num, frame_num + count, slide))
+        frame_num += count
+
+    writer.release()
+    return spans
+
+
+def slide_at(spans: List[SlideSpan], frame_num: int) -> Optional[Slide]:
+    """Слайд, показанный в заданном кадре"""
+    for span in spans:
+        if span.start_frame <= frame_num < span.end_frame:
+            return span.slide
+    return None
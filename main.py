@@ -6,12 +6,15 @@ GUI версия с использованием Qt Designer (.ui файл)
 import sys
 import os
 import subprocess
+import multiprocessing
 from pathlib import Path
 from PyQt6 import uic
 from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QTextCursor, QPixmap, QImage, QIcon
-from src.gui_widgets import WorkerThread
+from src.gui_widgets import CheckerEngine, WarmUpThread, WorkerThread
+from src.ocr_profiles import OCR_PROFILES, DEFAULT_PROFILE
+from src.occurrences import format_timecode
 from PyQt6.QtWidgets import QTimeEdit
 from PyQt6.QtCore import QTime
 
@@ -90,6 +93,9 @@ class VideoSpellCheckerGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.worker = None
+        self.engine = CheckerEngine()  # Модели OCR и словари, общие для всех запусков
+        self.warm_up_thread = None
+        self.closing = False  # Окно закрывается: результаты остановленной обработки не показываем
         self.video_duration_seconds = None  # Длительность загруженного видео
         self.config_file = get_app_dir() / "config.ini"  # Путь к файлу конфигурации
 
@@ -105,6 +111,9 @@ class VideoSpellCheckerGUI(QMainWindow):
         # Инициализируем кастомные виджеты для времени
         self.setup_time_widgets()
 
+        # Заполняем список профилей OCR
+        self.setup_profile_widget()
+
         # Загружаем настройки
         self.load_settings()
 
@@ -189,6 +198,16 @@ class VideoSpellCheckerGUI(QMainWindow):
         self.start_time_input.setToolTip("Начальное время анализа [час:мин:сек]")
         self.end_time_input.setToolTip("Конечное время анализа [час:мин:сек]")
 
+    def setup_profile_widget(self):
+        """Заполняем список профилей скорости/точности OCR"""
+        for name, profile in OCR_PROFILES.items():
+            self.ocrProfileInput.addItem(profile.title, name)
+
+        self.ocrProfileInput.setCurrentIndex(self.ocrProfileInput.findData(DEFAULT_PROFILE))
+
+        # Процессов OCR не больше, чем ядер процессора
+        self.ocrWorkersInput.setMaximum(os.cpu_count() or 1)
+
     def setup_connections(self):
         """Подключаем сигналы к слотам"""
         self.browseButton.clicked.connect(self.browse_file)
@@ -199,8 +218,10 @@ class VideoSpellCheckerGUI(QMainWindow):
         self.start_time_input.timeChanged.connect(self.update_start_time_validation)
         self.end_time_input.timeChanged.connect(self.update_end_time_validation)
 
-        # Сохраняем настройки при изменении папки вывода
+        # Сохраняем настройки при изменении папки вывода и параметров OCR
         self.outputDirInput.textChanged.connect(self.save_settings)
+        self.ocrProfileInput.currentIndexChanged.connect(self.save_settings)
+        self.ocrWorkersInput.valueChanged.connect(self.save_settings)
 
         # Подключаем действия меню
         self.actionOpenDictionary.triggered.connect(self.open_custom_dictionary)
@@ -247,12 +268,22 @@ class VideoSpellCheckerGUI(QMainWindow):
         output_dir = settings.value("output_dir", default_output_dir)
         self.outputDirInput.setText(output_dir)
 
+        # Загружаем профиль OCR
+        profile_index = self.ocrProfileInput.findData(settings.value("ocr_profile", DEFAULT_PROFILE))
+        if profile_index >= 0:
+            self.ocrProfileInput.setCurrentIndex(profile_index)
+
+        # Загружаем количество процессов OCR
+        self.ocrWorkersInput.setValue(int(settings.value("ocr_workers", 1)))
+
     def save_settings(self):
         """Сохраняет настройки"""
         from PyQt6.QtCore import QSettings
 
         settings = QSettings(str(self.config_file), QSettings.Format.IniFormat)
         settings.setValue("output_dir", self.outputDirInput.text())
+        settings.setValue("ocr_profile", self.ocrProfileInput.currentData())
+        settings.setValue("ocr_workers", self.ocrWorkersInput.value())
         settings.sync()
 
     def browse_output_dir(self):
@@ -326,6 +357,27 @@ class VideoSpellCheckerGUI(QMainWindow):
         except Exception as e:
             print(f"Не удалось определить длительность видео: {e}")
 
+    def start_warm_up(self):
+        """Запускает фоновую загрузку моделей OCR и словарей, пока пользователь выбирает видео"""
+        self.engineStatusLabel.setText("⏳ Загрузка моделей OCR и словарей...")
+        self.warm_up_thread = WarmUpThread(
+            self.engine,
+            ocr_profile=self.ocrProfileInput.currentData(),
+            workers=self.ocrWorkersInput.value()
+        )
+        self.warm_up_thread.log_signal.connect(self.append_log)
+        self.warm_up_thread.finished_signal.connect(self.warm_up_finished)
+        self.warm_up_thread.start()
+
+    def warm_up_finished(self, ok):
+        """Фоновая загрузка завершена"""
+        if self.closing:
+            return
+        if ok:
+            self.engineStatusLabel.setText("✓ Модели OCR и словари загружены")
+        else:
+            self.engineStatusLabel.setText("⚠ Модели OCR и словари будут загружены при запуске проверки")
+
     def check_dictionaries(self):
         """Проверяет наличие словарей и предлагает скачать при необходимости"""
         app_dir = get_app_dir()
@@ -491,6 +543,9 @@ class VideoSpellCheckerGUI(QMainWindow):
         self.browseOutputButton.setEnabled(False)
         self.outputDirInput.setEnabled(False)
         self.intervalInput.setEnabled(False)
+        self.ocrProfileInput.setEnabled(False)
+        self.ocrWorkersInput.setEnabled(False)
+        self.respellCheckBox.setEnabled(False)
         self.start_time_input.setEnabled(False)
         self.end_time_input.setEnabled(False)
         self.startButton.setText("Обработка...")
@@ -510,7 +565,11 @@ class VideoSpellCheckerGUI(QMainWindow):
 
         # Запускаем обработку в отдельном потоке
         self.worker = WorkerThread(
-            video_path, interval, output_dir, start_time_seconds, end_time_seconds
+            video_path, interval, output_dir, start_time_seconds, end_time_seconds,
+            ocr_profile=self.ocrProfileInput.currentData(),
+            workers=self.ocrWorkersInput.value(),
+            engine=self.engine,
+            respell=self.respellCheckBox.isChecked()
         )
         self.worker.log_signal.connect(self.append_log)
         self.worker.frame_signal.connect(self.update_frame_preview)
@@ -605,6 +664,19 @@ class VideoSpellCheckerGUI(QMainWindow):
                 f"Не удалось открыть файл:\n{e}\n\nПуть к файлу:\n{dict_file}",
             )
 
+    def closeEvent(self, event):
+        """Закрытие окна: останавливаем обработку, дожидаемся потоков и процессов OCR"""
+        self.closing = True
+        if self.worker is not None and self.worker.isRunning():
+            # Обработка останавливается после текущего кадра; журнал остается для продолжения
+            self.engine.cancel()
+            self.worker.wait()
+        if self.warm_up_thread is not None and self.warm_up_thread.isRunning():
+            # Загрузку моделей прервать нельзя - дожидаемся ее
+            self.warm_up_thread.wait()
+        self.engine.close()
+        super().closeEvent(event)
+
     def show_about_dialog(self):
         """Показать диалог 'О программе'"""
         from PyQt6.QtWidgets import QDialog
@@ -619,11 +691,17 @@ class VideoSpellCheckerGUI(QMainWindow):
 
     def processing_finished(self, result):
         """Обработка завершена успешно"""
+        if self.closing:
+            return
+        self.engineStatusLabel.setText("✓ Модели OCR и словари загружены")
         self.startButton.setEnabled(True)
         self.browseButton.setEnabled(True)
         self.browseOutputButton.setEnabled(True)
         self.outputDirInput.setEnabled(True)
         self.intervalInput.setEnabled(True)
+        self.ocrProfileInput.setEnabled(True)
+        self.ocrWorkersInput.setEnabled(True)
+        self.respellCheckBox.setEnabled(True)
         self.start_time_input.setEnabled(True)
         self.end_time_input.setEnabled(True)
         self.startButton.setText("Начать проверку")
@@ -633,11 +711,20 @@ class VideoSpellCheckerGUI(QMainWindow):
 
     def processing_error(self, error_message):
         """Обработка завершена с ошибкой"""
+        if self.closing:
+            return
+        if self.engine.loaded:
+            self.engineStatusLabel.setText("✓ Модели OCR и словари загружены")
+        else:
+            self.engineStatusLabel.setText("⚠ Модели OCR и словари будут загружены при запуске проверки")
         self.startButton.setEnabled(True)
         self.browseButton.setEnabled(True)
         self.browseOutputButton.setEnabled(True)
         self.outputDirInput.setEnabled(True)
         self.intervalInput.setEnabled(True)
+        self.ocrProfileInput.setEnabled(True)
+        self.ocrWorkersInput.setEnabled(True)
+        self.respellCheckBox.setEnabled(True)
         self.start_time_input.setEnabled(True)
         self.end_time_input.setEnabled(True)
         self.startButton.setText("Начать проверку")
@@ -656,24 +743,21 @@ class VideoSpellCheckerGUI(QMainWindow):
         else:
             report += f"Найдено кадров с ошибками: {result['frames_with_errors']}\n"
             report += f"Всего ошибок: {result['total_errors']}\n\n"
-            report += "Тайм-коды кадров с ошибками:\n"
+            report += "Тайм-коды ошибок:\n"
             report += "-" * 60 + "\n"
 
             for detail in result["errors_details"]:
-                timecode = detail["timecode"]
+                timecode = detail["first_timecode"]
                 minutes = int(timecode // 60)
                 seconds = int(timecode % 60)
                 milliseconds = int((timecode % 1) * 1000)
 
                 report += f"\n🕐 {minutes:02d}:{seconds:02d}.{milliseconds:03d} "
-                report += f"(кадр #{detail['frame_num']}) - "
-                report += f"{detail['errors_count']} ошибок\n"
-
-                for _, error in enumerate(detail["errors"][:3]):
-                    report += f"   • {error}\n"
-
-                if len(detail["errors"]) > 3:
-                    report += f"   ... и еще {len(detail['errors']) - 3} ошибок\n"
+                report += f"(кадр #{detail['first_frame']}"
+                if detail["frames"] > 1:
+                    report += f", еще {detail['frames'] - 1} кадров до {format_timecode(detail['last_timecode'])}"
+                report += ")\n"
+                report += f"   • {detail['error']}\n"
 
         report += "\n" + "=" * 60 + "\n"
         self.append_log(report)
@@ -711,8 +795,13 @@ def main():
     window = VideoSpellCheckerGUI()
     window.show()
 
+    # Модели OCR и словари загружаются в фоне, пока пользователь выбирает видео и интервал
+    window.start_warm_up()
+
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # Процессы OCR запускаются методом spawn, в том числе из собранного exe
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,324 @@
+"""
+Пакетная проверка нескольких видео одной загруженной проверкой
+
+Модели OCR и словари загружаются один раз на весь пакет. Видео задаются
+каталогом, шаблоном (glob) или файлом-манифестом с диапазонами времени для
+каждого файла:
+
+    python -m src.batch videos/
+    python -m src.batch "season1/*.mp4" --interval 3
+    python -m src.batch manifest.csv --workers 4 --output-dir results
+
+Манифест CSV (заголовок обязателен; start, end и interval необязательны,
+время - в секундах или ММ:СС / ЧЧ:ММ:СС; пути - относительно манифеста):
+
+    path,start,end,interval
+    ep01.mp4,0:30,21:00,
+    ep02.mp4,,,5
+
+Манифест JSON - список объектов с теми же полями:
+
+    [{"path": "ep01.mp4", "start": "0:30", "end": "21:00"}, {"path": "ep02.mp4", "interval": 5}]
+
+Результаты каждого видео - в <output-dir>/screenshots_<имя видео>_errors
+(скриншоты, errors.txt, results.jsonl и log.txt), общий отчет по всем видео -
+<output-dir>/batch-<дата>.txt и .json.
+"""
+import csv
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from src.occurrences import format_timecode
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+
+
+@dataclass
+class BatchItem:
+    """Видео пакета и его параметры"""
+    video_path: Path
+    start_time: float = 0.0
+    end_time: Optional[float] = None
+    interval: Optional[int] = None    # None - интервал пакета
+
+
+def parse_time(value) -> Optional[float]:
+    """Время в секундах из числа или строки "С", "ММ:СС", "ЧЧ:ММ:СС"; пустое значение - None"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in value.strip().split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def read_manifest(path: Path) -> List[BatchItem]:
+    """
+    Читает манифест CSV или JSON
+
+    Raises:
+        ValueError: Неверный формат манифеста
+    """
+    if path.suffix.lower() == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        if not isinstance(rows, list):
+            raise ValueError(f"{path}: ожидается список объектов")
+    else:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    items = []
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict) or not row.get('path'):
+            raise ValueError(f"{path}, запись {number}: не указан path")
+        video_path = Path(row['path'])
+        if not video_path.is_absolute():
+            video_path = path.parent / video_path
+        interval = row.get('interval')
+        try:
+            items.append(BatchItem(
+                video_path=video_path,
+                start_time=parse_time(row.get('start')) or 0.0,
+                end_time=parse_time(row.get('end')),
+                interval=int(interval) if interval not in (None, '') else None,
+            ))
+        except ValueError as e:
+            raise ValueError(f"{path}, запись {number}: {e}")
+    return items
+
+
+def collect_items(sources: List[str]) -> List[BatchItem]:
+    """Видео из каталогов, шаблонов, манифестов (.csv/.json) и отдельных файлов"""
+    items = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            items.extend(BatchItem(video) for video in sorted(path.iterdir())
+                         if video.suffix.lower() in VIDEO_EXTENSIONS)
+        elif path.suffix.lower() in ('.csv', '.json') and path.is_file():
+            items.extend(read_manifest(path))
+        elif path.is_file():
+            items.append(BatchItem(path))
+        else:
+            items.extend(BatchItem(Path(video)) for video in sorted(glob.glob(source, recursive=True))
+                         if Path(video).suffix.lower() in VIDEO_EXTENSIONS)
+    return items
+
+
+def output_dirs(items: List[BatchItem], base_dir: Path) -> List[Path]:
+    """Папки результатов видео; для одинаковых имен добавляется номер"""
+    used = {}
+    dirs = []
+    for item in items:
+        name = f"screenshots_{item.video_path.stem}_errors"
+        used[name] = used.get(name, 0) + 1
+        dirs.append(base_dir / (name if used[name] == 1 else f"{name}_{used[name]}"))
+    return dirs
+
+
+class _FileLog:
+    """Вывод сообщений проверки одного видео в файл (из нескольких потоков)"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __call__(self, message: str):
+        with self._lock:
+            self._file.write(f"{message}\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def process_item(checker, item: BatchItem, output_dir: Path, interval: int, options: dict) -> dict:
+    """Проверяет одно видео; ошибка обработки возвращается в поле error"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log = _FileLog(output_dir / "log.txt")
+    started = time.perf_counter()
+    summary = {
+        'video_path': str(item.video_path),
+        'start_time': item.start_time,
+        'end_time': item.end_time,
+        'interval': interval,
+        'output_dir': str(output_dir.absolute()),
+    }
+    try:
+        result = checker.with_output(output_dir, log).process_video(
+            str(item.video_path), interval=interval, start_time=item.start_time,
+            end_time=item.end_time, **options)
+        summary.update(result, error=None)
+    except Exception as e:
+        log(f"Ошибка: {e}")
+        summary.update(total_frames=0, frames_with_errors=0, total_errors=0, errors_details=[],
+                       error=str(e))
+    finally:
+        log.close()
+    summary['elapsed'] = time.perf_counter() - started
+    return summary
+
+
+def write_summary(results: List[dict], base_dir: Path, elapsed: float) -> Path:
+    """
+    Сохраняет общий отчет по всем видео (текст и JSON)
+
+    Returns:
+        Путь к текстовому отчету
+    """
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    report_path = base_dir / f"batch-{stamp}.txt"
+    total_frames = sum(result['total_frames'] for result in results)
+
+    with open(base_dir / f"batch-{stamp}.json", 'w', encoding='utf-8') as f:
+        json.dump({'elapsed': elapsed, 'videos': results}, f, ensure_ascii=False, indent=2)
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("=" * 60 + "\n")
+        f.write("ОБЩИЙ ОТЧЁТ ПАКЕТНОЙ ПРОВЕРКИ\n")
+        f.write("=" * 60 + "\n\n")
+        f.write(f"Дата и время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Видео: {len(results)}, с ошибками обработки: {sum(1 for r in results if r['error'])}\n")
+        f.write(f"Всего обработано кадров: {total_frames}\n")
+        f.write(f"Кадров с ошибками: {sum(result['frames_with_errors'] for result in results)}\n")
+        f.write(f"Всего найдено ошибок: {sum(result['total_errors'] for result in results)}\n")
+        f.write(f"Общее время: {elapsed:.1f} с ({total_frames / elapsed if elapsed else 0:.2f} кадр/с)\n\n")
+
+        for number, result in enumerate(results, 1):
+            f.write("=" * 60 + "\n")
+            f.write(f"{number}. {result['video_path']}\n")
+            if result['error']:
+                f.write(f"   Ошибка обработки: {result['error']}\n\n")
+                continue
+            f.write(f"   Кадров: {result['total_frames']}, с ошибками: {result['frames_with_errors']}, "
+                    f"ошибок: {result['total_errors']}, время: {result['elapsed']:.1f} с\n")
+            f.write(f"   Результаты: {result['output_dir']}\n")
+            for detail in result['errors_details']:
+                f.write(f"   {format_timecode(detail['first_timecode'])} - {format_timecode(detail['last_timecode'])} "
+                        f"(кадров: {detail['frames']}): {detail['error']}\n")
+            f.write("\n")
+    return report_path
+
+
+def default_workers(files: int) -> int:
+    """Процессов OCR по умолчанию: по два ядра на процесс, не больше числа файлов"""
+    return max(1, min(files, (os.cpu_count() or 1) // 2))
+
+
+def main():
+    """Пакетная проверка видео"""
+    import argparse
+
+    from src import ocr
+    from src.change_detector import DEFAULT_CHANGE_THRESHOLD
+    from src.frame_source import SAMPLING_MODES
+    from src.ocr_profiles import DEFAULT_PROFILE, OCR_PROFILES
+    from src.screenshots import ScreenshotFormat, SCREENSHOT_FORMATS
+    from src.result_store import DEFAULT_RESULT_FORMAT, RESULT_FORMATS
+
+    parser = argparse.ArgumentParser(
+        description="Пакетная проверка орфографии в нескольких видео",
+        epilog="Пример: python -m src.batch videos/ --interval 2"
+    )
+    parser.add_argument("sources", nargs="+",
+                        help="Каталоги, шаблоны (например, \"season1/*.mp4\"), манифесты .csv/.json или видеофайлы")
+    parser.add_argument("--interval", type=int, default=2,
+                        help="Интервал между кадрами в секундах, если не задан в манифесте (по умолчанию 2)")
+    parser.add_argument("--output-dir", default="screenshots_with_errors",
+                        help="Папка для результатов всех видео (по умолчанию screenshots_with_errors)")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="Количество процессов OCR (по умолчанию - по два ядра на процесс, "
+                             "не больше числа видео)")
+    parser.add_argument("--jobs", type=int, default=None, metavar="J",
+                        help="Сколько видео обрабатывать одновременно (по умолчанию - по числу процессов OCR)")
+    parser.add_argument("--sampling", choices=SAMPLING_MODES, default="auto")
+    parser.add_argument("--change-threshold", type=float, default=DEFAULT_CHANGE_THRESHOLD)
+    parser.add_argument("--profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--ocr-batch", type=int, default=ocr.DEFAULT_OCR_BATCH, metavar="K")
+    parser.add_argument("--screenshot-format", choices=list(SCREENSHOT_FORMATS), default="jpeg")
+    parser.add_argument("--screenshot-quality", type=int, default=None, metavar="Q",
+                        help="Качество JPEG/WebP (1-100) или степень сжатия PNG (0-9)")
+    parser.add_argument("--thumbnail-width", type=int, default=0, metavar="PX",
+                        help="Ширина уменьшенных копий скриншотов (0 - не сохранять)")
+    parser.add_argument("--results", choices=list(RESULT_FORMATS), default=DEFAULT_RESULT_FORMAT,
+                        help="Формат файла результатов по кадрам каждого видео")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="Профилировать цикл обработки каждого видео (profile-*.prof в папке видео)")
+    args = parser.parse_args()
+    try:
+        screenshot_format = ScreenshotFormat(args.screenshot_format, args.screenshot_quality,
+                                             args.thumbnail_width)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        items = collect_items(args.sources)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(2)
+    missing = [item for item in items if not item.video_path.is_file()]
+    for item in missing:
+        print(f"WARNING Видеофайл не найден: {item.video_path}")
+    items = [item for item in items if item.video_path.is_file()]
+    if not items:
+        print("Ошибка: видео не найдены", file=sys.stderr)
+        sys.exit(2)
+
+    workers = args.workers or default_workers(len(items))
+    # Модели EasyOCR в текущем процессе не рассчитаны на вызовы из нескольких потоков:
+    # одновременно обрабатываются видео только при пуле процессов OCR
+    jobs = min(args.jobs or workers, len(items)) if workers > 1 else 1
+    print(f"Видео: {len(items)}, процессов OCR: {workers}, одновременно: {jobs}")
+
+    from src.video_speller import VideoSpellChecker
+
+    base_dir = Path(args.output_dir)
+    checker = VideoSpellChecker(output_dir=str(base_dir), ocr_profile=args.profile, workers=workers)
+    options = {'sampling': args.sampling, 'change_threshold': args.change_threshold,
+               'ocr_batch': args.ocr_batch, 'screenshot_format': screenshot_format,
+               'result_format': args.results, 'cprofile': args.cprofile}
+
+    started = time.perf_counter()
+    results = [None] * len(items)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(process_item, checker, item, output_dir,
+                                       item.interval or args.interval, options): index
+                       for index, (item, output_dir) in enumerate(zip(items, output_dirs(items, base_dir)))}
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                result = results[index] = future.result()
+                name = items[index].video_path.name
+                if result['error']:
+                    print(f"[{done}/{len(items)}] {name}: ошибка обработки: {result['error']}")
+                else:
+                    print(f"[{done}/{len(items)}] {name}: кадров {result['total_frames']}, "
+                          f"ошибок {result['total_errors']} ({result['elapsed']:.1f} с)")
+    finally:
+        checker.close()
+
+    report_path = write_summary(results, base_dir, time.perf_counter() - started)
+    print(f"OK Общий отчет: {report_path}")
+
+    if any(result['error'] for result in results):
+        sys.exit(2)
+    sys.exit(1 if any(result['total_errors'] for result in results) else 0)
+
+
+if __name__ == "__main__":
+    # Процессы OCR запускаются методом spawn
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
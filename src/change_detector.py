@@ -0,0 +1,79 @@
+"""
+Детектор изменений между кадрами
+"""
+import cv2
+import numpy as np
+
+# Порог по умолчанию: 0 - пропуск OCR выключен, распознается каждый кадр.
+# Исправление одной буквы в субтитре меняет ничтожную долю кадра, и пропуск
+# может скрыть новую или исправленную опечатку, поэтому он включается явно
+DEFAULT_CHANGE_THRESHOLD = 0.0
+
+# Порог детектора (доля изменившихся пикселей в клетке), если пропуск включен
+SUGGESTED_CHANGE_THRESHOLD = 0.003
+
+# Минимальная разница яркости пикселя (0-255), не считающаяся шумом сжатия
+PIXEL_DIFF_THRESHOLD = 24
+
+# Размер уменьшенного кадра для сравнения
+COMPARE_SIZE = (640, 360)
+
+# Сторона клетки уменьшенного кадра, в которой считается доля изменений, пикселей
+CELL_SIZE = 20
+
+
+class FrameChangeDetector:
+    """Определяет, изменился ли кадр с момента последнего распознавания
+
+    Кадры сравниваются в уменьшенном виде в оттенках серого: пиксель считается
+    изменившимся, если его яркость отличается больше чем на PIXEL_DIFF_THRESHOLD.
+    Доля изменившихся пикселей считается в каждой клетке CELL_SIZE x CELL_SIZE
+    (около 60x60 пикселей кадра 1080p - одна-две буквы субтитра), и кадр
+    считается новым, если она превышает порог хотя бы в одной клетке: замена
+    одной буквы не растворяется в площади всего кадра.
+    Опорным считается последний кадр, признанный изменившимся, поэтому
+    медленные изменения (плавные переходы) накапливаются и не теряются.
+    """
+
+    def __init__(self, threshold: float = SUGGESTED_CHANGE_THRESHOLD,
+                 pixel_threshold: int = PIXEL_DIFF_THRESHOLD, size=COMPARE_SIZE, cell_size: int = CELL_SIZE):
+        """
+        Args:
+            threshold: Доля изменившихся пикселей клетки (0-1), при превышении которой
+                хотя бы в одной клетке кадр считается новым
+            pixel_threshold: Минимальная разница яркости пикселя
+            size: Размер (ширина, высота) уменьшенного кадра
+            cell_size: Сторона клетки уменьшенного кадра, пикселей
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.size = size
+        self.cell_size = cell_size
+        self._reference = None
+
+    def _thumbnail(self, frame) -> np.ndarray:
+        """Уменьшенная копия кадра в оттенках серого"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+
+    def changed_ratio(self, thumbnail: np.ndarray) -> float:
+        """Наибольшая по клеткам доля изменившихся пикселей относительно опорного кадра"""
+        changed = (cv2.absdiff(thumbnail, self._reference) > self.pixel_threshold).astype(np.float32)
+        # Среднее по клеткам; неполные клетки у края усредняются по своей площади
+        cells = cv2.resize(changed, (-(-changed.shape[1] // self.cell_size), -(-changed.shape[0] // self.cell_size)),
+                           interpolation=cv2.INTER_AREA)
+        return float(cells.max())
+
+    def is_changed(self, frame) -> bool:
+        """Проверяет кадр и при изменении делает его опорным"""
+        thumbnail = self._thumbnail(frame)
+
+        if self._reference is not None and self.changed_ratio(thumbnail) <= self.threshold:
+            return False
+
+        self._reference = thumbnail
+        return True
+
+    def reset(self):
+        """Сбрасывает опорный кадр"""
+        self._reference = None
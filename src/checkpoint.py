@@ -0,0 +1,168 @@
+"""
+Журнал обработки видео для возобновления после сбоя или отмены
+
+В папке результатов ведется файл checkpoint.jsonl: первая строка - параметры
+запуска (видео и настройки, от которых зависит результат), затем по строке на
+каждый обработанный кадр с найденными ошибками (слово, язык, описание, рамка
+блока OCR - для объединения во вхождения, см. src.occurrences) и именем
+сохраненного скриншота. Скриншоты записываются в фоне (src.screenshots), поэтому
+строка кадра откладывается, пока его скриншот не записан на диск; строки пишутся
+в порядке кадров. Все кадры журнала полностью обработаны: после сбоя кадры,
+скриншоты которых не успели записаться, обрабатываются заново.
+
+Повторный запуск с тем же видео и настройками продолжает обработку после
+последнего кадра журнала и объединяет результаты; после успешного завершения
+журнал удаляется.
+"""
+import hashlib
+import json
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional
+
+JOURNAL_NAME = 'checkpoint.jsonl'
+
+# Версия формата журнала; увеличивается при несовместимых изменениях
+JOURNAL_FORMAT = 2
+
+
+def checkpoint_key(video_path, interval, start_time, end_time, sampling, change_threshold,
+                   regions, auto_roi_frames, ocr_profile, custom_words) -> dict:
+    """
+    Параметры запуска, при совпадении которых обработку можно продолжить
+
+    Видео определяется путем, размером и временем изменения файла;
+    пользовательский словарь - хэшем списка слов.
+    """
+    path = Path(video_path).resolve()
+    stat = path.stat()
+    words = '\n'.join(sorted(custom_words)).encode('utf-8')
+    return {
+        'format': JOURNAL_FORMAT,
+        'video': {'path': str(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+        'interval': interval,
+        'start_time': start_time,
+        'end_time': end_time,
+        'sampling': sampling,
+        'change_threshold': change_threshold,
+        'regions': [str(region) for region in regions] if regions else None,
+        'auto_roi_frames': auto_roi_frames,
+        'ocr_profile': ocr_profile,
+        'custom_words': hashlib.sha256(words).hexdigest(),
+    }
+
+
+class CheckpointJournal:
+    """Журнал обработанных кадров в папке результатов"""
+
+    def __init__(self, output_dir, key: dict):
+        self.path = Path(output_dir) / JOURNAL_NAME
+        self.key = key
+        self.frames: List[dict] = []  # Кадры из журнала предыдущего запуска
+        self._file = None
+        self._pending = deque()  # (строка кадра, Future записи скриншота) в порядке кадров
+
+    def load(self) -> bool:
+        """
+        Читает журнал предыдущего запуска
+
+        Returns:
+            True, если журнал есть, построен с теми же параметрами и в нем есть кадры
+        """
+        self.frames = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return False
+
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except json.JSONDecodeError:
+            return False
+        if not header or header.get('key') != self.key:
+            return False
+
+        for line in lines[1:]:
+            try:
+                self.frames.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # Строка, оборванная при сбое, и все после нее
+        return bool(self.frames)
+
+    @property
+    def last_frame(self) -> Optional[int]:
+        """Номер последнего обработанного кадра из журнала"""
+        return self.frames[-1]['frame'] if self.frames else None
+
+    def start(self, resume: bool):
+        """Открывает журнал для записи: продолжает прочитанный или начинает новый"""
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._pending.clear()
+        self._write({'key': self.key})
+        if resume:
+            # Переписываем прочитанные кадры: оборванная при сбое строка отбрасывается
+            for entry in self.frames:
+                self._write(entry)
+        else:
+            self.frames = []
+
+    def record(self, frame_num: int, timecode: float, reused: bool, findings: list = None,
+               text: str = '', screenshot: Optional[str] = None, written: Optional[Future] = None):
+        """Записывает обработанный кадр (вызывать после сохранения его результатов)
+
+        Строка кадра пишется, когда записан его скриншот и строки всех
+        предыдущих кадров; до этого она ждет в памяти.
+
+        Args:
+            findings: Ошибки кадра - кортежи (слово, язык, описание, рамка)
+            text: Текст кадра
+            screenshot: Имя скриншота кадра
+            written: Future записи скриншота (ScreenshotWriter.submit); None - скриншот уже записан
+        """
+        entry = {'frame': frame_num, 'timecode': timecode, 'reused': reused}
+        if findings:
+            entry['findings'] = findings
+            entry['text'] = text
+        if screenshot:
+            entry['screenshot'] = screenshot
+        self._pending.append((entry, written))
+        self.flush()
+
+    def flush(self):
+        """Пишет отложенные строки кадров, скриншоты которых уже записаны"""
+        while self._pending:
+            entry, written = self._pending[0]
+            if written is not None:
+                if not written.done():
+                    return
+                if written.exception() is not None:
+                    # Скриншот не записан: кадр обработан, но без скриншота
+                    entry.pop('screenshot', None)
+            self._pending.popleft()
+            self._write(entry)
+
+    def complete(self):
+        """Обработка завершена: журнал больше не нужен"""
+        self.close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def close(self):
+        """Закрывает журнал, оставляя его для следующего запуска
+
+        Строки кадров, скриншоты которых еще не записаны, не сохраняются -
+        закрывать журнал следует после ScreenshotWriter.close().
+        """
+        if self._file is not None:
+            self.flush()
+            self._pending.clear()
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
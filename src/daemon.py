@@ -0,0 +1,506 @@
+"""
+Режим сервера: прогретая проверка и очередь заданий через локальный HTTP API
+
+Сервер один раз загружает модели OCR и словари (CheckerEngine) и выполняет
+задания по очереди, по одному. Задания принимаются по HTTP на localhost или
+через Unix-сокет:
+
+    POST /jobs                 - поставить задание в очередь (JSON, см. JOB_FIELDS)
+    GET  /jobs                 - список заданий
+    GET  /jobs/<id>            - состояние задания и результат
+    GET  /jobs/<id>/events     - поток событий задания (JSON Lines) до его завершения
+    GET  /health               - состояние сервера
+
+У задания хранятся последние MAX_JOB_EVENTS событий; завершенные задания
+удаляются через FINISHED_JOB_TTL или сверх MAX_FINISHED_JOBS (самые старые).
+
+Результат задания - словарь process_video_with_result() (как в GUI).
+
+Запуск сервера и отправка задания:
+    python -m src.daemon serve --port 8765 --workers 2
+    python -m src.daemon submit video.mp4 --interval 2 --start 60 --end 120 --port 8765
+
+    python -m src.daemon serve --socket /tmp/video_speller.sock
+    curl --unix-socket /tmp/video_speller.sock -d '{"video_path": "video.mp4"}' http://localhost/jobs
+"""
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.frame_source import SAMPLING_MODES
+from src.ocr import DEFAULT_OCR_BATCH
+from src.ocr_profiles import DEFAULT_PROFILE, OCR_PROFILES
+from src.screenshots import ScreenshotFormat, SCREENSHOT_FORMATS
+from src.result_store import DEFAULT_RESULT_FORMAT, RESULT_FORMATS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Событий, хранимых для одного задания (более ранние отбрасываются)
+MAX_JOB_EVENTS = 2000
+# Сколько хранить завершенные задания: время после завершения, сек, и количество
+FINISHED_JOB_TTL = 24 * 3600
+MAX_FINISHED_JOBS = 100
+
+# Поля задания и значения по умолчанию (video_path обязателен)
+JOB_FIELDS = {
+    'video_path': None,
+    'interval': 2,
+    'start_time': 0.0,
+    'end_time': None,
+    'output_dir': None,         # По умолчанию <каталог приложения>/out/screenshots_<имя видео>_errors
+    'profile': DEFAULT_PROFILE,
+    'sampling': 'auto',
+    'ocr_batch': DEFAULT_OCR_BATCH,
+    'respell': False,           # Проверка по сохраненной расшифровке без OCR (src.transcript)
+    'screenshot_format': 'png',  # Формат скриншотов: png, jpeg или webp (src.screenshots)
+    'screenshot_quality': None,  # Качество JPEG/WebP (1-100) или сжатие PNG (0-9)
+    'thumbnail_width': 0,        # Ширина уменьшенных копий скриншотов (0 - не сохранять)
+    'results': DEFAULT_RESULT_FORMAT,  # Файл результатов по кадрам: jsonl или sqlite (src.result_store)
+    'cprofile': False,          # Профилировать цикл обработки (src.stage_timers.LoopProfiler)
+}
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class Job:
+    """Задание проверки видео и его события
+
+    Хранятся последние MAX_JOB_EVENTS событий: читатель, отставший больше
+    чем на это количество, получает события начиная с самого раннего
+    сохраненного.
+    """
+
+    def __init__(self, params: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = QUEUED
+        self.progress = 0
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.events = []
+        self.dropped_events = 0  # Отброшено событий из начала
+        self._condition = threading.Condition()
+
+    def emit(self, event: dict):
+        """Добавляет событие и будит читателей потока событий"""
+        with self._condition:
+            self.events.append(event)
+            excess = len(self.events) - MAX_JOB_EVENTS
+            if excess > 0:
+                del self.events[:excess]
+                self.dropped_events += excess
+            self._condition.notify_all()
+
+    def log(self, message: str):
+        self.emit({'type': 'log', 'message': message})
+
+    def set_progress(self, value: int):
+        self.progress = value
+        self.emit({'type': 'progress', 'value': value})
+
+    def set_status(self, status: str, **fields):
+        # Состояние и событие меняются вместе: follow() не должен увидеть
+        # завершенное задание без последнего события
+        with self._condition:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.status = status
+            self.emit({'type': 'status', 'status': status, **fields})
+
+    def follow(self):
+        """События задания с начала; после завершения задания итератор заканчивается"""
+        position = 0  # Номер следующего события с учетом отброшенных
+        while True:
+            with self._condition:
+                while (position >= self.dropped_events + len(self.events)
+                       and self.status not in (DONE, FAILED)):
+                    self._condition.wait()
+                position = max(position, self.dropped_events)
+                events = self.events[position - self.dropped_events:]
+                finished = self.status in (DONE, FAILED)
+                total = self.dropped_events + len(self.events)
+            position += len(events)
+            yield from events
+            if finished and position >= total:
+                return
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'params': self.params,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+def parse_job(data) -> dict:
+    """
+    Проверяет параметры задания и дополняет их значениями по умолчанию
+
+    Raises:
+        ValueError: Неизвестное поле, нет видеофайла или недопустимое значение
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Задание должно быть JSON-объектом")
+    unknown = set(data) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+
+    params = {**JOB_FIELDS, **data}
+    if not params['video_path'] or not Path(params['video_path']).is_file():
+        raise ValueError(f"Видеофайл не найден: {params['video_path']}")
+    if params['profile'] not in OCR_PROFILES:
+        raise ValueError(f"Неизвестный профиль OCR: {params['profile']}")
+    if params['sampling'] not in SAMPLING_MODES:
+        raise ValueError(f"Неизвестный режим выборки кадров: {params['sampling']}")
+    try:
+        params['interval'] = int(params['interval'])
+        params['start_time'] = float(params['start_time'])
+        params['end_time'] = float(params['end_time']) if params['end_time'] is not None else None
+        params['ocr_batch'] = int(params['ocr_batch'])
+    except (TypeError, ValueError):
+        raise ValueError("interval, start_time, end_time и ocr_batch должны быть числами")
+    if params['interval'] < 1 or params['ocr_batch'] < 1:
+        raise ValueError("interval и ocr_batch должны быть не меньше 1")
+    if not isinstance(params['respell'], bool):
+        raise ValueError("respell должно быть true или false")
+    if not isinstance(params['cprofile'], bool):
+        raise ValueError("cprofile должно быть true или false")
+    if params['results'] not in RESULT_FORMATS:
+        raise ValueError(f"Неизвестный формат результатов: {params['results']}")
+    if params['end_time'] is not None and params['end_time'] <= params['start_time']:
+        raise ValueError("Конечное время должно быть больше начального")
+    try:
+        if params['screenshot_quality'] is not None:
+            params['screenshot_quality'] = int(params['screenshot_quality'])
+        params['thumbnail_width'] = int(params['thumbnail_width'])
+        ScreenshotFormat(params['screenshot_format'], params['screenshot_quality'], params['thumbnail_width'])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Неверные параметры скриншотов: {e}")
+
+    if params['output_dir'] is None:
+        from src.engine import get_app_dir
+        video_name = Path(params['video_path']).stem
+        params['output_dir'] = str(get_app_dir() / "out" / f"screenshots_{video_name}_errors")
+    return params
+
+
+def evict_finished(jobs: dict, now: float = None):
+    """
+    Удаляет из словаря заданий завершенные задания старше FINISHED_JOB_TTL
+    и самые старые сверх MAX_FINISHED_JOBS
+
+    Args:
+        jobs: Задания по идентификатору
+        now: Текущее время (по умолчанию time.time())
+    """
+    now = time.time() if now is None else now
+    finished = sorted((job for job in jobs.values() if job.status in (DONE, FAILED)),
+                      key=lambda job: job.finished or 0)
+    excess = len(finished) - MAX_FINISHED_JOBS
+    for number, job in enumerate(finished):
+        if number < excess or (job.finished or 0) < now - FINISHED_JOB_TTL:
+            del jobs[job.id]
+
+
+class SpellCheckService:
+    """Очередь заданий, выполняемых по одному на общем прогретом движке проверки"""
+
+    def __init__(self, workers: int = 1, ocr_profile: str = DEFAULT_PROFILE):
+        # Импорт здесь: клиенту (submit) не нужны torch и EasyOCR
+        from src.engine import CheckerEngine
+
+        self.workers = workers
+        self.ocr_profile = ocr_profile
+        self.engine = CheckerEngine()
+        self.jobs = {}
+        self.ready = False
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="daemon-jobs", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, data) -> Job:
+        """Ставит задание в очередь (ValueError - неверные параметры)"""
+        job = Job(parse_job(data))
+        with self._lock:
+            evict_finished(self.jobs)
+            self.jobs[job.id] = job
+        self._queue.put(job)
+        return job
+
+    def queued(self) -> int:
+        return sum(1 for job in list(self.jobs.values()) if job.status == QUEUED)
+
+    def close(self):
+        self._queue.put(None)
+        # Во время задания или загрузки не ждем их завершения - процессы OCR завершатся вместе с сервером
+        if not self.engine.busy:
+            self.engine.close()
+
+    def _run(self):
+        """Поток выполнения заданий"""
+        print("Загрузка моделей OCR и словарей...")
+        try:
+            self.engine.warm_up(log_callback=print, ocr_profile=self.ocr_profile, workers=self.workers)
+            self.ready = True
+            print("OK Сервер готов к работе")
+        except Exception as e:
+            print(f"WARNING Предварительная загрузка не удалась, повтор при первом задании: {e}")
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._process(job)
+
+    def _process(self, job: Job):
+        params = job.params
+        print(f"Задание {job.id}: {params['video_path']}")
+        job.set_status(RUNNING, started=time.time())
+        try:
+            Path(params['output_dir']).mkdir(parents=True, exist_ok=True)
+            with self.engine.checker(output_dir=params['output_dir'], log_callback=job.log,
+                                     progress_callback=job.set_progress,
+                                     ocr_profile=params['profile'], workers=self.workers) as checker:
+                self.ready = True
+                result = checker.process_video_with_result(
+                    params['video_path'], params['interval'], params['start_time'], params['end_time'],
+                    sampling=params['sampling'], ocr_batch=params['ocr_batch'], respell=params['respell'],
+                    screenshot_format=ScreenshotFormat(params['screenshot_format'], params['screenshot_quality'],
+                                                       params['thumbnail_width']),
+                    result_format=params['results'], cprofile=params['cprofile'])
+            job.set_status(DONE, result=result, finished=time.time())
+            print(f"OK Задание {job.id}: ошибок {result['total_errors']}")
+        except Exception as e:
+            job.set_status(FAILED, error=str(e), finished=time.time())
+            print(f"WARNING Задание {job.id} завершилось ошибкой: {e}")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP API сервера (service задается в подклассе, см. make_server)"""
+    service: SpellCheckService = None
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        if parts == ['health']:
+            return self._send_json(200, {'status': 'ok', 'ready': self.service.ready,
+                                         'queued': self.service.queued(), 'jobs': len(self.service.jobs)})
+        if parts == ['jobs']:
+            return self._send_json(200, [job.to_dict() for job in list(self.service.jobs.values())])
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.service.jobs.get(parts[1])
+            if job is None:
+                return self._send_json(404, {'error': f"Задание не найдено: {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] == 'events':
+                return self._stream_events(job)
+        self._send_json(404, {'error': f"Неизвестный путь: {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send_json(404, {'error': f"Неизвестный путь: {self.path}"})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = self.service.submit(json.loads(self.rfile.read(length) or b'null'))
+        except json.JSONDecodeError as e:
+            return self._send_json(400, {'error': f"Неверный JSON: {e}"})
+        except ValueError as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(202, {'id': job.id, 'status': job.status, 'queued': self.service.queued()})
+
+    def _send_json(self, code: int, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, job: Job):
+        """Поток событий задания: по одному JSON-объекту в строке, до завершения задания"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event in job.follow():
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def address_string(self):
+        # У Unix-сокета нет адреса клиента
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('',)
+
+
+def make_server(service: SpellCheckService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                socket_path: str = None):
+    """HTTP-сервер API на localhost или на Unix-сокете (socket_path)"""
+    handler = type('RequestHandler', (_RequestHandler,), {'service': service})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return _UnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def _connect(args) -> http.client.HTTPConnection:
+    if args.socket:
+        return _UnixHTTPConnection(args.socket)
+    return http.client.HTTPConnection(args.host, args.port)
+
+
+def submit_job(args) -> int:
+    """Отправляет задание, выводит ход выполнения и печатает результат (JSON) в stdout"""
+    job = {'video_path': str(Path(args.video_path).absolute()), 'interval': args.interval,
+           'start_time': args.start, 'end_time': args.end, 'profile': args.profile,
+           'sampling': args.sampling, 'ocr_batch': args.ocr_batch, 'respell': args.respell,
+           'screenshot_format': args.screenshot_format, 'screenshot_quality': args.screenshot_quality,
+           'thumbnail_width': args.thumbnail_width, 'results': args.results, 'cprofile': args.cprofile}
+    if args.output_dir:
+        job['output_dir'] = str(Path(args.output_dir).absolute())
+
+    connection = _connect(args)
+    try:
+        connection.request('POST', '/jobs', json.dumps(job), {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+    except OSError as e:
+        print(f"Сервер недоступен ({args.socket or f'{args.host}:{args.port}'}): {e}", file=sys.stderr)
+        return 2
+    answer = json.loads(response.read())
+    if response.status != 202:
+        print(f"Ошибка: {answer.get('error')}", file=sys.stderr)
+        return 2
+    job_id = answer['id']
+    print(f"Задание {job_id} в очереди (заданий в очереди: {answer['queued']})", file=sys.stderr)
+
+    connection = _connect(args)
+    connection.request('GET', f'/jobs/{job_id}/events')
+    response = connection.getresponse()
+    final = None
+    for line in response:
+        event = json.loads(line)
+        if event['type'] == 'log' and not args.quiet:
+            print(event['message'], file=sys.stderr)
+        elif event['type'] == 'status' and event['status'] in (DONE, FAILED):
+            final = event
+
+    if final is None or final['status'] == FAILED:
+        print(f"Ошибка: {final.get('error') if final else 'соединение прервано'}", file=sys.stderr)
+        return 2
+    print(json.dumps(final['result'], ensure_ascii=False, indent=2))
+    return 1 if final['result']['total_errors'] else 0
+
+
+def main():
+    """Запуск сервера или отправка задания"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Сервер проверки орфографии в видео")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_address(command):
+        command.add_argument("--host", default=DEFAULT_HOST, help=f"Адрес (по умолчанию {DEFAULT_HOST})")
+        command.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Порт (по умолчанию {DEFAULT_PORT})")
+        command.add_argument("--socket", metavar="PATH", help="Unix-сокет вместо TCP")
+
+    serve = commands.add_parser("serve", help="Запустить сервер")
+    add_address(serve)
+    serve.add_argument("--workers", type=int, default=1, metavar="N", help="Количество процессов OCR")
+    serve.add_argument("--profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE,
+                       help="Профиль OCR для предварительной загрузки")
+
+    submit = commands.add_parser("submit", help="Отправить задание и дождаться результата")
+    add_address(submit)
+    submit.add_argument("video_path", help="Путь к видеофайлу")
+    submit.add_argument("--interval", type=int, default=2, help="Интервал между кадрами в секундах")
+    submit.add_argument("--start", type=float, default=0.0, help="Начальное время в секундах")
+    submit.add_argument("--end", type=float, default=None, help="Конечное время в секундах")
+    submit.add_argument("--output-dir", help="Папка для результатов")
+    submit.add_argument("--profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE)
+    submit.add_argument("--sampling", choices=SAMPLING_MODES, default="auto")
+    submit.add_argument("--ocr-batch", type=int, default=DEFAULT_OCR_BATCH)
+    submit.add_argument("--respell", action="store_true",
+                        help="Проверить по сохраненной расшифровке без OCR (после изменения словарей)")
+    submit.add_argument("--screenshot-format", choices=list(SCREENSHOT_FORMATS), default="png")
+    submit.add_argument("--screenshot-quality", type=int, default=None,
+                        help="Качество JPEG/WebP (1-100) или степень сжатия PNG (0-9)")
+    submit.add_argument("--thumbnail-width", type=int, default=0,
+                        help="Ширина уменьшенных копий скриншотов (0 - не сохранять)")
+    submit.add_argument("--results", choices=list(RESULT_FORMATS), default=DEFAULT_RESULT_FORMAT,
+                        help="Формат файла результатов по кадрам")
+    submit.add_argument("--cprofile", action="store_true",
+                        help="Профилировать цикл обработки и сохранить profile-*.prof в папку результатов")
+    submit.add_argument("--quiet", action="store_true", help="Не выводить ход выполнения")
+    args = parser.parse_args()
+
+    if args.command == "submit":
+        sys.exit(submit_job(args))
+
+    service = SpellCheckService(workers=args.workers, ocr_profile=args.profile)
+    server = make_server(service, args.host, args.port, args.socket)
+    service.start()
+    print(f"Сервер запущен: {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nОстановка сервера...")
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    # Процессы OCR запускаются методом spawn
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,226 @@
+"""
+Снимки словарей Hunspell для быстрой загрузки
+
+Разбор ru_RU.aff/ru_RU.dic из текста занимает секунды. После первого разбора
+объект spylls.hunspell.Dictionary сохраняется рядом со словарем в файл
+<имя>.snapshot (pickle), при следующих запусках загружается снимок.
+
+Снимок действителен, пока не изменились .aff и .dic: сохраняются их размер,
+время изменения и SHA-256. Если размер и время совпадают, хэш не
+пересчитывается; если изменилось только время (копирование, git checkout),
+снимок остается действительным при совпадении хэша.
+"""
+import gc
+import hashlib
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Tuple
+
+from spylls.hunspell import Dictionary
+
+SNAPSHOT_SUFFIX = '.snapshot'
+
+# Версия формата снимка; увеличивается при несовместимых изменениях
+SNAPSHOT_FORMAT = 1
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = True
+
+
+def _spylls_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version('spylls')
+    except Exception:
+        return 'unknown'
+
+
+@contextmanager
+def _gc_paused():
+    """Отключает сборщик мусора на время создания множества мелких объектов
+
+    Загрузка снимка создает сотни тысяч объектов, и без этого большая часть
+    времени уходит на проходы сборщика мусора. Вызовы из нескольких потоков
+    учитываются: сборщик включается после выхода последнего.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _file_signature(path: Path, with_hash: bool = True) -> dict:
+    """Размер, время изменения и (по запросу) SHA-256 файла"""
+    stat = path.stat()
+    signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        signature['sha256'] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return signature
+
+
+def snapshot_path(base_path) -> Path:
+    """Путь к снимку словаря (base_path - путь без расширения, например dictionaries/ru_RU)"""
+    base_path = Path(base_path)
+    return base_path.with_name(base_path.name + SNAPSHOT_SUFFIX)
+
+
+def snapshot_key(base_path) -> dict:
+    """Ключ снимка: формат, версия spylls и подписи файлов .aff и .dic"""
+    base_path = Path(base_path)
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'spylls': _spylls_version(),
+        'files': {suffix: _file_signature(base_path.with_name(base_path.name + suffix))
+                  for suffix in ('.aff', '.dic')},
+    }
+
+
+def key_matches(stored: dict, base_path: Path) -> bool:
+    """Проверяет, что снимок построен по текущим файлам словаря"""
+    if stored.get('format') != SNAPSHOT_FORMAT or stored.get('spylls') != _spylls_version():
+        return False
+
+    for suffix, saved in stored.get('files', {}).items():
+        current = _file_signature(base_path.with_name(base_path.name + suffix), with_hash=False)
+        if current['size'] != saved.get('size'):
+            return False
+        if current['mtime_ns'] != saved.get('mtime_ns'):
+            current = _file_signature(base_path.with_name(base_path.name + suffix))
+            if current['sha256'] != saved.get('sha256'):
+                return False
+    return True
+
+
+def _share_word_fields(dictionary: Dictionary):
+    """
+    Делает одинаковые поля слов словаря общими объектами
+
+    У каждого из ~150 тыс. слов ru_RU свои множество флагов, пустой словарь
+    data и пустой список alt_spellings, хотя различных наборов флагов всего
+    около полутора сотен. Общие объекты pickle сохраняет один раз, и загрузка
+    снимка создает во много раз меньше объектов. spylls не изменяет эти поля
+    после чтения словаря.
+    """
+    words = getattr(getattr(dictionary, 'dic', None), 'words', None)
+    if not words:
+        return
+
+    flag_sets = {}
+    empty_data = {}
+    empty_spellings = []
+    for word in words:
+        try:
+            word.flags = flag_sets.setdefault(frozenset(word.flags), word.flags)
+            if not word.data:
+                word.data = empty_data
+            if not word.alt_spellings:
+                word.alt_spellings = empty_spellings
+        except (AttributeError, TypeError):
+            return
+
+
+def load_snapshot(base_path):
+    """
+    Загружает словарь из снимка
+
+    Returns:
+        Словарь или None, если снимка нет, он устарел или поврежден
+    """
+    base_path = Path(base_path)
+    path = snapshot_path(base_path)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            if not key_matches(pickle.load(f), base_path):
+                return None
+            with _gc_paused():
+                return pickle.load(f)
+    except Exception:
+        return None
+
+
+def save_snapshot(base_path, dictionary: Dictionary) -> bool:
+    """
+    Сохраняет снимок словаря рядом с файлами .aff/.dic
+
+    Returns:
+        True, если снимок записан (каталог может быть недоступен для записи)
+    """
+    base_path = Path(base_path)
+    path = snapshot_path(base_path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        key = snapshot_key(base_path)
+        _share_word_fields(dictionary)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(dictionary, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except Exception:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def load_dictionary(base_path, use_snapshot: bool = True) -> Tuple[Dictionary, bool]:
+    """
+    Загружает словарь Hunspell: из снимка, если он действителен, иначе из текста
+
+    После разбора текста снимок сохраняется для следующих запусков.
+
+    Args:
+        base_path: Путь к словарю без расширения (например, dictionaries/ru_RU)
+        use_snapshot: Использовать и создавать снимки
+
+    Returns:
+        Кортеж (словарь, загружен_из_снимка)
+    """
+    if use_snapshot:
+        dictionary = load_snapshot(base_path)
+        if dictionary is not None:
+            return dictionary, True
+
+    with _gc_paused():
+        dictionary = Dictionary.from_files(str(base_path))
+    if use_snapshot:
+        save_snapshot(base_path, dictionary)
+    return dictionary, False
+
+
+def load_dictionaries_async(paths: Dict[str, Path], use_snapshot: bool = True) -> Dict[str, Future]:
+    """
+    Запускает параллельную загрузку словарей в фоновых потоках
+
+    Пока словари загружаются, вызывающий код может выполнять другую работу
+    (например, загружать модели OCR).
+
+    Args:
+        paths: Язык -> путь к словарю без расширения
+
+    Returns:
+        Язык -> Future с результатом load_dictionary()
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, len(paths)), thread_name_prefix="dictionary")
+    futures = {language: executor.submit(load_dictionary, path, use_snapshot)
+               for language, path in paths.items()}
+    executor.shutdown(wait=False)
+    return futures
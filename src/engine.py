@@ -0,0 +1,615 @@
+"""
+Движок проверки без GUI: проверка с выводом через обратные вызовы и ее
+повторное использование между запусками
+
+Модуль не зависит от PyQt: его используют и GUI (src.gui_widgets), и
+сервер (src.daemon).
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from src.video_speller import VideoSpellChecker
+from src.change_detector import DEFAULT_CHANGE_THRESHOLD
+from src.ocr_profiles import DEFAULT_PROFILE, get_profile
+from src.ocr import DEFAULT_OCR_BATCH
+from src.ocr_pool import OcrWorkerPool
+from src.dict_snapshot import load_dictionaries_async, load_dictionary
+from src.checkpoint import CheckpointJournal, checkpoint_key
+from src.ignore_rules import IgnoreRules
+from src.occurrences import ErrorAggregator
+from src.frame_source import FrameReader
+from src.screenshots import ScreenshotFormat, ScreenshotWriter, SCREENSHOT_FORMATS
+from src.result_store import DEFAULT_RESULT_FORMAT, open_result_store, write_report
+from src import stage_timers
+from src.stage_timers import LoopProfiler, StageTimers, format_duration
+from src.transcript import Transcript, TranscriptWriter, transcript_key, transcript_key_async, transcript_path
+from src.wordform_index import WordFormIndex, index_paths as wordform_index_paths
+
+
+def get_app_dir():
+    """Получить директорию приложения (работает и для .py и для .exe)"""
+    if getattr(sys, 'frozen', False):
+        # Запущено из exe (PyInstaller)
+        return Path(sys.executable).parent
+    else:
+        # Запущено из .py - возвращаем корень проекта (родитель src/)
+        return Path(__file__).parent.parent
+
+
+_NOT_LOADED = object()
+
+
+class ProcessingCancelled(Exception):
+    """Обработка остановлена по запросу (CheckerEngine.cancel)"""
+
+
+def _files_signature(*paths):
+    """Размер и время изменения файлов (None для отсутствующих) - для проверки, изменились ли они"""
+    signature = []
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+            signature.append((str(path), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((str(path), None))
+    return tuple(signature)
+
+
+class CheckerEngine:
+    """Долгоживущий движок проверки, общий для запусков из GUI
+
+    Проверка (модели OCR, словари Hunspell, индексы словоформ, пользовательский
+    словарь, кэши) создается при первом запуске и используется следующими;
+    перед каждым запуском перезагружаются только части, входные данные которых
+    изменились (см. VideoSpellCheckerWithLogging.update). Одновременно
+    проверкой пользуется только один запуск.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checker = None
+
+    @contextmanager
+    def checker(self, **settings):
+        """
+        Проверка, настроенная на запуск (аргументы - как у VideoSpellCheckerWithLogging)
+
+        Если проверкой пользуется другой запуск, ждет его завершения.
+        """
+        with self._lock:
+            if self._checker is None:
+                self._checker = VideoSpellCheckerWithLogging(**settings)
+            else:
+                self._checker.update(**settings)
+            self._checker.cancelled.clear()
+            try:
+                yield self._checker
+            finally:
+                # Обратные вызовы завершившегося запуска больше не нужны
+                self._checker.log_callback = None
+                self._checker.frame_callback = None
+                self._checker.progress_callback = None
+
+    @property
+    def busy(self) -> bool:
+        """Проверкой пользуется запуск или идет предварительная загрузка"""
+        return self._lock.locked()
+
+    @property
+    def loaded(self) -> bool:
+        """Модели OCR и словари загружены (проверка создана)"""
+        return self._checker is not None
+
+    def cancel(self):
+        """Просит текущий запуск остановиться после очередного кадра
+
+        Не ждет остановки; запуск завершается исключением ProcessingCancelled,
+        журнал обработки остается для продолжения. Предварительная загрузка
+        не прерывается.
+        """
+        checker = self._checker
+        if checker is not None:
+            checker.cancelled.set()
+
+    def warm_up(self, **settings):
+        """Загружает модели OCR и словари заранее, без запуска проверки
+
+        Запуск, начатый во время загрузки, дождется ее окончания в checker().
+        Если проверка уже создана (запуск успел начаться раньше), ничего не делает.
+        """
+        with self._lock:
+            if self._checker is None:
+                self._checker = VideoSpellCheckerWithLogging(output_dir=None, **settings)
+                self._checker.log_callback = None
+
+    def close(self):
+        """Останавливает процессы OCR; дожидается завершения текущего запуска"""
+        with self._lock:
+            if self._checker is not None:
+                self._checker.close()
+                self._checker = None
+
+
+class VideoSpellCheckerWithLogging(VideoSpellChecker):
+    """Расширенный класс с поддержкой логирования в GUI"""
+
+    def __init__(self, output_dir="screenshots_with_errors", log_callback=None, frame_callback=None,
+                 progress_callback=None, custom_dict_path=None, ocr_profile=DEFAULT_PROFILE,
+                 workers=1):
+        self.reader = None
+        self.ocr_pool = None
+        self.cancelled = threading.Event()  # Запрос остановки обработки (CheckerEngine.cancel)
+        self._signatures = {}  # Часть проверки -> подпись входных данных, по которым она загружена
+        self.update(output_dir, log_callback, frame_callback, progress_callback,
+                    custom_dict_path, ocr_profile, workers)
+
+    def update(self, output_dir="screenshots_with_errors", log_callback=None, frame_callback=None,
+               progress_callback=None, custom_dict_path=None, ocr_profile=DEFAULT_PROFILE,
+               workers=1):
+        """Настраивает проверку на очередной запуск
+
+        Модели OCR, словари, индексы словоформ и пользовательский словарь
+        перезагружаются, только если изменились их входные данные: количество
+        процессов OCR или размер и время изменения файлов. Кэши проверки слов
+        сбрасываются только вместе со словарями.
+        """
+        self.log_callback = log_callback
+        self.frame_callback = frame_callback
+        self.progress_callback = progress_callback
+        # Папка вывода не нужна для предварительной загрузки (CheckerEngine.warm_up)
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        if self.output_dir is not None:
+            self.output_dir.mkdir(exist_ok=True)
+        self.ocr_profile = get_profile(ocr_profile)
+
+        # Определяем путь к пользовательскому словарю
+        if custom_dict_path is None:
+            app_dir = get_app_dir()
+            custom_dict_path = app_dir / "custom_dictionary.txt"
+
+        # Загружаем пользовательский словарь
+        custom_signature = _files_signature(custom_dict_path)
+        if self._changed('custom_dictionary', custom_signature):
+            self.custom_words = self._load_custom_dictionary(custom_dict_path)
+            self._signatures['custom_dictionary'] = custom_signature
+
+        # Словари Hunspell загружаются в фоне (оба языка параллельно), пока загружаются модели OCR
+        dict_dir = get_app_dir() / 'dictionaries'
+        dict_files = [dict_dir / f'{name}{suffix}' for name in ('ru_RU', 'en_US') for suffix in ('.aff', '.dic')]
+        dict_signature = _files_signature(*dict_files)
+        reload_dictionaries = self._changed('dictionaries', dict_signature)
+        dictionaries = {}
+        if reload_dictionaries:
+            dictionaries = load_dictionaries_async({
+                name: dict_dir / name for name in ('ru_RU', 'en_US')
+                if (dict_dir / f'{name}.aff').exists() and (dict_dir / f'{name}.dic').exists()
+            })
+
+        # Инициализируем EasyOCR
+        if self._changed('ocr', workers):
+            self.close()
+            self.reader = None
+            self.log("⏳ Загрузка моделей OCR (это может занять время при первом запуске)...")
+            if workers > 1:
+                self.ocr_pool = OcrWorkerPool(workers)
+                self.log(f"✓ Запущено процессов OCR: {workers} (потоков torch в каждом: {self.ocr_pool.threads})")
+            else:
+                import easyocr
+                self.reader = easyocr.Reader(['ru', 'en'], gpu=False)
+                self.log("✓ Модели OCR загружены")
+            self._signatures['ocr'] = workers
+        else:
+            self.log("✓ Модели OCR уже загружены")
+
+        # Инициализируем проверку орфографии
+        if reload_dictionaries:
+            self.log("⏳ Загрузка словарей...")
+            self.spell_ru = self._load_dictionary('ru_RU', 'Русский', dictionaries.get('ru_RU'))
+            self.spell_en = self._load_dictionary('en_US', 'Английский', dictionaries.get('en_US'))
+            self._init_spelling_cache()
+            self._signatures['dictionaries'] = dict_signature
+        else:
+            self.log("✓ Словари уже загружены")
+
+        index_paths = {'ru': dict_dir / 'ru_RU', 'en': dict_dir / 'en_US'}
+        index_files = [path for base in index_paths.values() for path in wordform_index_paths(base)]
+        index_signature = (dict_signature, _files_signature(*index_files))
+        if self._changed('form_indexes', index_signature):
+            self._init_form_indexes(index_paths)
+            self._signatures['form_indexes'] = index_signature
+
+    def _changed(self, part, signature) -> bool:
+        """True, если часть не загружена или загружена по другим входным данным"""
+        return self._signatures.get(part, _NOT_LOADED) != signature
+
+    def _init_form_indexes(self, paths):
+        """Открывает индексы словоформ, если они построены (сообщения - в лог GUI)"""
+        self.form_indexes = {language: WordFormIndex.load(path) for language, path in paths.items()}
+        if all(index is not None for index in self.form_indexes.values()):
+            self.log("✓ Индексы словоформ загружены")
+        else:
+            self.log("ℹ Индекс словоформ не построен, проверка только через Hunspell "
+                     "(построить: python -m src.wordform_index)")
+
+    def _load_dictionary(self, dict_name, display_name, pending=None):
+        """Загружает словарь Hunspell из папки dictionaries
+
+        Для GUI версии пути определяются через get_app_dir() для работы с PyInstaller.
+        pending - Future уже запущенной фоновой загрузки (load_dictionaries_async);
+        словарь загружается из снимка, если он действителен.
+        """
+        app_dir = get_app_dir()
+        dict_dir = app_dir / 'dictionaries'
+        dict_path = dict_dir / dict_name
+        aff_file = dict_dir / f'{dict_name}.aff'
+        dic_file = dict_dir / f'{dict_name}.dic'
+
+        # Проверяем наличие файлов словаря
+        if aff_file.exists() and dic_file.exists():
+            try:
+                if pending is not None:
+                    dictionary, from_snapshot = pending.result()
+                else:
+                    dictionary, from_snapshot = load_dictionary(dict_path)
+                self.log(f"✓ {display_name} словарь загружен" + (" (из снимка)" if from_snapshot else ""))
+                return dictionary
+            except Exception as e:
+                self.log(f"⚠ Ошибка загрузки {display_name.lower()} словаря: {e}")
+                return None
+        else:
+            # Словарь не найден - GUI предложит загрузить через диалог
+            self.log(f"⚠ {display_name} словарь не найден")
+            self.log(f"ℹ Для автоматической загрузки словарей используйте: python -m src.download_dictionaries")
+            return None
+
+    def _load_custom_dictionary(self, dict_path):
+        """Загружает пользовательский словарь из файла: слова и шаблоны (см. src.ignore_rules)"""
+        custom_words = IgnoreRules()
+
+        try:
+            if Path(dict_path).exists():
+                with open(dict_path, 'r', encoding='utf-8') as f:
+                    custom_words = IgnoreRules(line.strip() for line in f
+                                               if line.strip() and not line.strip().startswith('#'))
+
+                for entry, error in custom_words.invalid:
+                    self.log(f"⚠ Неверное регулярное выражение в пользовательском словаре: {entry} ({error})")
+                self.log(f"✓ Загружено слов из пользовательского словаря: "
+                         f"{len(custom_words.words) + len(custom_words.exact_words)}")
+                if custom_words.patterns:
+                    self.log(f"✓ Загружено шаблонов из пользовательского словаря: {custom_words.patterns}")
+            else:
+                self.log(f"ℹ Пользовательский словарь пуст")
+
+        except Exception as e:
+            self.log(f"⚠ Ошибка при чтении пользовательского словаря: {e}")
+
+        return custom_words
+
+    def log(self, message):
+        """Вывод сообщения в лог"""
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def frame_text(self, results):
+        """Текст кадра для проверки орфографии: блоки OCR построчно"""
+        return '\n'.join(result[1] for result in results)  # result[1] содержит распознанный текст
+
+    def send_frame(self, frame):
+        """Отправить кадр для превью"""
+        if self.frame_callback:
+            self.frame_callback(frame)
+
+    def send_progress(self, progress):
+        """Отправить прогресс обработки (0-100)"""
+        if self.progress_callback:
+            self.progress_callback(progress)
+
+    def _cleanup_old_results(self):
+        """Очищает старые скриншоты и текстовые файлы с ошибками, сохраняя итоговые отчеты"""
+        import glob
+        import os
+
+        # Удаляем старые скриншоты и их уменьшенные копии (frame_*_errors.png, .jpg, .webp)
+        for extension in SCREENSHOT_FORMATS.values():
+            for image_file in glob.glob(str(self.output_dir / f"frame_*_errors*{extension}")):
+                try:
+                    os.remove(image_file)
+                except Exception as e:
+                    self.log(f"⚠ Не удалось удалить {image_file}: {e}")
+
+        # Удаляем старые TXT файлы с ошибками (frame_*_errors.txt)
+        for txt_file in glob.glob(str(self.output_dir / "frame_*_errors.txt")):
+            try:
+                os.remove(txt_file)
+            except Exception as e:
+                self.log(f"⚠ Не удалось удалить {txt_file}: {e}")
+
+        # Отчеты report-*.txt НЕ удаляем
+
+    def process_video_with_result(self, video_path, interval=2, start_time=0.0, end_time=None,
+                                  sampling='auto', change_threshold=DEFAULT_CHANGE_THRESHOLD,
+                                  regions=None, auto_roi_frames=0, ocr_batch=DEFAULT_OCR_BATCH,
+                                  respell=False, screenshot_format=ScreenshotFormat(),
+                                  result_format=DEFAULT_RESULT_FORMAT, cprofile=False):
+        """Обработка видео с возвратом результата
+
+        При respell=True OCR не выполняется: текст кадров берется из расшифровки,
+        сохраненной предыдущей проверкой с теми же видео и настройками OCR
+        (src.transcript), и заново проверяется текущими словарями.
+        Скриншоты кодируются и записываются в фоне (src.screenshots) в формате
+        screenshot_format. Записи кадров добавляются в файл результатов
+        (src.result_store, формат result_format) по мере обработки; итоговый
+        отчет строится по этому файлу. Время этапов (src.stage_timers) выводится
+        в журнал и отчет; при cprofile=True цикл обработки профилируется и
+        профиль сохраняется в папку результатов.
+        """
+        import re
+        import glob
+        from datetime import datetime
+
+        self.log("")
+
+        # Расшифровка (результат OCR) для повторной проверки без OCR. Ключ с хэшем
+        # видео нужен сразу только для чтения расшифровки; при записи он
+        # вычисляется в фоне, пока идет обработка
+        ocr_settings = (video_path, interval, start_time, end_time, sampling, change_threshold,
+                        regions, auto_roi_frames, self.ocr_profile.name)
+        ocr_key = transcript_file = transcript = None
+        if respell:
+            ocr_key = transcript_key(*ocr_settings, cache_dir=self.output_dir)
+            transcript_file = transcript_path(self.output_dir, ocr_key)
+            transcript = Transcript.load(transcript_file, ocr_key)
+            if transcript is None:
+                raise ValueError("Нет сохраненной расшифровки для этого видео и настроек OCR - "
+                                 "сначала выполните обычную проверку")
+
+        # Журнал обработки: повторный запуск с теми же видео и настройками продолжает
+        # прерванную обработку, поэтому ее результаты не удаляются
+        journal = CheckpointJournal(self.output_dir, checkpoint_key(
+            video_path, interval, start_time, end_time, sampling, change_threshold,
+            regions, auto_roi_frames, self.ocr_profile.name, self.custom_words))
+        resumed = journal.load()
+
+        # Очищаем старые результаты (кроме отчетов)
+        if not resumed:
+            self._cleanup_old_results()
+
+        # Открываем источник кадров (кадры декодируются по мере обработки);
+        # при проверке по расшифровке кадры читаются только для скриншотов
+        if transcript is not None:
+            frames = transcript
+            frame_reader = FrameReader(video_path)
+            self.log(f"ℹ Проверка по сохраненной расшифровке без OCR: {transcript_file.name}")
+        else:
+            frames = self.iter_frames(video_path, interval, start_time, end_time, sampling)
+            frame_reader = None
+        fps = frames.fps
+        duration = frames.duration
+
+        # Форматируем время для отображения
+        start_min, start_sec = divmod(int(start_time), 60)
+        if end_time is not None:
+            end_min, end_sec = divmod(int(end_time), 60)
+            self.log(f"ℹ Анализ видео с {start_min}:{start_sec:02d} до {end_min}:{end_sec:02d}")
+        else:
+            dur_min, dur_sec = divmod(int(duration), 60)
+            self.log(f"ℹ Анализ видео с {start_min}:{start_sec:02d} до {dur_min}:{dur_sec:02d} (конец)")
+
+        self.log(f"ℹ Кадры: {frames.start_frame} - {frames.end_frame} из {frames.total_frames}")
+        self.log(f"ℹ Кадров к обработке: {len(frames)}")
+        self.log(f"ℹ Профиль OCR: {self.ocr_profile.title}")
+        if regions:
+            self.log("ℹ Области распознавания: " + "; ".join(str(region) for region in regions))
+
+        # Результаты обработки (с учетом кадров из журнала прерванного запуска):
+        # ошибки соседних кадров объединяются во вхождения (src.occurrences)
+        aggregator = ErrorAggregator()
+        processed_frames = 0
+        ocr_skipped = 0
+        if resumed:
+            self.log(f"ℹ Продолжение прерванной обработки: уже обработано кадров {len(journal.frames)} "
+                     f"(до кадра #{journal.last_frame})")
+            frames.resume_after(journal.last_frame)
+            for entry in journal.frames:
+                processed_frames += 1
+                ocr_skipped += entry['reused']
+                started = aggregator.add(entry['frame'], entry['timecode'], entry.get('findings', []),
+                                         entry.get('text', ''))
+                for occurrence in started:
+                    occurrence.screenshot = entry.get('screenshot')
+        resumed_frames = processed_frames
+        expected_frames = len(frames) + processed_frames
+
+        # Файл результатов: при продолжении сохраняются записи кадров из журнала
+        store = open_result_store(self.output_dir, result_format, journal.last_frame if resumed else None)
+        store.start({
+            'video_path': str(video_path),
+            'interval': interval,
+            'start_time': start_time,
+            'end_time': end_time if end_time else duration,
+            'profile': self.ocr_profile.name,
+            'profile_title': self.ocr_profile.title,
+            'fps': fps,
+            'resumed_frames': resumed_frames,
+            'transcript': transcript_file.name if transcript is not None else None,
+            'output_dir': str(self.output_dir.absolute()),
+            'started': datetime.now().isoformat(timespec='seconds'),
+        })
+        self.log(f"ℹ Результаты по кадрам: {store.path.name}")
+        journal.start(resumed)
+        self.verdict_cache.reset_stats()
+        self.suggestion_cache.reset_stats()
+        self.custom_words.reset_stats()
+        self.timers = StageTimers()
+
+        # Расшифровка пишется только при полном проходе с OCR
+        transcript_writer = None
+        if transcript is None:
+            if resumed:
+                self.log("ℹ Расшифровка не сохраняется: обработка продолжена с середины")
+            else:
+                transcript_writer = TranscriptWriter(
+                    self.output_dir, transcript_key_async(*ocr_settings, cache_dir=self.output_dir), frames)
+
+        # Декодирование, OCR и проверка орфографии идут в отдельных потоках,
+        # здесь - превью и отчет; скриншоты кодируются в фоновых потоках
+        screenshots = ScreenshotWriter(self.output_dir, screenshot_format, timers=self.timers)
+        if transcript is not None:
+            pipeline = self.build_respell_pipeline(transcript)
+        else:
+            pipeline = self.build_pipeline(frames, change_threshold, regions, auto_roi_frames, ocr_batch)
+        if cprofile:
+            profile_name = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.prof"
+            pipeline.profiler = LoopProfiler(self.output_dir / profile_name)
+        stages = pipeline.run("запись")
+        loop_started = time.perf_counter()
+        try:
+            for frame_num, timecode, frame, results, reused, frame_text, misspellings in stages:
+                if self.cancelled.is_set():
+                    raise ProcessingCancelled("Обработка остановлена")
+                processed_frames += 1
+                # Скорость - по кадрам этого запуска (без кадров из журнала)
+                rate = (processed_frames - resumed_frames) / max(time.perf_counter() - loop_started, 1e-6)
+                self.log(f"\nОбработка кадра {processed_frames}/{expected_frames} (кадр #{frame_num}, "
+                         f"{rate:.1f} кадр/с, осталось ~{format_duration((expected_frames - processed_frames) / rate)})...")
+                if transcript_writer is not None:
+                    transcript_writer.add(frame_num, timecode, reused, results)
+
+                # Отправляем кадр для превью и обновляем прогресс
+                if frame is not None:
+                    self.send_frame(frame)
+                progress = min(100, int(processed_frames / expected_frames * 100))
+                self.send_progress(progress)
+
+                if reused:
+                    # Кадр не изменился - ошибки те же, что на предыдущем кадре
+                    ocr_skipped += 1
+                    self.log("  ℹ Кадр не изменился, используется предыдущий результат OCR")
+
+                if not results:
+                    self.log("  ℹ Текст не обнаружен")
+                    aggregator.add(frame_num, timecode, [])
+                    with self.timers.measure(stage_timers.RESULTS):
+                        store.add_frame(self.frame_record(frame_num, timecode, reused, results, '', [], []))
+                    journal.record(frame_num, timecode, reused)
+                    continue
+
+                # Варианты исправления подбираются здесь, один раз на слово
+                findings = self.frame_findings(misspellings, results)
+                text = ' '.join([result[1] for result in results]) if findings else ''
+                started = aggregator.add(frame_num, timecode, findings, text)
+                screenshot = written = None
+                if findings:
+                    self.log(f"  ⚠ Найдено ошибок: {len(findings)}, новых: {len(started)}")
+                    for occurrence in started[:5]:
+                        self.log(f"     • {occurrence.error}")
+                    if len(started) > 5:
+                        self.log(f"     ... и еще {len(started) - 5} ошибок")
+                else:
+                    self.log("  ✓ Ошибок не найдено")
+
+                if started:
+                    # Скриншот - один на кадр, где начались новые вхождения ошибок
+                    if frame is None:
+                        # Проверка по расшифровке: кадр читается только для скриншота
+                        frame = frame_reader.read(frame_num)
+                        if frame is not None:
+                            self.send_frame(frame)
+
+                    # Кадр с ошибками ставится в очередь записи
+                    if frame is not None:
+                        written = screenshots.submit(frame, f"frame_{frame_num}_errors")
+                        screenshot = screenshots.filename(f"frame_{frame_num}_errors")
+                        self.log(f"  ✓ Сохранение: {self.output_dir / screenshot}")
+                    else:
+                        self.log(f"  ⚠ Не удалось прочитать кадр #{frame_num} для скриншота")
+                    for occurrence in started:
+                        occurrence.screenshot = screenshot
+
+                # Кадр обработан; в журнал он попадет после записи скриншота
+                with self.timers.measure(stage_timers.RESULTS):
+                    store.add_frame(self.frame_record(frame_num, timecode, reused, results, frame_text,
+                                                      misspellings, findings, screenshot))
+                journal.record(frame_num, timecode, reused, findings, text, screenshot, written)
+
+            if transcript_writer is not None:
+                try:
+                    transcript_file = transcript_writer.complete()
+                    self.log(f"\nℹ Расшифровка сохранена для повторной проверки без OCR: {transcript_file.name}")
+                except OSError as e:
+                    self.log(f"\n⚠ Расшифровка не сохранена: {e}")
+                transcript_writer = None
+
+            screenshots.close()
+            run_stats = [
+                ("OCR пропущен для неизменившихся кадров", ocr_skipped),
+                ("Загрузка стадий конвейера", pipeline.summary()),
+                ("Кэш проверки слов", str(self.verdict_cache)),
+                ("Варианты исправления", str(self.suggestion_cache)),
+                ("Пользовательский словарь", str(self.custom_words)),
+                ("Скриншоты", str(screenshots)),
+            ]
+            store.finish({'stats': run_stats, 'timers': self.timers.to_dict(), 'total_frames': processed_frames,
+                          'frames_with_errors': aggregator.frames_with_errors, 'total_errors': len(aggregator)})
+        finally:
+            # Скриншоты из очереди записываются до закрытия журнала;
+            # при сбое или отмене журнал остается для следующего запуска
+            screenshots.close()
+            store.close()
+            journal.close()
+            if transcript_writer is not None:
+                transcript_writer.discard()
+            if frame_reader is not None:
+                frame_reader.release()
+
+        self.log("\n" + "=" * 60)
+        self.log("ОБРАБОТКА ЗАВЕРШЕНА!")
+        self.log("=" * 60)
+        self.log(f"Всего обработано кадров: {processed_frames}")
+        for label, value in run_stats:
+            self.log(f"{label}: {value}")
+        for failure in screenshots.failed:
+            self.log(f"  ⚠ Не удалось сохранить скриншот {failure}")
+        self.log("Время по этапам:")
+        for timer in self.timers:
+            self.log(f"  {timer}")
+        profile_path = pipeline.profiler.dump() if pipeline.profiler is not None else None
+        if profile_path is not None:
+            self.log(f"ℹ Профиль цикла обработки: {profile_path} (просмотр: python -m pstats {profile_path})")
+        self.log(f"Кадров с ошибками: {aggregator.frames_with_errors}")
+        self.log(f"Всего найдено ошибок: {len(aggregator)}")
+        self.log(f"Результаты сохранены в: {self.output_dir.absolute()}")
+        self.log("=" * 60)
+
+        # Итоговый отчёт строится по файлу результатов
+        report_filename = f"report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.txt"
+        report_path = self.output_dir / report_filename
+        write_report(store.path, report_path)
+        self.log(f"\n✓ Итоговый отчёт сохранён: {report_path}")
+
+        # Обработка завершена - следующий запуск начнется с начала
+        journal.complete()
+
+        return {
+            'total_frames': processed_frames,
+            'ocr_skipped': ocr_skipped,
+            'resumed_frames': resumed_frames,
+            'respell': transcript is not None,
+            'stage_utilization': {stats.name: stats.utilization for stats in pipeline.stats},
+            'verdict_cache': {'hits': self.verdict_cache.hits, 'misses': self.verdict_cache.misses},
+            'ignored_tokens': self.custom_words.filtered,
+            'frames_with_errors': aggregator.frames_with_errors,
+            'total_errors': len(aggregator),
+            'output_dir': str(self.output_dir.absolute()),
+            'errors_details': [occurrence.to_dict() for occurrence in aggregator.occurrences],
+            'fps': fps,
+            'report_file': str(report_path),
+            'results_file': str(store.path),
+            'stage_timers': self.timers.to_dict(),
+            'profile_file': str(profile_path) if profile_path is not None else None
+        }
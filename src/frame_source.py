@@ -0,0 +1,173 @@
+"""
+Ленивый источник кадров видео
+"""
+import math
+import cv2
+
+# Режимы выборки кадров:
+#   read - декодирование каждого кадра (исходное поведение)
+#   grab - пропуск кадров через cap.grab() без retrieve и преобразования цвета
+#   seek - переход к нужному кадру по позиции (выгодно при больших интервалах)
+#   auto - выбор между grab и seek по величине интервала
+SAMPLING_MODES = ('auto', 'read', 'grab', 'seek')
+
+# Начиная с этого интервала (в кадрах) переход по позиции дешевле, чем
+# последовательный пропуск: при seek декодер начинает с предыдущего ключевого
+# кадра, то есть в среднем декодирует половину группы кадров (GOP), а
+# типичный GOP у H.264 - около 250 кадров
+SEEK_MIN_INTERVAL_FRAMES = 125
+
+
+class FrameSource:
+    """Итерируемый источник кадров с заданным интервалом
+
+    Кадры декодируются по одному и отдаются генератором в виде
+    кортежей (номер_кадра, тайм-код_в_секундах, изображение), поэтому
+    в памяти одновременно находится только текущий кадр, а обработка
+    начинается сразу после декодирования первого кадра.
+    """
+
+    def __init__(self, video_path: str, interval: float = 2, start_time: float = 0.0,
+                 end_time: float = None, sampling: str = 'auto', log=print):
+        """
+        Открывает видео и вычисляет диапазон кадров
+
+        Args:
+            video_path: Путь к видеофайлу
+            interval: Интервал в секундах между кадрами
+            start_time: Начальное время в секундах (по умолчанию с начала)
+            end_time: Конечное время в секундах (по умолчанию до конца)
+            sampling: Режим выборки кадров (см. SAMPLING_MODES)
+            log: Функция для вывода предупреждений
+        """
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f"Неизвестный режим выборки кадров: {sampling}")
+
+        self.video_path = video_path
+        self.cap = cv2.VideoCapture(video_path)
+
+        if not self.cap.isOpened():
+            raise ValueError(f"Не удалось открыть видео: {video_path}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.duration = self.total_frames / self.fps if self.fps > 0 else 0
+
+        # Интервал не может быть меньше одного кадра
+        self.frame_interval = max(1, int(self.fps * interval))
+
+        # Вычисляем начальный и конечный кадры
+        self.start_frame = int(start_time * self.fps)
+        self.end_frame = int(end_time * self.fps) if end_time is not None else self.total_frames
+
+        # Проверяем корректность временных границ
+        if self.start_frame >= self.total_frames:
+            log(f"⚠ Начальное время {start_time}s превышает длительность видео {self.duration:.1f}s")
+            self.start_frame = 0
+
+        if self.end_frame > self.total_frames:
+            self.end_frame = self.total_frames
+
+        if self.start_frame >= self.end_frame:
+            self.release()
+            raise ValueError(f"Начальное время ({start_time}s) должно быть меньше конечного ({end_time}s)")
+
+        if sampling == 'auto':
+            sampling = 'seek' if self.frame_interval >= SEEK_MIN_INTERVAL_FRAMES else 'grab'
+        self.sampling = sampling
+
+    def resume_after(self, frame_num: int):
+        """
+        Продолжает выборку после кадра frame_num, сохраняя сетку выбираемых кадров
+
+        Используется при возобновлении прерванной обработки (src.checkpoint).
+        """
+        steps = max(0, (frame_num - self.start_frame) // self.frame_interval + 1)
+        self.start_frame = min(self.start_frame + steps * self.frame_interval, self.end_frame)
+
+    def __len__(self) -> int:
+        """Ожидаемое количество кадров (фактическое может быть меньше при ошибке чтения)"""
+        return math.ceil((self.end_frame - self.start_frame) / self.frame_interval)
+
+    def __iter__(self):
+        """Генерирует кортежи (номер_кадра, тайм-код, изображение)"""
+        if self.cap is None:
+            raise RuntimeError("Источник кадров уже был прочитан")
+
+        try:
+            if self.sampling == 'seek':
+                yield from self._iter_seek()
+            else:
+                yield from self._iter_sequential(skip_decode=self.sampling == 'grab')
+        finally:
+            self.release()
+
+    def _iter_sequential(self, skip_decode: bool):
+        """Последовательное чтение; пропускаемые кадры либо декодируются, либо только захватываются"""
+        # Перемещаемся к начальному кадру
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+        frame_count = self.start_frame
+
+        while frame_count < self.end_frame:
+            if (frame_count - self.start_frame) % self.frame_interval == 0:
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                yield frame_count, self.timecode(frame_count), frame
+            elif skip_decode:
+                # grab() продвигает поток без retrieve() и преобразования в BGR
+                if not self.cap.grab():
+                    break
+            else:
+                ret, _ = self.cap.read()
+                if not ret:
+                    break
+
+            frame_count += 1
+
+    def _iter_seek(self):
+        """Переход к каждому выбранному кадру по позиции"""
+        for frame_num in range(self.start_frame, self.end_frame, self.frame_interval):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            yield frame_num, self.timecode(frame_num), frame
+
+    def timecode(self, frame_num: int) -> float:
+        """Тайм-код кадра в секундах"""
+        return frame_num / self.fps if self.fps > 0 else 0.0
+
+    def release(self):
+        """Освобождает видеофайл"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class FrameReader:
+    """Чтение отдельных кадров видео по номеру
+
+    Используется при проверке по сохраненной расшифровке (src.transcript):
+    декодируются только кадры, для которых нужен скриншот.
+    """
+
+    def __init__(self, video_path: str):
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise ValueError(f"Не удалось открыть видео: {video_path}")
+        self._next_frame = 0
+
+    def read(self, frame_num: int):
+        """Изображение кадра frame_num или None, если кадр прочитать не удалось"""
+        if frame_num != self._next_frame:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+        ret, frame = self.cap.read()
+        self._next_frame = frame_num + 1
+        return frame if ret else None
+
+    def release(self):
+        """Освобождает видеофайл"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
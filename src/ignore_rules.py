@@ -0,0 +1,143 @@
+"""
+Правила пользовательского словаря: слова и шаблоны, которые не проверяются по словарям
+
+Формат строк файла custom_dictionary.txt:
+    слово          - слово без учета регистра (ё и е не различаются)
+    =NASA          - слово с учетом регистра
+    iPhone*        - начало слова (* - любые символы), без учета регистра
+    *Exception     - окончание слова
+    =Py*           - шаблон с учетом регистра
+    /[A-Z]{2,}\\d+/  - регулярное выражение для всего токена, с учетом регистра
+    /https?://.*/i - регулярное выражение без учета регистра
+
+Правила применяются к токенам текста (фрагментам между пробелами, без
+окружающей пунктуации) и к словам внутри них - до любого обращения к
+словарям Hunspell. Все шаблоны компилируются в одно регулярное выражение,
+поэтому в регулярных выражениях не поддерживаются флаги для всего выражения
+((?i), (?x) и т.п. - используйте /.../i или (?i:...)) и ссылки на группы по
+номеру (\\1 - используйте (?P<имя>...) и (?P=имя)); такие строки, как и
+строки с ошибками, попадают в invalid.
+"""
+import copy
+import re
+from typing import Iterable, List, Tuple
+
+from src.tokenizer import normalize
+
+# Ссылка на группу по номеру (\1, (?(1)...)): номера групп меняются при объединении шаблонов
+_NUMBERED_REFERENCE = re.compile(r'\\[1-9]|\(\?\(\d')
+
+
+class IgnoreRules:
+    """Слова и шаблоны пользовательского словаря, собранные в один сопоставитель
+
+    Считает отфильтрованные токены (filtered).
+    """
+
+    def __init__(self, entries: Iterable[str] = ()):
+        """
+        Args:
+            entries: Строки словаря без комментариев и пустых строк
+        """
+        self.entries: List[str] = []
+        self.words = set()  # Слова без учета регистра (нормализованные, см. tokenizer.normalize)
+        self.exact_words = set()  # Слова с учетом регистра
+        self.patterns = 0  # Количество шаблонов и регулярных выражений
+        self.invalid: List[Tuple[str, str]] = []  # (строка, ошибка) - неверные регулярные выражения
+        self.filtered = 0
+
+        patterns = []
+        for entry in entries:
+            pattern = self._add(entry)
+            if pattern is not None:
+                patterns.append((entry, pattern))
+        self._pattern = self._combine(patterns)
+
+    def _combine(self, patterns: List[Tuple[str, str]]):
+        """Одно регулярное выражение из шаблонов
+
+        Если шаблоны несовместимы друг с другом (например, одинаковые имена
+        групп), они добавляются по одному, а конфликтующие попадают в invalid.
+        """
+        if not patterns:
+            return None
+        try:
+            return re.compile('|'.join(pattern for _, pattern in patterns))
+        except re.error:
+            pass
+        accepted = []
+        for entry, pattern in patterns:
+            try:
+                re.compile('|'.join(accepted + [pattern]))
+            except re.error as e:
+                self.invalid.append((entry, f"конфликтует с предыдущими шаблонами: {e}"))
+                self.entries.remove(entry)
+                self.patterns -= 1
+                continue
+            accepted.append(pattern)
+        return re.compile('|'.join(accepted)) if accepted else None
+
+    def _add(self, entry: str):
+        """Разбирает строку словаря; возвращает регулярное выражение для шаблона или None"""
+        if len(entry) > 2 and entry.startswith('/') and (entry.endswith('/') or entry.endswith('/i')):
+            ignore_case = entry.endswith('/i')
+            source = entry[1:-2] if ignore_case else entry[1:-1]
+            pattern = f"(?i:{source})" if ignore_case else f"(?:{source})"
+            if _NUMBERED_REFERENCE.search(source.replace('\\\\', '')):
+                self.invalid.append((entry, "ссылки на группы по номеру не поддерживаются, "
+                                            "используйте (?P<имя>...) и (?P=имя)"))
+                return None
+            try:
+                # Проверяется в том виде, в котором войдет в общее выражение:
+                # флаги для всего выражения ((?i) и т.п.) здесь недопустимы
+                re.compile(pattern)
+            except re.error as e:
+                self.invalid.append((entry, str(e)))
+                return None
+            self.entries.append(entry)
+            self.patterns += 1
+            return pattern
+
+        case_sensitive = entry.startswith('=') and len(entry) > 1
+        word = entry[1:] if case_sensitive else entry
+        self.entries.append(entry)
+        if '*' not in word:
+            if case_sensitive:
+                self.exact_words.add(word)
+            else:
+                self.words.add(normalize(word))
+            return None
+
+        self.patterns += 1
+        source = '.*'.join(re.escape(part) for part in word.split('*'))
+        return f"(?:{source})" if case_sensitive else f"(?i:{source})"
+
+    def __contains__(self, token: str) -> bool:
+        """Токен подпадает под одно из правил"""
+        return (normalize(token) in self.words or token in self.exact_words
+                or (self._pattern is not None and self._pattern.fullmatch(token) is not None))
+
+    def filter(self, token: str) -> bool:
+        """Как `token in rules`, но учитывает отфильтрованный токен в статистике"""
+        if token in self:
+            self.filtered += 1
+            return True
+        return False
+
+    def reset_stats(self):
+        self.filtered = 0
+
+    def view(self) -> 'IgnoreRules':
+        """Те же правила со своим счетчиком отфильтрованных токенов"""
+        view = copy.copy(self)
+        view.filtered = 0
+        return view
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        return f"отфильтровано токенов: {self.filtered}"
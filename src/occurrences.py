@@ -0,0 +1,154 @@
+"""
+Объединение ошибок соседних кадров в вхождения
+
+Опечатка на слайде, который показывается минуту, находится на каждом
+выбранном кадре. Вместо записи на каждый кадр ошибки группируются по слову и
+области текста (рамке блока OCR): пока слово остается на месте на
+последовательных обработанных кадрах, это одно вхождение с первым и последним
+тайм-кодом и количеством кадров. Скриншот сохраняется один раз - на кадре, где
+вхождение началось, поэтому число файлов и размер отчета растут с количеством
+разных ошибок, а не с длительностью видео.
+"""
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple
+
+from src.tokenizer import tokenize
+
+# Доля пересечения рамок (IoU), начиная с которой слово считается на том же месте
+DEFAULT_REGION_OVERLAP = 0.3
+
+Box = Tuple[int, int, int, int]
+
+
+def block_box(bbox) -> Box:
+    """Рамка блока EasyOCR (четыре угла) в виде (x0, y0, x1, y1)"""
+    xs = [int(round(float(point[0]))) for point in bbox]
+    ys = [int(round(float(point[1]))) for point in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def overlap(a: Optional[Box], b: Optional[Box]) -> float:
+    """Отношение площади пересечения рамок к площади объединения (IoU)"""
+    if a is None or b is None:
+        return 1.0 if a is b else 0.0
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def format_timecode(seconds: float) -> str:
+    """Тайм-код вида 1:05.40"""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:05.2f}"
+
+
+def describe_error(word: str, suggestions: List[str]) -> str:
+    """
+    Описание ошибки с вариантами исправления для отчета
+
+    Returns:
+        Строка вида "слво (возможно: слово, слава)"
+    """
+    if suggestions:
+        return f"{word} (возможно: {', '.join(suggestions)})"
+    return f"{word} (варианты не найдены)"
+
+
+def locate(words: List[str], results: list) -> List[Optional[Box]]:
+    """
+    Рамки блоков OCR, в которых находятся слова
+
+    Args:
+        words: Слова с ошибками (как их выдал tokenize)
+        results: Результаты OCR кадра (рамка, текст, уверенность)
+
+    Returns:
+        Рамка для каждого слова; None, если слово не найдено ни в одном блоке
+        (например, склеено из переноса между строками)
+    """
+    blocks = [(block_box(bbox), {token.text for token in tokenize(text)}) for bbox, text, _ in results]
+    boxes = []
+    for word in words:
+        boxes.append(next((box for box, block_words in blocks if word in block_words), None))
+    return boxes
+
+
+@dataclass
+class Occurrence:
+    """Ошибка, видимая на месте на последовательных обработанных кадрах"""
+    word: str
+    language: str
+    error: str                    # Слово с вариантами исправления (describe_error)
+    box: Optional[Box]            # Рамка блока OCR на последнем кадре
+    first_frame: int
+    first_timecode: float
+    last_frame: int
+    last_timecode: float
+    frames: int = 1               # Количество кадров с этой ошибкой
+    text: str = ''                # Текст кадра, на котором вхождение началось
+    screenshot: Optional[str] = None  # Имя файла скриншота в папке результатов
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ErrorAggregator:
+    """Группировка ошибок кадров во вхождения
+
+    Кадры передаются в add() по порядку, в том числе кадры без ошибок:
+    вхождение, слово которого не найдено на очередном кадре, завершается.
+    """
+
+    def __init__(self, region_overlap: float = DEFAULT_REGION_OVERLAP):
+        self.region_overlap = region_overlap
+        self.occurrences: List[Occurrence] = []  # Все вхождения в порядке появления
+        self.frames_with_errors = 0
+        self._active: List[Occurrence] = []  # Вхождения, найденные на предыдущем кадре
+
+    def add(self, frame_num: int, timecode: float, findings: list, text: str = '') -> List[Occurrence]:
+        """
+        Добавляет ошибки очередного кадра
+
+        Args:
+            frame_num: Номер кадра
+            timecode: Тайм-код кадра в секундах
+            findings: Ошибки кадра - кортежи (слово, язык, описание, рамка)
+            text: Текст кадра
+
+        Returns:
+            Вхождения, начавшиеся на этом кадре (для них нужен скриншот)
+        """
+        if findings:
+            self.frames_with_errors += 1
+
+        continued, started = [], []
+        for word, language, error, box in findings:
+            box = tuple(box) if box is not None else None
+            occurrence = next((occurrence for occurrence in self._active
+                               if occurrence.word == word and occurrence.language == language
+                               and overlap(occurrence.box, box) >= self.region_overlap), None)
+            if occurrence is not None:
+                # Продолжение вхождения с предыдущего кадра
+                self._active.remove(occurrence)
+                occurrence.last_frame, occurrence.last_timecode = frame_num, timecode
+                occurrence.frames += 1
+                occurrence.box = box
+                continued.append(occurrence)
+            elif any(item.word == word and overlap(item.box, box) >= self.region_overlap
+                     for item in continued + started):
+                continue  # Слово повторяется в том же блоке
+            else:
+                occurrence = Occurrence(word, language, error, box, frame_num, timecode,
+                                        frame_num, timecode, text=text)
+                self.occurrences.append(occurrence)
+                started.append(occurrence)
+
+        self._active = continued + started
+        return started
+
+    def __len__(self):
+        return len(self.occurrences)
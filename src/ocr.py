@@ -0,0 +1,171 @@
+"""
+Распознавание текста на кадрах с помощью EasyOCR
+"""
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from src.ocr_profiles import OcrProfile, get_profile
+from src.roi import Region, crop_regions
+from src.stage_timers import OCR_DETECT, OCR_RECOGNIZE
+
+# Количество кадров, распознаваемых одним пакетом (1 - покадрово)
+DEFAULT_OCR_BATCH = 4
+
+
+def map_results(results: list, scale: float, dx: int, dy: int) -> list:
+    """Переводит координаты блоков EasyOCR из системы фрагмента в систему кадра"""
+    if scale == 1.0 and not dx and not dy:
+        return results
+    return [([[int(round(x / scale)) + dx, int(round(y / scale)) + dy] for x, y in bbox],
+             text, confidence)
+            for bbox, text, confidence in results]
+
+
+def _prepare_crops(frame, regions: Optional[List[Region]], profile: OcrProfile) -> list:
+    """Фрагменты кадра для распознавания: список (смещение_x, смещение_y, масштаб, RGB-изображение)"""
+    height, width = frame.shape[:2]
+    scale = profile.scale_for(width, height)
+
+    # EasyOCR работает с изображениями в формате RGB
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    crops = crop_regions(frame_rgb, regions) if regions else [(0, 0, frame_rgb)]
+
+    prepared = []
+    for dx, dy, crop in crops:
+        if scale < 1.0:
+            crop_height, crop_width = crop.shape[:2]
+            size = (max(1, int(crop_width * scale)), max(1, int(crop_height * scale)))
+            crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        prepared.append((dx, dy, scale, crop))
+    return prepared
+
+
+def recognize(reader, frame, regions: Optional[List[Region]] = None,
+              profile: OcrProfile = None) -> list:
+    """
+    Распознает текстовые блоки на кадре или только в заданных областях
+
+    Args:
+        reader: Экземпляр easyocr.Reader
+        frame: Изображение кадра (numpy array, BGR)
+        regions: Области распознавания; None - весь кадр
+        profile: Профиль параметров OCR; None - профиль по умолчанию
+
+    Returns:
+        Список кортежей (координаты_блока, текст, уверенность) в координатах кадра
+    """
+    profile = get_profile(profile)
+
+    results = []
+    for dx, dy, scale, crop in _prepare_crops(frame, regions, profile):
+        # Распознаем текст с детальной информацией о координатах
+        found = reader.readtext(crop, detail=1, **profile.readtext_kwargs())
+        results.extend(map_results(found, scale, dx, dy))
+
+    return results
+
+
+def _measure(timers, name: str):
+    """Замер этапа, если замеры включены"""
+    return timers.measure(name) if timers is not None else nullcontext()
+
+
+def recognize_batch(reader, frames: list, regions: Optional[List[Region]] = None,
+                    profile: OcrProfile = None, timers=None) -> List[list]:
+    """
+    Распознает текст сразу на нескольких кадрах
+
+    Детектор получает фрагменты одинакового размера одним тензором, а все
+    строки текста со всех кадров распознаются общими пакетами (EasyOCR на CPU
+    распознает строки по одной). Строки группируются по ширине после
+    приведения к высоте модели, чтобы дополнение было таким же, как при
+    покадровом распознавании.
+
+    Args:
+        reader: Экземпляр easyocr.Reader
+        frames: Список изображений кадров (numpy array, BGR)
+        regions: Области распознавания; None - весь кадр
+        profile: Профиль параметров OCR; None - профиль по умолчанию
+        timers: Замеры этапов (src.stage_timers.StageTimers) - время обнаружения
+            и распознавания строк пакета; None - не замерять
+
+    Returns:
+        Для каждого кадра (в исходном порядке) - список кортежей
+        (координаты_блока, текст, уверенность) в координатах кадра
+    """
+    profile = get_profile(profile)
+    if len(frames) < 2:
+        return [recognize(reader, frame, regions, profile) for frame in frames]
+
+    try:
+        import easyocr.easyocr as easyocr_module
+        from easyocr.recognition import get_text
+        from easyocr.utils import get_image_list, reformat_input
+    except ImportError:
+        # Внутренний API EasyOCR недоступен - распознаем покадрово
+        return [recognize(reader, frame, regions, profile) for frame in frames]
+
+    model_height = getattr(easyocr_module, 'imgH', 64)
+
+    # Фрагменты всех кадров: (индекс_кадра, смещение_x, смещение_y, масштаб, изображение)
+    items = [(frame_idx, *crop)
+             for frame_idx, frame in enumerate(frames)
+             for crop in _prepare_crops(frame, regions, profile)]
+
+    # Детектор: фрагменты одинакового размера обрабатываются одним пакетом
+    by_shape = defaultdict(list)
+    for item_idx, item in enumerate(items):
+        by_shape[item[4].shape].append(item_idx)
+
+    boxes = [None] * len(items)
+    for item_indices in by_shape.values():
+        batch = np.stack([items[i][4] for i in item_indices])
+        with _measure(timers, OCR_DETECT):
+            horizontal_agg, free_agg = reader.detect(
+                batch, reformat=False,
+                min_size=profile.min_size, text_threshold=profile.text_threshold,
+                low_text=profile.low_text, canvas_size=profile.canvas_size,
+                mag_ratio=profile.mag_ratio)
+        for i, horizontal_list, free_list in zip(item_indices, horizontal_agg, free_agg):
+            boxes[i] = (horizontal_list, free_list)
+
+    # Строки текста всех фрагментов, сгруппированные по ширине дополнения.
+    # Каждая рамка нарезается отдельно, как в reader.recognize() на CPU,
+    # поэтому ширина дополнения у строки та же, что и при покадровом OCR
+    lines_by_width = defaultdict(list)
+    for item_idx, item in enumerate(items):
+        horizontal_list, free_list = boxes[item_idx]
+        if not horizontal_list and not free_list:
+            continue
+        # Оттенки серого - тем же преобразованием, что в readtext(): иначе
+        # распознаватель получит другие изображения строк, чем при покадровом OCR
+        _, grey = reformat_input(item[4])
+        single_boxes = [([box], []) for box in horizontal_list] + [([], [box]) for box in free_list]
+        for line_idx, (h_list, f_list) in enumerate(single_boxes):
+            image_list, max_width = get_image_list(h_list, f_list, grey, model_height=model_height)
+            for box, line in image_list:
+                lines_by_width[int(max_width)].append((item_idx, line_idx, box, line))
+
+    # Распознаватель: строки нескольких кадров одним пакетом
+    ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+    results_by_item = defaultdict(list)
+    for width, lines in lines_by_width.items():
+        with _measure(timers, OCR_RECOGNIZE):
+            recognized = get_text(reader.character, model_height, width, reader.recognizer,
+                                  reader.converter, [(box, line) for _, _, box, line in lines],
+                                  ignore_char, profile.decoder, profile.beam_width,
+                                  profile.batch_size, workers=0, device=reader.device)
+        for (item_idx, line_idx, _, _), result in zip(lines, recognized):
+            results_by_item[item_idx].append((line_idx, result))
+
+    # Возвращаем результаты кадрам в исходном порядке
+    results = [[] for _ in frames]
+    for item_idx, (frame_idx, dx, dy, scale, _) in enumerate(items):
+        found = [result for _, result in sorted(results_by_item[item_idx], key=lambda pair: pair[0])]
+        results[frame_idx].extend(map_results(found, scale, dx, dy))
+
+    return results
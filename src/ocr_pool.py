@@ -0,0 +1,128 @@
+"""
+Пул процессов OCR: в каждом процессе один заранее загруженный easyocr.Reader
+"""
+import multiprocessing
+import os
+import queue
+import time
+from typing import List
+
+from src import ocr
+from src.ocr_profiles import OcrProfile
+from src.roi import Region
+
+# Максимальное время запуска процессов и загрузки моделей, сек
+DEFAULT_STARTUP_TIMEOUT = 600
+
+# Reader рабочего процесса (создается один раз при запуске процесса)
+_reader = None
+# Ошибка загрузки моделей в рабочем процессе
+_init_error = None
+
+
+def _init_worker(languages: tuple, threads: int, status_queue):
+    """Инициализация рабочего процесса: число потоков torch и загрузка моделей
+
+    Каждый процесс сообщает в status_queue свой PID и результат загрузки:
+    "ready" или описание ошибки. Исключение не выпускается из инициализатора:
+    multiprocessing.Pool перезапускал бы такой процесс бесконечно.
+    """
+    global _reader, _init_error
+    try:
+        import torch
+        import easyocr
+
+        torch.set_num_threads(threads)
+        _reader = easyocr.Reader(list(languages), gpu=False, verbose=False)
+    except Exception as e:
+        _init_error = f"{type(e).__name__}: {e}"
+    status_queue.put((os.getpid(), "ready" if _init_error is None else _init_error))
+
+
+def _recognize(frames: list, regions: List[Region], profile: OcrProfile) -> List[list]:
+    """Задача рабочего процесса: пакетное распознавание кадров"""
+    if _init_error is not None:
+        raise RuntimeError(f"Модели OCR не загружены: {_init_error}")
+    return ocr.recognize_batch(_reader, frames, regions, profile)
+
+
+def default_threads(workers: int) -> int:
+    """Потоков torch на процесс, чтобы процессы вместе занимали все ядра"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+class OcrWorkerPool:
+    """Пул из N процессов, распознающих пакеты кадров
+
+    Процессы запускаются методом spawn (torch и OpenCV не переносят fork
+    с уже созданными потоками) и загружают модели параллельно. Кадры и
+    результаты передаются между процессами через pickle.
+
+    Конструктор дожидается, пока каждый процесс сообщит о загрузке моделей
+    из своего инициализатора: если не все процессы ответили за startup_timeout
+    или модели не загрузились, пул останавливается и возбуждается RuntimeError.
+    """
+
+    def __init__(self, workers: int, languages=('ru', 'en'), threads: int = None,
+                 startup_timeout: float = DEFAULT_STARTUP_TIMEOUT):
+        """
+        Args:
+            workers: Количество процессов
+            languages: Языки easyocr.Reader
+            threads: Потоков torch в каждом процессе (по умолчанию ядра / workers)
+            startup_timeout: Максимальное время запуска процессов и загрузки моделей, сек
+        """
+        self.workers = workers
+        self.threads = threads or default_threads(workers)
+        context = multiprocessing.get_context('spawn')
+        self._status = context.Queue()
+        self._pool = context.Pool(workers, initializer=_init_worker,
+                                  initargs=(tuple(languages), self.threads, self._status))
+        try:
+            self._wait_ready(startup_timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    def _wait_ready(self, timeout: float):
+        """Ждет сообщения "ready" от каждого из workers процессов (разные PID)"""
+        deadline = time.monotonic() + timeout
+        ready = set()
+        while len(ready) < self.workers:
+            try:
+                pid, status = self._status.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise RuntimeError(f"Процессы OCR не запустились за {timeout:g} с "
+                                   f"(готово {len(ready)} из {self.workers})") from None
+            if status != "ready":
+                raise RuntimeError(f"Не удалось загрузить модели OCR в процессе пула: {status}")
+            ready.add(pid)
+
+    def submit(self, frames: list, regions: List[Region] = None, profile: OcrProfile = None):
+        """
+        Отправляет пакет кадров на распознавание
+
+        Returns:
+            multiprocessing.pool.AsyncResult; get() возвращает результаты OCR
+            для каждого кадра в исходном порядке
+        """
+        return self._pool.apply_async(_recognize, (frames, regions, profile))
+
+    def recognize_batch(self, frames: list, regions: List[Region] = None,
+                        profile: OcrProfile = None) -> List[list]:
+        """Синхронное распознавание пакета кадров в одном из процессов"""
+        return self.submit(frames, regions, profile).get()
+
+    def close(self):
+        """Останавливает процессы пула"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._status.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,90 @@
+"""
+Профили скорости/точности распознавания EasyOCR
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class OcrProfile:
+    """Набор параметров EasyOCR для распознавания кадра"""
+    name: str
+    title: str              # Название для интерфейса
+    canvas_size: int        # Максимальная сторона изображения для детектора текста
+    mag_ratio: float        # Увеличение изображения перед детектором
+    decoder: str            # Декодер распознавателя: greedy или beamsearch
+    beam_width: int         # Ширина луча для beamsearch
+    batch_size: int         # Размер пакета строк для распознавателя
+    text_threshold: float   # Порог уверенности детектора в наличии текста
+    low_text: float         # Нижняя граница текста для детектора
+    min_size: int           # Минимальный размер блока текста в пикселях
+    downscale: float = 1.0  # Масштаб входного кадра
+    max_side: int = 0       # Ограничение длинной стороны кадра после масштабирования (0 - нет)
+
+    def readtext_kwargs(self) -> dict:
+        """Параметры для reader.readtext()"""
+        return {
+            'canvas_size': self.canvas_size,
+            'mag_ratio': self.mag_ratio,
+            'decoder': self.decoder,
+            'beamWidth': self.beam_width,
+            'batch_size': self.batch_size,
+            'text_threshold': self.text_threshold,
+            'low_text': self.low_text,
+            'min_size': self.min_size,
+        }
+
+    def scale_for(self, width: int, height: int) -> float:
+        """Коэффициент масштабирования кадра заданного размера"""
+        scale = self.downscale
+        longest = max(width, height) * scale
+        if self.max_side and longest > self.max_side:
+            scale = self.max_side / max(width, height)
+        return min(scale, 1.0)
+
+
+OCR_PROFILES = {
+    # Детектор на уменьшенном холсте, кадры 4K уменьшаются до 1920 по длинной
+    # стороне: субтитры высотой 40 px на 4K остаются высотой около 20 px
+    'fast': OcrProfile(
+        name='fast', title='Быстрый',
+        canvas_size=1280, mag_ratio=1.0, decoder='greedy', beam_width=5, batch_size=16,
+        text_threshold=0.75, low_text=0.45, min_size=24, max_side=1920,
+    ),
+    # Параметры EasyOCR по умолчанию, кадр не уменьшается. batch_size
+    # используется только пакетным распознаванием (ocr.recognize_batch):
+    # readtext() на CPU распознает строки по одной при любом значении
+    'balanced': OcrProfile(
+        name='balanced', title='Сбалансированный',
+        canvas_size=2560, mag_ratio=1.0, decoder='greedy', beam_width=5, batch_size=8,
+        text_threshold=0.7, low_text=0.4, min_size=20,
+    ),
+    # Увеличение перед детектором, более низкие пороги и поиск по лучу
+    'accurate': OcrProfile(
+        name='accurate', title='Точный',
+        canvas_size=3200, mag_ratio=1.5, decoder='beamsearch', beam_width=5, batch_size=8,
+        text_threshold=0.6, low_text=0.35, min_size=10,
+    ),
+}
+
+DEFAULT_PROFILE = 'balanced'
+
+
+def get_profile(name: str = None) -> OcrProfile:
+    """
+    Возвращает профиль OCR по имени
+
+    Args:
+        name: Имя профиля (fast, balanced, accurate); None - профиль по умолчанию
+
+    Returns:
+        Профиль OCR
+    """
+    if name is None:
+        name = DEFAULT_PROFILE
+    if isinstance(name, OcrProfile):
+        return name
+    try:
+        return OCR_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный профиль OCR: {name}. "
+                         f"Доступные профили: {', '.join(OCR_PROFILES)}") from None
@@ -0,0 +1,211 @@
+"""
+Конвейер обработки: стадии в отдельных потоках, связанные ограниченными очередями
+"""
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List
+
+# Размер очереди между стадиями (в элементах; элемент обычно содержит кадр)
+DEFAULT_QUEUE_SIZE = 4
+
+# Интервал проверки флага остановки при ожидании очереди, сек
+_POLL_INTERVAL = 0.1
+
+_END = object()
+
+
+class _Failure:
+    """Исключение стадии, передаваемое вниз по конвейеру"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Stopped(Exception):
+    """Конвейер остановлен потребителем"""
+
+
+@dataclass
+class StageStats:
+    """Статистика стадии конвейера"""
+    name: str
+    items: int = 0             # Выдано элементов
+    wait_input: float = 0.0    # Ожидание входных данных, сек
+    wait_output: float = 0.0   # Ожидание места в выходной очереди, сек
+    active: float = 0.0        # От запуска до завершения стадии, сек
+    elapsed: float = 0.0       # Время работы всего конвейера, сек
+
+    @property
+    def busy(self) -> float:
+        """Время собственной работы стадии, сек"""
+        return max(self.active - self.wait_input - self.wait_output, 0.0)
+
+    @property
+    def utilization(self) -> float:
+        """Доля времени работы конвейера, которую стадия работала, а не ждала соседей"""
+        return min(self.busy / self.elapsed, 1.0) if self.elapsed else 0.0
+
+    def __str__(self):
+        return f"{self.name} {self.utilization:.0%}"
+
+
+class Pipeline:
+    """Конвейер из источника и стадий-преобразователей
+
+    Источник и каждая стадия выполняются в своем потоке. Стадия - функция,
+    принимающая итератор входных элементов и возвращающая итератор выходных
+    (обычно генератор), поэтому стадии могут хранить состояние между
+    элементами и выдавать элементы с задержкой. Очереди между стадиями
+    ограничены: быстрая стадия ждет медленную, а не накапливает кадры в
+    памяти. Последнюю стадию (например, запись результатов) выполняет
+    вызывающий код, перебирая run().
+
+    Исключение в любой стадии передается вниз и возбуждается в run().
+    При выходе из run() раньше времени конвейер останавливается.
+
+    Если задан profiler (stage_timers.LoopProfiler), под ним выполняются
+    потоки стадий и цикл вызывающего кода.
+    """
+
+    def __init__(self, source: Iterable, name: str, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Args:
+            source: Источник элементов (например, FrameSource)
+            name: Название стадии-источника для статистики
+            queue_size: Размер очередей между стадиями
+        """
+        self.queue_size = queue_size
+        self.stats: List[StageStats] = []
+        self.profiler = None
+        self._stages = [(name, lambda _: iter(source))]
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add_stage(self, name: str, transform: Callable[[Iterator], Iterator]) -> 'Pipeline':
+        """Добавляет стадию в отдельном потоке; возвращает сам конвейер"""
+        self._stages.append((name, transform))
+        return self
+
+    def run(self, name: str) -> Iterator:
+        """
+        Запускает конвейер и выдает результаты последней стадии
+
+        Args:
+            name: Название стадии, которую выполняет вызывающий код
+
+        Yields:
+            Элементы на выходе последней стадии в порядке их выдачи
+        """
+        upstream = None
+        for stage_name, transform in self._stages:
+            stats = StageStats(stage_name)
+            self.stats.append(stats)
+            output = queue.Queue(self.queue_size)
+            thread = threading.Thread(target=self._run_profiled, name=f"pipeline-{stage_name}",
+                                      args=(transform, upstream, output, stats), daemon=True)
+            self._threads.append(thread)
+            upstream = output
+
+        stats = StageStats(name)
+        self.stats.append(stats)
+        for thread in self._threads:
+            thread.start()
+
+        started = time.perf_counter()
+        try:
+            with self._profile():
+                for item in self._receive(upstream, stats):
+                    yield item
+                    stats.items += 1
+        finally:
+            stats.active = time.perf_counter() - started
+            self.close()
+            for stage_stats in self.stats:
+                stage_stats.elapsed = stats.active
+
+    def close(self):
+        """Останавливает стадии и дожидается завершения потоков"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def summary(self) -> str:
+        """Загрузка стадий одной строкой, например "OCR 97%, запись 4%" """
+        return ", ".join(str(stats) for stats in self.stats)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _profile(self):
+        return self.profiler.thread() if self.profiler is not None else nullcontext()
+
+    def _run_profiled(self, *args):
+        with self._profile():
+            self._run_stage(*args)
+
+    def _run_stage(self, transform, upstream, output, stats: StageStats):
+        """Тело потока стадии"""
+        started = time.perf_counter()
+        items = None
+        try:
+            inputs = self._receive(upstream, stats) if upstream is not None else None
+            items = transform(inputs)
+            for item in items:
+                self._send(output, item, stats)
+                stats.items += 1
+            self._send(output, _END, stats)
+        except _Stopped:
+            pass
+        except BaseException as error:
+            try:
+                self._send(output, _Failure(error), stats)
+            except _Stopped:
+                pass
+        finally:
+            # Закрываем генератор стадии (освобождает, например, видеофайл)
+            if hasattr(items, 'close'):
+                items.close()
+            stats.active = time.perf_counter() - started
+
+    def _send(self, output: queue.Queue, item, stats: StageStats):
+        """Кладет элемент в очередь, ожидая места; прерывается при остановке"""
+        started = time.perf_counter()
+        try:
+            while True:
+                if self._stop.is_set():
+                    raise _Stopped()
+                try:
+                    output.put(item, timeout=_POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    continue
+        finally:
+            stats.wait_output += time.perf_counter() - started
+
+    def _receive(self, upstream: queue.Queue, stats: StageStats) -> Iterator:
+        """Итератор элементов входной очереди с учетом времени ожидания"""
+        while True:
+            started = time.perf_counter()
+            try:
+                while True:
+                    if self._stop.is_set():
+                        raise _Stopped()
+                    try:
+                        item = upstream.get(timeout=_POLL_INTERVAL)
+                        break
+                    except queue.Empty:
+                        continue
+            finally:
+                stats.wait_input += time.perf_counter() - started
+
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
@@ -0,0 +1,326 @@
+"""
+Машиночитаемые результаты проверки, записываемые по мере обработки кадров
+
+В папке результатов ведется файл results.jsonl или results.sqlite: параметры
+запуска, затем по записи на каждый обработанный кадр (номер, тайм-код, рамки
+и текст блоков OCR, слова, ошибки с вариантами исправления, скриншот) и в
+конце итоги. Запись кадра добавляется сразу после его обработки, поэтому
+результаты можно читать, пока проверка идет, а в памяти они не накапливаются.
+Текстовый отчет report-*.txt строится по этому файлу (write_report).
+
+JSONL - по объекту на строку с полем "type": "run", "frame" или "summary".
+SQLite - таблицы meta (run и summary в JSON), frames и errors:
+
+    SELECT word, COUNT(*) FROM errors GROUP BY word ORDER BY 2 DESC;
+"""
+import itertools
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from src.occurrences import ErrorAggregator, describe_error, format_timecode
+
+# Версия формата результатов; увеличивается при несовместимых изменениях
+RESULTS_FORMAT = 1
+
+# Формат -> имя файла в папке результатов
+RESULT_FORMATS = {'jsonl': 'results.jsonl', 'sqlite': 'results.sqlite'}
+DEFAULT_RESULT_FORMAT = 'jsonl'
+
+
+def results_path(output_dir, result_format: str = DEFAULT_RESULT_FORMAT) -> Path:
+    """Путь к файлу результатов в папке результатов"""
+    return Path(output_dir) / RESULT_FORMATS[result_format]
+
+
+def frame_record(frame_num: int, timecode: float, reused: bool, results: list, tokens: List[str],
+                 errors: List[dict], screenshot: Optional[str] = None) -> dict:
+    """
+    Запись обработанного кадра
+
+    Args:
+        frame_num: Номер кадра
+        timecode: Тайм-код кадра в секундах
+        reused: Кадр не изменился, использован предыдущий результат OCR
+        results: Результаты OCR кадра (рамка, текст, уверенность)
+        tokens: Слова текста кадра
+        errors: Ошибки - словари word, language, suggestions, box
+        screenshot: Имя файла скриншота кадра
+    """
+    return {
+        'frame': frame_num,
+        'timecode': timecode,
+        'reused': reused,
+        'boxes': [{'box': [[int(round(float(x))), int(round(float(y)))] for x, y in bbox],
+                   'text': text, 'confidence': round(float(confidence), 3)}
+                  for bbox, text, confidence in results],
+        'tokens': tokens,
+        'errors': [{**error, 'box': list(error['box']) if error['box'] is not None else None}
+                   for error in errors],
+        'screenshot': screenshot,
+    }
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class JsonlResultStore:
+    """Результаты в JSON Lines; строки сбрасываются на диск сразу после записи"""
+
+    def __init__(self, path, resume_after: Optional[int] = None):
+        """
+        Args:
+            path: Путь к файлу результатов
+            resume_after: Последний кадр из журнала прерванного запуска - записи
+                до него включительно сохраняются (None - начать заново)
+        """
+        self.path = Path(path)
+        self.resume_after = resume_after
+        self._file = None
+
+    def start(self, run: dict):
+        """Записывает параметры запуска и открывает файл для записей кадров"""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(_dumps({'type': 'run', 'format': RESULTS_FORMAT, **run}) + '\n')
+            if self.resume_after is not None:
+                # Кадры прерванного запуска, уже учтенные в журнале обработки
+                for kind, record in read_results(self.path):
+                    if kind == 'frame' and record['frame'] <= self.resume_after:
+                        f.write(_dumps({'type': 'frame', **record}) + '\n')
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def add_frame(self, record: dict):
+        self._write({'type': 'frame', **record})
+
+    def finish(self, summary: dict):
+        """Записывает итоги: файл результатов полный"""
+        self._write({'type': 'summary', **summary})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: dict):
+        self._file.write(_dumps(entry) + '\n')
+        self._file.flush()
+
+
+class SqliteResultStore:
+    """Результаты в базе SQLite; каждый кадр - отдельная транзакция"""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS frames (
+            frame INTEGER PRIMARY KEY, timecode REAL NOT NULL, reused INTEGER NOT NULL,
+            boxes TEXT NOT NULL, tokens TEXT NOT NULL, screenshot TEXT);
+        CREATE TABLE IF NOT EXISTS errors (
+            frame INTEGER NOT NULL REFERENCES frames(frame), word TEXT NOT NULL,
+            language TEXT NOT NULL, suggestions TEXT NOT NULL, box TEXT);
+        CREATE INDEX IF NOT EXISTS errors_frame ON errors(frame);
+        CREATE INDEX IF NOT EXISTS errors_word ON errors(word);
+    """
+
+    def __init__(self, path, resume_after: Optional[int] = None):
+        """
+        Args:
+            path: Путь к базе результатов
+            resume_after: Последний кадр из журнала прерванного запуска - записи
+                до него включительно сохраняются (None - начать заново)
+        """
+        self.path = Path(path)
+        self.resume_after = resume_after
+        self._db = None
+
+    def start(self, run: dict):
+        """Записывает параметры запуска и готовит базу для записей кадров"""
+        if self.resume_after is None:
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(f"{self.path}{suffix}")
+                except OSError:
+                    pass
+        self._db = sqlite3.connect(self.path)
+        # WAL: результаты можно читать из другого процесса во время записи
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(self._SCHEMA)
+            if self.resume_after is not None:
+                self._db.execute("DELETE FROM errors WHERE frame > ?", (self.resume_after,))
+                self._db.execute("DELETE FROM frames WHERE frame > ?", (self.resume_after,))
+            self._db.execute("DELETE FROM meta")
+            self._db.execute("INSERT INTO meta VALUES ('run', ?)",
+                             (_dumps({'format': RESULTS_FORMAT, **run}),))
+
+    def add_frame(self, record: dict):
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO frames VALUES (?, ?, ?, ?, ?, ?)",
+                             (record['frame'], record['timecode'], int(record['reused']),
+                              _dumps(record['boxes']), _dumps(record['tokens']), record['screenshot']))
+            self._db.executemany("INSERT INTO errors VALUES (?, ?, ?, ?, ?)", [
+                (record['frame'], error['word'], error['language'], _dumps(error['suggestions']),
+                 _dumps(error['box']) if error['box'] is not None else None)
+                for error in record['errors']])
+
+    def finish(self, summary: dict):
+        """Записывает итоги: база результатов полная"""
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('summary', ?)", (_dumps(summary),))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def open_result_store(output_dir, result_format: str = DEFAULT_RESULT_FORMAT,
+                      resume_after: Optional[int] = None):
+    """Хранилище результатов заданного формата в папке результатов"""
+    store_class = SqliteResultStore if result_format == 'sqlite' else JsonlResultStore
+    return store_class(results_path(output_dir, result_format), resume_after)
+
+
+def read_results(path) -> Iterator[Tuple[str, dict]]:
+    """
+    Читает файл результатов (в том числе незавершенный)
+
+    Yields:
+        Пары (вид, запись): ('run', параметры запуска), ('frame', запись кадра)
+        в порядке обработки, ('summary', итоги) - если запуск завершен
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    if path.suffix == '.sqlite':
+        yield from _read_sqlite(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # Строка, оборванная при сбое
+            yield entry.pop('type'), entry
+
+
+def _read_sqlite(path: Path) -> Iterator[Tuple[str, dict]]:
+    db = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        meta = {name: json.loads(value) for name, value in db.execute("SELECT name, value FROM meta")}
+        if 'run' in meta:
+            yield 'run', meta['run']
+        errors = itertools.groupby(
+            db.execute("SELECT frame, word, language, suggestions, box FROM errors ORDER BY frame, rowid"),
+            key=lambda row: row[0])
+        pending = next(errors, None)
+        for frame, timecode, reused, boxes, tokens, screenshot in db.execute(
+                "SELECT frame, timecode, reused, boxes, tokens, screenshot FROM frames ORDER BY frame"):
+            frame_errors = []
+            if pending is not None and pending[0] == frame:
+                frame_errors = [{'word': word, 'language': language, 'suggestions': json.loads(suggestions),
+                                 'box': json.loads(box) if box is not None else None}
+                                for _, word, language, suggestions, box in pending[1]]
+                pending = next(errors, None)
+            yield 'frame', {'frame': frame, 'timecode': timecode, 'reused': bool(reused),
+                            'boxes': json.loads(boxes), 'tokens': json.loads(tokens),
+                            'errors': frame_errors, 'screenshot': screenshot}
+        if 'summary' in meta:
+            yield 'summary', meta['summary']
+    finally:
+        db.close()
+
+
+def write_report(path, report_path) -> ErrorAggregator:
+    """
+    Итоговый текстовый отчет по файлу результатов
+
+    Ошибки кадров заново объединяются во вхождения (src.occurrences), поэтому
+    отчет можно построить и по незавершенному или скопированному файлу.
+
+    Args:
+        path: Файл результатов (results.jsonl или results.sqlite)
+        report_path: Путь к отчету
+
+    Returns:
+        Вхождения ошибок из файла результатов
+    """
+    run, summary = {}, None
+    aggregator = ErrorAggregator()
+    processed_frames = 0
+    for kind, record in read_results(path):
+        if kind == 'run':
+            run = record
+        elif kind == 'summary':
+            summary = record
+        else:
+            processed_frames += 1
+            findings = [(error['word'], error['language'], describe_error(error['word'], error['suggestions']),
+                         error['box']) for error in record['errors']]
+            text = ' '.join(box['text'] for box in record['boxes']) if findings else ''
+            for occurrence in aggregator.add(record['frame'], record['timecode'], findings, text):
+                occurrence.screenshot = record['screenshot']
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("=" * 60 + "\n")
+        f.write("ИТОГОВЫЙ ОТЧЁТ ПРОВЕРКИ ОРФОГРАФИИ\n")
+        f.write("=" * 60 + "\n\n")
+        f.write(f"Дата и время: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Видео файл: {run.get('video_path')}\n")
+        f.write(f"Интервал кадров: {run.get('interval')} сек\n")
+        f.write(f"Профиль OCR: {run.get('profile_title')} ({run.get('profile')})\n")
+        f.write(f"Временной диапазон: {run.get('start_time', 0.0):.2f}s - {run.get('end_time', 0.0):.2f}s\n")
+        if run.get('resumed_frames'):
+            f.write(f"Продолжение прерванной обработки: кадров из журнала {run['resumed_frames']}\n")
+        if run.get('transcript'):
+            f.write(f"Проверка по сохраненной расшифровке (без OCR): {run['transcript']}\n")
+        if summary is None:
+            f.write("Обработка не завершена: отчет по обработанным кадрам\n")
+        f.write("\n")
+
+        f.write("=" * 60 + "\n")
+        f.write("СТАТИСТИКА\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Всего обработано кадров: {processed_frames}\n")
+        for label, value in (summary or {}).get('stats', []):
+            f.write(f"{label}: {value}\n")
+        f.write(f"Кадров с ошибками: {aggregator.frames_with_errors}\n")
+        f.write(f"Всего найдено ошибок: {len(aggregator)}\n\n")
+
+        timers = (summary or {}).get('timers')
+        if timers:
+            f.write("=" * 60 + "\n")
+            f.write("ВРЕМЯ ПО ЭТАПАМ\n")
+            f.write("=" * 60 + "\n")
+            f.write(f"{'Этап':<28} {'раз':>7} {'всего, с':>9} {'p50, мс':>8} {'p95, мс':>8} {'макс, мс':>9}\n")
+            for name, timer in timers.items():
+                f.write(f"{name:<28} {timer['count']:>7} {timer['total']:>9.2f} {timer['p50'] * 1000:>8.1f} "
+                        f"{timer['p95'] * 1000:>8.1f} {timer['max'] * 1000:>9.1f}\n")
+            f.write("\n")
+
+        if aggregator.occurrences:
+            f.write("=" * 60 + "\n")
+            f.write("ДЕТАЛЬНАЯ ИНФОРМАЦИЯ ПО ОШИБКАМ\n")
+            f.write("=" * 60 + "\n\n")
+
+            for idx, occurrence in enumerate(aggregator.occurrences, 1):
+                f.write(f"{idx}. {occurrence.error}\n")
+                f.write(f"   Время: {format_timecode(occurrence.first_timecode)} - "
+                        f"{format_timecode(occurrence.last_timecode)} "
+                        f"(кадры #{occurrence.first_frame} - #{occurrence.last_frame}, "
+                        f"на {occurrence.frames} кадрах)\n")
+                f.write(f"   Скриншот: {occurrence.screenshot or 'не сохранен'}\n")
+                f.write(f"   Распознанный текст: {occurrence.text}\n\n")
+
+        f.write("=" * 60 + "\n")
+        f.write(f"Результаты сохранены в: {run.get('output_dir')}\n")
+        f.write(f"Машиночитаемые результаты: {Path(path).name}\n")
+        f.write("=" * 60 + "\n")
+
+    return aggregator
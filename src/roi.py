@@ -0,0 +1,162 @@
+"""
+Области распознавания текста (ROI)
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class Region(NamedTuple):
+    """Прямоугольная область кадра
+
+    Координаты задаются в пикселях или, если все значения не больше 1,
+    в долях ширины и высоты кадра (например, 0,0.75,1,0.25 - нижняя четверть).
+    """
+    x: float
+    y: float
+    w: float
+    h: float
+
+    @property
+    def relative(self) -> bool:
+        return all(0 <= value <= 1 for value in self)
+
+    def bounds(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        """Границы области в пикселях (x0, y0, x1, y1), обрезанные по размеру кадра"""
+        x, y, w, h = self
+        if self.relative:
+            x, w = x * width, w * width
+            y, h = y * height, h * height
+
+        x0 = min(max(int(round(x)), 0), width)
+        y0 = min(max(int(round(y)), 0), height)
+        x1 = min(max(int(round(x + w)), 0), width)
+        y1 = min(max(int(round(y + h)), 0), height)
+        return x0, y0, x1, y1
+
+    def __str__(self):
+        return ','.join(f"{value:g}" for value in self)
+
+
+def parse_region(spec: str) -> Region:
+    """
+    Разбирает область из строки вида "x,y,w,h"
+
+    Args:
+        spec: Строка с координатами (пиксели или доли кадра)
+
+    Returns:
+        Область кадра
+    """
+    try:
+        values = [float(part) for part in spec.replace(' ', '').split(',')]
+    except ValueError:
+        values = []
+
+    if len(values) != 4 or values[2] <= 0 or values[3] <= 0 or values[0] < 0 or values[1] < 0:
+        raise ValueError(f"Некорректная область '{spec}', ожидается x,y,w,h")
+
+    return Region(*values)
+
+
+def crop_regions(frame, regions: List[Region]):
+    """
+    Вырезает области из кадра
+
+    Args:
+        frame: Изображение кадра
+        regions: Список областей
+
+    Returns:
+        Список кортежей (смещение_x, смещение_y, фрагмент_кадра); пустые области пропускаются
+    """
+    height, width = frame.shape[:2]
+    crops = []
+    for region in regions:
+        x0, y0, x1, y1 = region.bounds(width, height)
+        if x1 > x0 and y1 > y0:
+            crops.append((x0, y0, frame[y0:y1, x0:x1]))
+    return crops
+
+
+class TextZoneLearner:
+    """Определяет зоны текста по результатам OCR первых кадров
+
+    Рамки найденных текстовых блоков накапливаются в карте плотности текста
+    (в уменьшенном масштабе). Когда просмотрено заданное количество кадров и
+    найден хотя бы один блок, связные участки карты (с запасом по краям)
+    превращаются в области распознавания.
+    """
+
+    # Размер ячейки карты плотности в пикселях кадра
+    CELL = 8
+
+    def __init__(self, frames: int, margin: int = 24):
+        """
+        Args:
+            frames: Количество кадров для обучения
+            margin: Запас вокруг найденных зон в пикселях
+        """
+        self.frames = frames
+        self.margin = margin
+        self.frames_seen = 0
+        self.heatmap = None
+        self.frame_size = None
+
+    def observe(self, frame_shape, results: list):
+        """Добавляет рамки текстовых блоков одного кадра"""
+        height, width = frame_shape[:2]
+        if self.heatmap is None:
+            self.frame_size = (width, height)
+            self.heatmap = np.zeros((-(-height // self.CELL), -(-width // self.CELL)), dtype=np.int32)
+
+        for bbox, _, _ in results:
+            xs = [point[0] for point in bbox]
+            ys = [point[1] for point in bbox]
+            x0 = max(int(min(xs)) // self.CELL, 0)
+            y0 = max(int(min(ys)) // self.CELL, 0)
+            x1 = int(max(xs)) // self.CELL + 1
+            y1 = int(max(ys)) // self.CELL + 1
+            self.heatmap[y0:y1, x0:x1] += 1
+
+        self.frames_seen += 1
+
+    @property
+    def ready(self) -> bool:
+        """Обучение завершено: просмотрено достаточно кадров и найден текст"""
+        return (self.frames_seen >= self.frames and self.heatmap is not None
+                and bool(self.heatmap.any()))
+
+    def zones(self) -> List[Region]:
+        """Области кадра, в которых встречался текст (в пикселях)"""
+        if self.heatmap is None:
+            return []
+
+        mask = (self.heatmap > 0).astype(np.uint8)
+        pad = max(1, -(-self.margin // self.CELL))
+        kernel = np.ones((2 * pad + 1, 2 * pad + 1), dtype=np.uint8)
+        mask = cv2.dilate(mask, kernel)
+
+        width, height = self.frame_size
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        regions = []
+        for label in range(1, count):
+            x, y, w, h = stats[label][:4]
+            x0, y0 = x * self.CELL, y * self.CELL
+            x1 = min((x + w) * self.CELL, width)
+            y1 = min((y + h) * self.CELL, height)
+            regions.append(Region(int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+
+        return sorted(regions, key=lambda region: (region.y, region.x))
+
+
+def coverage(regions: Optional[List[Region]], width: int, height: int) -> float:
+    """Доля площади кадра, занятая областями (пересечения не учитываются)"""
+    if not regions:
+        return 1.0
+    area = 0
+    for region in regions:
+        x0, y0, x1, y1 = region.bounds(width, height)
+        area += max(x1 - x0, 0) * max(y1 - y0, 0)
+    return min(area / float(width * height), 1.0)
@@ -0,0 +1,164 @@
+"""
+Фоновая запись скриншотов кадров с ошибками
+
+Кодирование кадра 1080p в PNG без потерь занимает около 0.1 с, в 4K - в
+несколько раз дольше. ScreenshotWriter кодирует и записывает скриншоты в нескольких
+потоках (cv2.imencode освобождает GIL), а цикл записи результатов только
+ставит кадр в очередь и получает Future, который завершается после записи
+файла (по нему журнал обработки отмечает кадр обработанным). Очередь
+ограничена: если кодирование не успевает за распознаванием, постановка в
+очередь ждет, и кадры не накапливаются в памяти.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+
+from src.stage_timers import SCREENSHOTS, StageTimers
+
+# Формат -> расширение файла
+SCREENSHOT_FORMATS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+
+# Параметр качества OpenCV и допустимый диапазон для каждого формата
+_QUALITY = {
+    'png': (cv2.IMWRITE_PNG_COMPRESSION, 0, 9),   # Степень сжатия (без потерь)
+    'jpeg': (cv2.IMWRITE_JPEG_QUALITY, 1, 100),
+    'webp': (cv2.IMWRITE_WEBP_QUALITY, 1, 100),
+}
+
+# Потоков кодирования и размер очереди кадров по умолчанию
+DEFAULT_WRITER_THREADS = 2
+DEFAULT_WRITER_QUEUE = 8
+
+
+@dataclass(frozen=True)
+class ScreenshotFormat:
+    """Формат скриншотов"""
+    format: str = 'png'
+    quality: Optional[int] = None  # PNG - сжатие 0-9, JPEG и WebP - качество 1-100; None - по умолчанию OpenCV
+    thumbnail_width: int = 0       # Ширина уменьшенной копии (0 - не сохранять)
+
+    def __post_init__(self):
+        if self.format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Неизвестный формат скриншотов: {self.format}")
+        _, low, high = _QUALITY[self.format]
+        if self.quality is not None and not low <= self.quality <= high:
+            raise ValueError(f"Качество {self.format} должно быть от {low} до {high}")
+        if self.thumbnail_width < 0:
+            raise ValueError("Ширина уменьшенной копии не может быть отрицательной")
+
+    @property
+    def extension(self) -> str:
+        return SCREENSHOT_FORMATS[self.format]
+
+    def params(self) -> List[int]:
+        """Параметры cv2.imencode()"""
+        if self.quality is None:
+            return []
+        flag, _, _ = _QUALITY[self.format]
+        return [flag, self.quality]
+
+
+class ScreenshotWriter:
+    """Пул потоков, кодирующих и записывающих скриншоты"""
+
+    def __init__(self, output_dir, screenshot_format: ScreenshotFormat = ScreenshotFormat(),
+                 threads: int = DEFAULT_WRITER_THREADS, queue_size: int = DEFAULT_WRITER_QUEUE,
+                 timers: Optional[StageTimers] = None):
+        """
+        Args:
+            output_dir: Папка для скриншотов
+            screenshot_format: Формат, качество и уменьшенные копии
+            threads: Количество потоков кодирования
+            queue_size: Максимум кадров, ожидающих кодирования
+            timers: Замеры этапов, куда добавляется время кодирования каждого скриншота
+        """
+        self.output_dir = Path(output_dir)
+        self.format = screenshot_format
+        self.timers = timers
+        self.written = 0
+        self.encode_time = 0.0  # Суммарное время кодирования и записи, с
+        self.failed: List[str] = []  # Описания ошибок записи
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = [threading.Thread(target=self._run, name=f"screenshots-{number}", daemon=True)
+                         for number in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def filename(self, name: str) -> str:
+        """Имя файла скриншота с расширением формата"""
+        return name + self.format.extension
+
+    def submit(self, frame, name: str) -> Future:
+        """
+        Ставит кадр в очередь записи; ждет, если очередь заполнена
+
+        Args:
+            frame: Изображение кадра (BGR)
+            name: Имя файла без расширения (полное имя - filename(name))
+
+        Returns:
+            Future, завершающийся после записи файла: результат - имя файла,
+            при ошибке записи - исключение
+        """
+        written = Future()
+        self._queue.put((frame, self.filename(name), written))
+        return written
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            frame, filename, written = item
+            started = time.perf_counter()
+            try:
+                self._write(frame, filename)
+                if self.format.thumbnail_width and frame.shape[1] > self.format.thumbnail_width:
+                    height = max(1, round(frame.shape[0] * self.format.thumbnail_width / frame.shape[1]))
+                    thumbnail = cv2.resize(frame, (self.format.thumbnail_width, height),
+                                           interpolation=cv2.INTER_AREA)
+                    self._write(thumbnail, Path(filename).stem + "_thumb" + self.format.extension)
+                with self._lock:
+                    self.written += 1
+                error = None
+            except Exception as e:
+                with self._lock:
+                    self.failed.append(f"{filename}: {e}")
+                error = e
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.encode_time += elapsed
+                if self.timers is not None:
+                    self.timers.add(SCREENSHOTS, elapsed)
+            if error is None:
+                written.set_result(filename)
+            else:
+                written.set_exception(error)
+
+    def _write(self, image, filename: str):
+        # imencode + tofile вместо imwrite - для поддержки кириллицы в пути
+        is_success, buffer = cv2.imencode(self.format.extension, image, self.format.params())
+        if not is_success:
+            raise ValueError("не удалось закодировать изображение")
+        buffer.tofile(str(self.output_dir / filename))
+
+    def close(self):
+        """Дожидается записи всех скриншотов из очереди и останавливает потоки"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __str__(self):
+        return (f"сохранено {self.written} ({self.format.format}), "
+                f"кодирование в фоне {self.encode_time:.1f} с" +
+                (f", ошибок записи: {len(self.failed)}" if self.failed else ""))
@@ -0,0 +1,226 @@
+"""
+Кэши проверки орфографии
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple
+
+# Максимальное количество слов в кэше вердиктов
+DEFAULT_VERDICT_CACHE_SIZE = 50000
+
+# Количество вариантов исправления для слова с ошибкой
+DEFAULT_SUGGESTIONS = 3
+
+# Ограничение времени поиска вариантов исправления для одного слова, сек
+DEFAULT_SUGGEST_TIMEOUT = 1.0
+
+# Максимальное количество слов в кэше вариантов исправления
+DEFAULT_SUGGESTION_CACHE_SIZE = 10000
+
+# Через сколько слов словаря проверяется время при переборе всего словаря (n-граммы)
+_DEADLINE_CHECK_WORDS = 256
+
+_MISSING = object()
+
+
+class LruCache:
+    """Ограниченный кэш с вытеснением давно не использованных записей
+
+    Потокобезопасен; считает попадания и промахи.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Значение по ключу (помечается как недавно использованное) или default"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Сохраняет значение, вытесняя самую старую запись при переполнении"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def reset_stats(self):
+        """Обнуляет счетчики попаданий и промахов (содержимое сохраняется)"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def view(self) -> 'LruCache':
+        """Кэш с теми же записями (и блокировкой), но своими счетчиками"""
+        view = copy.copy(self)
+        view.hits = 0
+        view.misses = 0
+        return view
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __str__(self):
+        return f"попаданий {self.hits}, промахов {self.misses} ({self.hit_rate:.0%})"
+
+
+class Misspelling(NamedTuple):
+    """Слово, не найденное в словаре"""
+    word: str
+    language: str  # 'ru' или 'en'
+
+
+class _DeadlineExceeded(Exception):
+    """Время поиска вариантов исправления истекло"""
+
+
+class _DeadlineLookup:
+    """Проверка слов spylls, прерываемая по истечении времени
+
+    Подбор вариантов в spylls проверяет каждого кандидата (перестановки букв,
+    разбиение на два слова и т.п.) через lookup, поэтому время проверяется
+    перед каждым кандидатом.
+    """
+
+    def __init__(self, lookup, deadline: float):
+        self._lookup = lookup
+        self._deadline = deadline
+
+    def _check(self):
+        if time.perf_counter() > self._deadline:
+            raise _DeadlineExceeded()
+
+    def __call__(self, *args, **kwargs):
+        self._check()
+        return self._lookup(*args, **kwargs)
+
+    def good_forms(self, *args, **kwargs):
+        self._check()
+        return self._lookup.good_forms(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._lookup, name)
+
+
+class _DeadlineWords:
+    """Слова словаря для n-граммного и фонетического поиска, перебор которых
+    прерывается по истечении времени"""
+
+    def __init__(self, words: list, deadline: float):
+        self._words = words
+        self._deadline = deadline
+
+    def __iter__(self) -> Iterator:
+        for idx, word in enumerate(self._words):
+            if idx % _DEADLINE_CHECK_WORDS == 0 and time.perf_counter() > self._deadline:
+                raise _DeadlineExceeded()
+            yield word
+
+    def __len__(self):
+        return len(self._words)
+
+
+def _suggest(dictionary, word: str, deadline: float) -> Iterator[str]:
+    """
+    Варианты исправления из словаря spylls с ограничением времени
+
+    Поиск выполняется копией Suggest словаря, в которой проверка кандидатов
+    и перебор словаря прерываются по истечении времени (_DeadlineExceeded),
+    в том числе когда генератор долго не выдает ни одного варианта.
+    """
+    suggester = getattr(dictionary, 'suggester', None)
+    if suggester is None:
+        # Не словарь spylls: время проверяется только между вариантами
+        for suggestion in dictionary.suggest(word):
+            yield suggestion
+            if time.perf_counter() > deadline:
+                raise _DeadlineExceeded()
+        return
+    suggester = copy.copy(suggester)
+    suggester.lookup = _DeadlineLookup(suggester.lookup, deadline)
+    suggester.words_for_ngram = _DeadlineWords(suggester.words_for_ngram, deadline)
+    yield from suggester(word)
+
+
+class SuggestionCache:
+    """Варианты исправления, вычисляемые не больше одного раза на слово
+
+    Генератор suggest() словаря spylls перебирается только до первых limit
+    вариантов и прерывается, если поиск для слова длится дольше timeout:
+    время проверяется перед проверкой каждого кандидата и при переборе
+    словаря, поэтому ограничение действует, даже если вариантов нет.
+    """
+
+    def __init__(self, limit: int = DEFAULT_SUGGESTIONS, timeout: float = DEFAULT_SUGGEST_TIMEOUT,
+                 maxsize: int = DEFAULT_SUGGESTION_CACHE_SIZE):
+        self.limit = limit
+        self.timeout = timeout
+        self.timed_out = 0  # Слов, для которых поиск прерван по времени
+        self._cache = LruCache(maxsize)
+
+    def get(self, dictionary, misspelling: Misspelling) -> List[str]:
+        """
+        Варианты исправления слова
+
+        Args:
+            dictionary: Словарь spylls для языка слова
+            misspelling: Слово с ошибкой
+
+        Returns:
+            До limit вариантов исправления
+        """
+        suggestions = self._cache.get(misspelling)
+        if suggestions is not None:
+            return suggestions
+
+        suggestions = []
+        generator = _suggest(dictionary, misspelling.word, time.perf_counter() + self.timeout)
+        try:
+            for suggestion in generator:
+                suggestions.append(suggestion)
+                if len(suggestions) >= self.limit:
+                    break
+        except _DeadlineExceeded:
+            self.timed_out += 1
+        finally:
+            generator.close()
+
+        self._cache.put(misspelling, suggestions)
+        return suggestions
+
+    @property
+    def computed(self) -> int:
+        """Количество слов, для которых варианты вычислялись"""
+        return self._cache.misses
+
+    def reset_stats(self):
+        self._cache.reset_stats()
+        self.timed_out = 0
+
+    def view(self) -> 'SuggestionCache':
+        """Кэш с теми же вариантами, но своей статистикой"""
+        view = copy.copy(self)
+        view.timed_out = 0
+        view._cache = self._cache.view()
+        return view
+
+    def __str__(self):
+        return f"вычислено для {self.computed} слов, прервано по времени: {self.timed_out}"
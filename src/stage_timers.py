@@ -0,0 +1,181 @@
+"""
+Замеры времени этапов обработки и профилирование цикла обработки
+
+StageTimers собирает длительности отдельных операций (чтение кадра, пакет OCR,
+обнаружение и распознавание строк, проверка слов, подбор вариантов,
+кодирование скриншота, запись результатов): количество, сумму, медиану, 95-й
+процентиль и максимум. Замер - два вызова perf_counter и добавление в список
+под блокировкой; для процентилей хранится не больше MAX_SAMPLES длительностей
+на этап (случайная выборка, если операций больше).
+
+LoopProfiler - включаемый явно cProfile всех потоков конвейера с
+сохранением общего профиля в файл .prof.
+"""
+import cProfile
+import math
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Этапы в порядке обработки кадра
+DECODE = "чтение кадров"
+CHANGE_DETECTION = "сравнение кадров"
+OCR_BATCH = "OCR: пакет кадров"
+OCR_DETECT = "OCR: обнаружение текста"
+OCR_RECOGNIZE = "OCR: распознавание строк"
+SPELLING = "проверка слов"
+SUGGESTIONS = "варианты исправления"
+SCREENSHOTS = "кодирование скриншотов"
+RESULTS = "запись результатов"
+STAGE_ORDER = (DECODE, CHANGE_DETECTION, OCR_BATCH, OCR_DETECT, OCR_RECOGNIZE,
+               SPELLING, SUGGESTIONS, SCREENSHOTS, RESULTS)
+
+# Длительностей на этап, хранимых для процентилей
+MAX_SAMPLES = 10000
+
+
+def format_duration(seconds: float) -> str:
+    """Длительность вида 1:05 или 1:02:05"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class StageTimer:
+    """Длительности операций одного этапа"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: List[float] = []
+        self._random = random.Random(0)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(seconds)
+        else:
+            # Случайная выборка фиксированного размера из всех операций
+            idx = self._random.randrange(self.count)
+            if idx < MAX_SAMPLES:
+                self._samples[idx] = seconds
+
+    def percentile(self, q: float) -> float:
+        """Процентиль длительности (q от 0 до 100), ближайший ранг"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q * len(ordered) / 100))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def to_dict(self) -> dict:
+        """Количество и длительности в секундах: total, p50, p95, max"""
+        return {'count': self.count, 'total': round(self.total, 4), 'p50': round(self.percentile(50), 5),
+                'p95': round(self.percentile(95), 5), 'max': round(self.max, 5)}
+
+    def __str__(self):
+        return (f"{self.name}: {self.count} раз, всего {self.total:.2f} с, "
+                f"медиана {self.percentile(50) * 1000:.1f} мс, p95 {self.percentile(95) * 1000:.1f} мс, "
+                f"макс. {self.max * 1000:.1f} мс")
+
+
+class StageTimers:
+    """Замеры времени этапов одного запуска; можно вызывать из разных потоков"""
+
+    def __init__(self):
+        self._timers: Dict[str, StageTimer] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        """Добавляет длительность операции этапа"""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = StageTimer(name)
+            timer.add(seconds)
+
+    @contextmanager
+    def measure(self, name: str):
+        """Замер блока with"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def iterate(self, name: str, items: Iterable) -> Iterator:
+        """Выдает элементы items, замеряя получение каждого (например, чтение кадра)"""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.add(name, time.perf_counter() - started)
+            yield item
+
+    def __iter__(self) -> Iterator[StageTimer]:
+        """Этапы в порядке обработки кадра (STAGE_ORDER), затем остальные"""
+        with self._lock:
+            timers = list(self._timers.values())
+        order = {name: idx for idx, name in enumerate(STAGE_ORDER)}
+        return iter(sorted(timers, key=lambda timer: (order.get(timer.name, len(order)), timer.name)))
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {timer.name: timer.to_dict() for timer in self}
+
+
+class LoopProfiler:
+    """cProfile потоков цикла обработки с общим файлом профиля
+
+    Каждый поток, выполняющий thread(), профилируется своим cProfile.Profile;
+    dump() объединяет их. В Python 3.12+ профилировщик один на процесс и
+    охватывает все потоки: если он уже включен, поток не профилируется отдельно.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Файл профиля (.prof; просмотр - python -m pstats или snakeviz)
+        """
+        self.path = Path(path)
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def thread(self):
+        """Профилирование текущего потока в блоке with"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Профилировщик уже включен в другом потоке
+            profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+
+    def dump(self) -> Optional[Path]:
+        """Сохраняет общий профиль; None, если профилей нет"""
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(self.path))
+        return self.path
@@ -0,0 +1,87 @@
+"""
+Разбор распознанного текста на слова для проверки орфографии
+
+Текст просматривается одним скомпилированным выражением по фрагментам между
+пробелами; перенос слова со строки на строку ("информа-\\nционные") склеивается
+в том же проходе. Фрагмент из одного слова (самый частый случай) дальше
+разбирается только строковыми методами: алфавит определяется без регулярных
+выражений, нормализация (нижний регистр, ё -> е) выполняется один раз.
+Слова через дефис ("кто-то", "e-mail") остаются одним словом.
+"""
+import re
+from typing import Callable, List, NamedTuple, Optional
+
+# Алфавиты слова
+CYRILLIC, LATIN, MIXED = 'ru', 'en', 'mixed'
+
+_CYRILLIC_LETTERS = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+
+# Пунктуация вокруг фрагмента, не входящая в него
+TOKEN_PUNCTUATION = '.,;:!?()[]{}«»"\'„“”‘’…'
+
+# Фрагмент между пробелами; перенос (дефис в конце строки) соединяет его со следующим
+_CHUNK = re.compile(r'[^\s-]+(?:-(?:[ \t]*\n[ \t]*)?[^\s-]*)*|-\S*')
+_LINE_BREAK = re.compile(r'-[ \t]*\n[ \t]*')
+
+# Слово из кириллицы и латиницы, возможно, через дефис
+_WORD = re.compile(r'[а-яёА-ЯЁa-zA-Z]+(?:-[а-яёА-ЯЁa-zA-Z]+)*')
+
+class Token(NamedTuple):
+    """Слово текста"""
+    text: str        # Слово, как в тексте (переносы склеены)
+    normalized: str  # Нижний регистр, ё заменена на е
+    script: str      # CYRILLIC, LATIN или MIXED
+
+
+# Token без вызова конструктора NamedTuple на Python (создается для каждого слова)
+_new_token = tuple.__new__
+
+
+def normalize(word: str) -> str:
+    """Нижний регистр и ё -> е: форма слова для сравнения и поиска"""
+    return word.lower().replace('ё', 'е')
+
+
+def script_of(word: str) -> str:
+    """Алфавит слова из букв кириллицы и латиницы (дефисы не учитываются)"""
+    if word.isascii():
+        return LATIN
+    if not word.strip(_CYRILLIC_LETTERS + '-'):
+        return CYRILLIC
+    return MIXED
+
+
+def tokenize(text: str, skip: Optional[Callable[[str], bool]] = None) -> List[Token]:
+    """
+    Слова текста в порядке появления
+
+    Args:
+        text: Текст (строки разделены переносами)
+        skip: Проверка фрагмента или слова; если она возвращает True, фрагмент
+            (со всеми словами внутри) или слово пропускается - например,
+            правила пользовательского словаря (IgnoreRules.filter)
+
+    Returns:
+        Token для каждого слова из кириллицы и/или латиницы
+    """
+    tokens = []
+    for chunk in _CHUNK.findall(text):
+        if '\n' in chunk:
+            chunk = _LINE_BREAK.sub('', chunk)
+        chunk = chunk.strip(TOKEN_PUNCTUATION)
+        if not chunk or (skip is not None and skip(chunk)):
+            continue
+
+        # Фрагмент - одно слово одного алфавита: выражение для слов не нужно
+        if chunk.isalpha():
+            if chunk.isascii():
+                tokens.append(_new_token(Token, (chunk, chunk.lower(), LATIN)))
+                continue
+            if not chunk.strip(_CYRILLIC_LETTERS):
+                tokens.append(_new_token(Token, (chunk, normalize(chunk), CYRILLIC)))
+                continue
+
+        for word in _WORD.findall(chunk):
+            if word == chunk or skip is None or not skip(word):
+                tokens.append(_new_token(Token, (word, normalize(word), script_of(word))))
+    return tokens
@@ -0,0 +1,274 @@
+"""
+Сохраненный результат OCR (расшифровка) для повторной проверки орфографии без OCR
+
+При обычной проверке распознанный текст и рамки блоков каждого выбранного
+кадра сохраняются в папке результатов в файл transcript-<ключ>.jsonl.gz.
+Ключ - хэш содержимого видео и настроек, от которых зависит результат OCR
+(интервал, диапазон времени, выборка кадров, порог изменений, области
+распознавания, профиль OCR). Пользовательский словарь и словари Hunspell в
+ключ не входят: после их изменения проверку можно повторить по расшифровке
+(режим respell) - заново строятся только ошибки, скриншоты и отчет.
+
+Хэш видео сохраняется в video-hashes.json папки результатов (и в памяти
+процесса) вместе с размером и временем изменения файла, поэтому неизменившийся
+файл не читается заново при следующих запусках. При записи расшифровки хэш
+вычисляется в фоновом потоке (transcript_key_async), пока идет обработка, и
+нужен только в TranscriptWriter.complete().
+
+Формат: первая строка - заголовок (ключ и параметры кадров видео), затем по
+строке на кадр: {"f": номер, "t": тайм-код, "r": [[рамка, текст, уверенность], ...]};
+для неизменившихся кадров вместо результатов - "same": 1. Заголовок и строки
+кадров - отдельные участки (members) gzip, которые читаются как один поток.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional, Union
+
+# Версия формата расшифровки; увеличивается при несовместимых изменениях
+TRANSCRIPT_FORMAT = 1
+
+_HASH_CHUNK = 1 << 20
+
+# Файл с хэшами видео в папке результатов
+HASH_CACHE_NAME = 'video-hashes.json'
+
+# (путь, размер, время изменения) -> хэш содержимого, вычисленные в этом процессе
+_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+def content_hash(path, cache_dir=None) -> str:
+    """
+    Хэш содержимого файла (BLAKE2b, 128 бит)
+
+    Хэш файла с теми же путем, размером и временем изменения берется из
+    памяти процесса или из HASH_CACHE_NAME в cache_dir, а не вычисляется заново.
+
+    Args:
+        path: Путь к файлу
+        cache_dir: Папка файла хэшей; None - только кэш в памяти
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    identity = (str(path), stat.st_size, stat.st_mtime_ns)
+    cache_path = Path(cache_dir) / HASH_CACHE_NAME if cache_dir is not None else None
+    saved = _read_hashes(cache_path) if cache_path is not None else {}
+    entry = saved.get(identity[0])
+    entry = entry if isinstance(entry, dict) else {}
+
+    with _hashes_lock:
+        value = _hashes.get(identity)
+    if value is None and (entry.get('size'), entry.get('mtime_ns')) == identity[1:]:
+        value = entry.get('hash')
+    if value is None:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            while chunk := f.read(_HASH_CHUNK):
+                digest.update(chunk)
+        value = digest.hexdigest()
+    with _hashes_lock:
+        _hashes[identity] = value
+
+    if cache_path is not None and entry.get('hash') != value:
+        saved[identity[0]] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': value}
+        _write_hashes(cache_path, saved)
+    return value
+
+
+def _read_hashes(cache_path: Path) -> dict:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return saved if isinstance(saved, dict) else {}
+
+
+def _write_hashes(cache_path: Path, saved: dict):
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Без файла хэшей хэш будет вычислен заново при следующем запуске
+
+
+def transcript_key(video_path, interval, start_time, end_time, sampling, change_threshold,
+                   regions, auto_roi_frames, ocr_profile, cache_dir=None) -> dict:
+    """
+    Видео (по содержимому) и настройки, от которых зависит результат OCR
+
+    Args:
+        cache_dir: Папка файла хэшей видео (см. content_hash)
+    """
+    return {
+        'format': TRANSCRIPT_FORMAT,
+        'video': content_hash(video_path, cache_dir),
+        'interval': interval,
+        'start_time': start_time,
+        'end_time': end_time,
+        'sampling': sampling,
+        'change_threshold': change_threshold,
+        'regions': [str(region) for region in regions] if regions else None,
+        'auto_roi_frames': auto_roi_frames,
+        'ocr_profile': ocr_profile,
+    }
+
+
+def transcript_key_async(*args, **kwargs) -> Future:
+    """
+    transcript_key в фоновом потоке: видео хэшируется, пока идет обработка
+
+    Аргументы - как у transcript_key.
+
+    Returns:
+        Future с ключом расшифровки
+    """
+    future = Future()
+
+    def compute():
+        try:
+            future.set_result(transcript_key(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=compute, name="transcript-key", daemon=True).start()
+    return future
+
+
+def transcript_path(output_dir, key: dict) -> Path:
+    """Путь к расшифровке с заданным ключом в папке результатов"""
+    digest = hashlib.blake2b(json.dumps(key, sort_keys=True).encode('utf-8'), digest_size=8).hexdigest()
+    return Path(output_dir) / f"transcript-{digest}.jsonl.gz"
+
+
+class TranscriptWriter:
+    """Запись расшифровки во временный файл; файл появляется только после complete()
+
+    Строки кадров пишутся по мере обработки, а заголовок с ключом - в
+    complete(), поэтому ключ (хэш видео) может вычисляться параллельно.
+    """
+
+    def __init__(self, output_dir, key: Union[dict, Future], frames):
+        """
+        Args:
+            output_dir: Папка результатов, куда сохраняется расшифровка
+            key: Ключ расшифровки (transcript_key) или Future с ним (transcript_key_async)
+            frames: Источник кадров (FrameSource) - параметры видео для заголовка
+        """
+        self.output_dir = Path(output_dir)
+        self.path: Optional[Path] = None  # Путь к расшифровке после complete()
+        self._key = key
+        self._header = {'fps': frames.fps, 'total_frames': frames.total_frames,
+                        'start_frame': frames.start_frame, 'end_frame': frames.end_frame,
+                        'frame_interval': frames.frame_interval}
+        self._tmp_path = self.output_dir / f"transcript.{os.getpid()}.{id(self)}.tmp"
+        self._file = gzip.open(self._tmp_path, 'wt', encoding='utf-8')
+
+    def add(self, frame_num: int, timecode: float, reused: bool, results: list):
+        """Добавляет результат OCR кадра"""
+        entry = {'f': frame_num, 't': timecode}
+        if reused:
+            entry['same'] = 1
+        else:
+            entry['r'] = [[[[int(round(float(x))), int(round(float(y)))] for x, y in bbox],
+                           text, round(float(confidence), 3)]
+                          for bbox, text, confidence in results]
+        self._write(entry)
+
+    def complete(self) -> Path:
+        """
+        Закрывает файл и делает расшифровку доступной
+
+        Ждет ключ, если он еще вычисляется; ошибка вычисления ключа
+        возбуждается здесь (незавершенная расшифровка удаляется).
+
+        Returns:
+            Путь к расшифровке (transcript_path)
+        """
+        self._file.close()
+        try:
+            key = self._key.result() if isinstance(self._key, Future) else self._key
+            self.path = transcript_path(self.output_dir, key)
+            path_tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(path_tmp, 'wb') as f:
+                f.write(gzip.compress((_dumps({'key': key, **self._header}) + '\n').encode('utf-8')))
+                with open(self._tmp_path, 'rb') as frames:
+                    shutil.copyfileobj(frames, f)
+            os.replace(path_tmp, self.path)
+        finally:
+            self._remove_tmp()
+        return self.path
+
+    def discard(self):
+        """Удаляет незавершенную расшифровку (обработка прервана)"""
+        self._file.close()
+        self._remove_tmp()
+
+    def _remove_tmp(self):
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def _write(self, entry: dict):
+        self._file.write(_dumps(entry) + '\n')
+
+
+def _dumps(entry: dict) -> str:
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+class Transcript:
+    """Расшифровка, читаемая вместо распознавания кадров
+
+    Повторяет атрибуты FrameSource, которые используются при обработке
+    (fps, duration, номера кадров, длина, resume_after), и выдает элементы
+    в формате recognize_frames(): (номер_кадра, тайм-код, None, результаты, повтор) -
+    изображения кадров не хранятся.
+    """
+
+    def __init__(self, header: dict, entries: List[dict]):
+        self.fps = header['fps']
+        self.total_frames = header['total_frames']
+        self.start_frame = header['start_frame']
+        self.end_frame = header['end_frame']
+        self.frame_interval = header['frame_interval']
+        self.duration = self.total_frames / self.fps if self.fps > 0 else 0
+        self._entries = entries
+
+    @classmethod
+    def load(cls, path: Path, key: dict) -> Optional['Transcript']:
+        """Читает расшифровку; None, если ее нет, она повреждена или ключ не совпадает"""
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header.get('key') != key:
+                    return None
+                return cls(header, [json.loads(line) for line in f])
+        except (OSError, ValueError, EOFError, KeyError):
+            return None
+
+    def resume_after(self, frame_num: int):
+        """Пропускает кадры до frame_num включительно (см. FrameSource.resume_after)"""
+        self._entries = [entry for entry in self._entries if entry['f'] > frame_num]
+        if self._entries:
+            self.start_frame = self._entries[0]['f']
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        results = []
+        for entry in self._entries:
+            reused = bool(entry.get('same'))
+            if not reused:
+                results = [(bbox, text, confidence) for bbox, text, confidence in entry['r']]
+            yield entry['f'], entry['t'], None, results, reused
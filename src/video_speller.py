@@ -1,59 +1,150 @@
-import cv2
+import copy
+import time
 import easyocr
 from pathlib import Path
-import re
+from collections import deque
 from typing import List, Tuple
-from spylls.hunspell import Dictionary
+from src.dict_snapshot import load_dictionaries_async
+from src.wordform_index import WordFormIndex
+from src.frame_source import FrameSource, SAMPLING_MODES
+from src.change_detector import FrameChangeDetector, DEFAULT_CHANGE_THRESHOLD, SUGGESTED_CHANGE_THRESHOLD
+from src.roi import Region, TextZoneLearner, coverage, parse_region
+from src.ocr_profiles import OCR_PROFILES, DEFAULT_PROFILE, get_profile
+from src import ocr
+from src.ocr_pool import OcrWorkerPool
+from src.pipeline import Pipeline
+from src.spelling import LruCache, Misspelling, SuggestionCache, DEFAULT_VERDICT_CACHE_SIZE
+from src.ignore_rules import IgnoreRules
+from src.tokenizer import tokenize, CYRILLIC, LATIN
+from src.occurrences import ErrorAggregator, describe_error, format_timecode, locate
+from src.result_store import DEFAULT_RESULT_FORMAT, RESULT_FORMATS, frame_record, open_result_store
+from src.screenshots import ScreenshotFormat, ScreenshotWriter, SCREENSHOT_FORMATS
+from src import stage_timers
+from src.stage_timers import LoopProfiler, StageTimers
+
+
+def _ocr_chunks(frames, detector: FrameChangeDetector, batch_size: int, timers: StageTimers = None):
+    """
+    Группирует кадры в порции для пакетного OCR
+
+    Порция закрывается, когда в ней набралось batch_size кадров, требующих
+    OCR, или (чтобы не задерживать вывод на статичных участках) когда общее
+    число кадров в ней достигло 4 * batch_size.
+
+    Args:
+        timers: Замеры этапов - время сравнения кадров; None - не замерять
+
+    Yields:
+        Списки кортежей (номер_кадра, тайм-код, изображение, изменился)
+    """
+    chunk = []
+    changed_count = 0
+    for frame_num, timecode, frame in frames:
+        # Первый кадр всегда считается изменившимся и становится опорным
+        if detector is None:
+            changed = True
+        elif timers is None:
+            changed = detector.is_changed(frame)
+        else:
+            with timers.measure(stage_timers.CHANGE_DETECTION):
+                changed = detector.is_changed(frame)
+        chunk.append((frame_num, timecode, frame, changed))
+        changed_count += changed
+        if changed_count >= batch_size or len(chunk) >= 4 * batch_size:
+            yield chunk
+            chunk = []
+            changed_count = 0
+    if chunk:
+        yield chunk
 
 
 class VideoSpellChecker:
     def __init__(self, output_dir: str = "screenshots_with_errors",
-                 custom_dict_path: str = "custom_dictionary.txt"):
+                 custom_dict_path: str = "custom_dictionary.txt",
+                 ocr_profile: str = DEFAULT_PROFILE, workers: int = 1):
         """
         Инициализация проверки орфографии в видео
 
         Args:
             output_dir: Директория для сохранения скриншотов с ошибками
             custom_dict_path: Путь к файлу с пользовательским словарем
+            ocr_profile: Профиль скорости/точности OCR (fast, balanced, accurate)
+            workers: Количество процессов OCR (1 - распознавание в текущем процессе)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.ocr_profile = get_profile(ocr_profile)
 
         # Загружаем пользовательский словарь
         self.custom_words = self._load_custom_dictionary(custom_dict_path)
 
+        # Словари Hunspell загружаются в фоне (оба языка параллельно), пока загружаются модели OCR.
+        # Путь к словарям - каталог dictionaries в корне проекта
+        dict_path = Path(__file__).parent.parent / "dictionaries"
+        dictionaries = load_dictionaries_async({'ru': dict_path / "ru_RU", 'en': dict_path / "en_US"})
+
         # Инициализируем EasyOCR для русского и английского
         print("Загрузка моделей OCR (это может занять время при первом запуске)...")
-        self.reader = easyocr.Reader(['ru', 'en'], gpu=False)
-        print("OK EasyOCR загружен")
+        self.reader = None
+        self.ocr_pool = None
+        if workers > 1:
+            self.ocr_pool = OcrWorkerPool(workers)
+            print(f"OK Запущено процессов OCR: {workers} (потоков torch в каждом: {self.ocr_pool.threads})")
+        else:
+            self.reader = easyocr.Reader(['ru', 'en'], gpu=False)
+            print("OK EasyOCR загружен")
 
         # Инициализируем Hunspell словари для проверки орфографии
         print("Загрузка словарей для проверки орфографии...")
+        self.spell_ru = self._wait_dictionary(dictionaries['ru'], "Русский")
+        self.spell_en = self._wait_dictionary(dictionaries['en'], "Английский")
+        print("OK Словари для проверки орфографии загружены")
+        self._init_form_indexes({'ru': dict_path / "ru_RU", 'en': dict_path / "en_US"})
+        self._init_spelling_cache()
+        # Замеры этапов последнего запуска (заново в начале каждой обработки)
+        self.timers = StageTimers()
+
+    def _init_spelling_cache(self):
+        """Кэши проверки орфографии: вердикты словаря и варианты исправления"""
+        # (язык, слово) -> слово написано верно
+        self.verdict_cache = LruCache(DEFAULT_VERDICT_CACHE_SIZE)
+        self.suggestion_cache = SuggestionCache()
+
+    def _init_form_indexes(self, paths):
+        """
+        Открывает индексы словоформ (src.wordform_index), если они построены
 
-        # Путь к словарям (относительно текущего файла для CLI версии)
-        dict_path = Path(__file__).parent / "dictionaries"
+        Args:
+            paths: Язык -> путь к словарю без расширения
+        """
+        self.form_indexes = {language: WordFormIndex.load(path) for language, path in paths.items()}
+        missing = [language for language, index in self.form_indexes.items() if index is None]
+        if missing:
+            print(f"INFO Индекс словоформ не построен или устарел ({', '.join(missing)}), "
+                  f"проверка только через Hunspell. Построить: python -m src.wordform_index")
 
-        try:
-            ru_path = str(dict_path / "ru_RU")
-            self.spell_ru = Dictionary.from_files(ru_path)
-            print("OK Русский словарь загружен")
-        except Exception as e:
-            print(f"WARNING Не удалось загрузить русский словарь: {e}")
-            print(f"   Запустите: python -m src.download_dictionaries")
-            self.spell_ru = None
+    def _wait_dictionary(self, future, display_name: str):
+        """
+        Дожидается фоновой загрузки словаря Hunspell
 
+        Args:
+            future: Future с результатом load_dictionary()
+            display_name: Название словаря для сообщений
+
+        Returns:
+            Словарь или None, если загрузить не удалось
+        """
         try:
-            en_path = str(dict_path / "en_US")
-            self.spell_en = Dictionary.from_files(en_path)
-            print("OK Английский словарь загружен")
+            dictionary, from_snapshot = future.result()
         except Exception as e:
-            print(f"WARNING Не удалось загрузить английский словарь: {e}")
+            print(f"WARNING Не удалось загрузить {display_name.lower()} словарь: {e}")
             print(f"   Запустите: python -m src.download_dictionaries")
-            self.spell_en = None
+            return None
 
-        print("OK Словари для проверки орфографии загружены")
+        print(f"OK {display_name} словарь загружен" + (" (из снимка)" if from_snapshot else ""))
+        return dictionary
 
-    def _load_custom_dictionary(self, dict_path: str) -> set:
+    def _load_custom_dictionary(self, dict_path: str) -> IgnoreRules:
         """
         Загружает пользовательский словарь из файла
 
@@ -61,15 +152,15 @@ class VideoSpellChecker:
             dict_path: Путь к файлу словаря
 
         Returns:
-            Множество слов в нижнем регистре
+            Правила словаря: слова и шаблоны (см. src.ignore_rules)
         """
-        custom_words = set()
+        entries = []
         dict_file = Path(dict_path)
 
         if not dict_file.exists():
             print(f"INFO Пользовательский словарь не найден: {dict_path}")
             print(f"     Создайте файл {dict_path} для добавления своих слов")
-            return custom_words
+            return IgnoreRules()
 
         try:
             with open(dict_file, 'r', encoding='utf-8') as f:
@@ -81,24 +172,76 @@ class VideoSpellChecker:
                     if not line or line.startswith('#'):
                         continue
 
-                    # Добавляем слово в нижнем регистре
-                    custom_words.add(line.lower())
-
-            if custom_words:
-                print(f"OK Загружено {len(custom_words)} слов из пользовательского словаря")
-            else:
-                print(f"INFO Пользовательский словарь пуст")
+                    entries.append(line)
 
         except Exception as e:
             print(f"WARNING Ошибка при чтении пользовательского словаря: {e}")
 
+        custom_words = IgnoreRules(entries)
+        for entry, error in custom_words.invalid:
+            print(f"WARNING Неверное регулярное выражение в пользовательском словаре: {entry} ({error})")
+        if custom_words:
+            print(f"OK Загружено {len(custom_words.words) + len(custom_words.exact_words)} слов "
+                  f"и {custom_words.patterns} шаблонов из пользовательского словаря")
+        else:
+            print(f"INFO Пользовательский словарь пуст")
+
         return custom_words
 
+    def log(self, message: str):
+        """Вывод сообщения в консоль"""
+        print(message)
+
+    def with_output(self, output_dir, log=None) -> 'VideoSpellChecker':
+        """
+        Проверка с теми же моделями OCR, словарями и кэшами, но своей папкой вывода
+
+        Позволяет обрабатывать несколько видео одновременно одной загруженной
+        проверкой (см. src.batch): у каждого видео свои папка результатов, вывод
+        сообщений и статистика кэшей и пользовательского словаря (данные кэшей
+        общие).
+
+        Args:
+            output_dir: Папка для результатов
+            log: Функция вывода сообщений (по умолчанию - как у исходной проверки)
+        """
+        view = copy.copy(self)
+        view.output_dir = Path(output_dir)
+        view.output_dir.mkdir(parents=True, exist_ok=True)
+        # process_video() сбрасывает статистику - у одновременных видео она своя
+        view.verdict_cache = self.verdict_cache.view()
+        view.suggestion_cache = self.suggestion_cache.view()
+        view.custom_words = self.custom_words.view()
+        if log is not None:
+            view.log = log
+        return view
+
+    def iter_frames(self, video_path: str, interval: int = 2,
+                    start_time: float = 0.0, end_time: float = None,
+                    sampling: str = 'auto') -> FrameSource:
+        """
+        Создает ленивый источник кадров видео с заданным интервалом
+
+        Args:
+            video_path: Путь к видеофайлу
+            interval: Интервал в секундах между кадрами
+            start_time: Начальное время в секундах (по умолчанию с начала)
+            end_time: Конечное время в секундах (по умолчанию до конца)
+            sampling: Режим выборки кадров: auto, read, grab или seek
+
+        Returns:
+            Источник кадров, генерирующий кортежи (номер_кадра, тайм-код, изображение)
+        """
+        return FrameSource(video_path, interval, start_time, end_time,
+                           sampling=sampling, log=self.log)
+
     def extract_frames(self, video_path: str, interval: int = 2,
                       start_time: float = 0.0, end_time: float = None) -> List[Tuple[int, any]]:
         """
         Извлекает кадры из видео с заданным интервалом
 
+        Все кадры загружаются в память. Для длинных видео используйте iter_frames().
+
         Args:
             video_path: Путь к видеофайлу
             interval: Интервал в секундах между кадрами
@@ -108,54 +251,185 @@ class VideoSpellChecker:
         Returns:
             Список кортежей (номер_кадра, изображение)
         """
-        cap = cv2.VideoCapture(video_path)
-
-        if not cap.isOpened():
-            raise ValueError(f"Не удалось открыть видео: {video_path}")
+        frames = [(frame_num, frame) for frame_num, _, frame
+                  in self.iter_frames(video_path, interval, start_time, end_time)]
+        print(f"✓ Извлечено {len(frames)} кадров из видео")
+        return frames
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps if fps > 0 else 0
+    def run_ocr(self, frame, regions: List[Region] = None) -> list:
+        """
+        Распознает текстовые блоки на кадре с помощью EasyOCR
 
-        frame_interval = int(fps * interval)
+        Args:
+            frame: Изображение кадра (numpy array, BGR)
+            regions: Области распознавания; None - весь кадр
 
-        # Вычисляем начальный и конечный кадры
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps) if end_time is not None else total_frames
+        Returns:
+            Список кортежей (координаты_блока, текст, уверенность) в координатах кадра
+        """
+        if self.ocr_pool is not None:
+            return self.ocr_pool.recognize_batch([frame], regions, self.ocr_profile)[0]
+        return ocr.recognize(self.reader, frame, regions, self.ocr_profile)
 
-        # Проверяем корректность временных границ
-        if start_frame >= total_frames:
-            print(f"WARNING Начальное время {start_time}s превышает длительность видео {duration:.1f}s")
-            start_frame = 0
+    def run_ocr_batch(self, frames: list, regions: List[Region] = None) -> List[list]:
+        """
+        Распознает текстовые блоки сразу на нескольких кадрах
 
-        if end_frame > total_frames:
-            end_frame = total_frames
+        Args:
+            frames: Список изображений кадров (numpy array, BGR)
+            regions: Области распознавания; None - весь кадр
 
-        if start_frame >= end_frame:
-            raise ValueError(f"Начальное время ({start_time}s) должно быть меньше конечного ({end_time}s)")
+        Returns:
+            Результаты OCR для каждого кадра в исходном порядке
+        """
+        if self.ocr_pool is not None:
+            return self.ocr_pool.recognize_batch(frames, regions, self.ocr_profile)
+        return ocr.recognize_batch(self.reader, frames, regions, self.ocr_profile, self.timers)
 
-        print(f"Анализ видео с {start_time}s до {end_time if end_time else duration:.1f}s")
-        print(f"Кадры: {start_frame} - {end_frame} из {total_frames}")
+    def _start_ocr(self, frames: list, regions: List[Region]):
+        """
+        Запускает распознавание пакета кадров
 
-        # Перемещаемся к начальному кадру
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        Returns:
+            Функция без аргументов, возвращающая результаты OCR для каждого кадра.
+            При работе с пулом процессов распознавание идет в фоне до ее вызова.
+        """
+        if self.ocr_pool is not None and frames:
+            return self.ocr_pool.submit(frames, regions, self.ocr_profile).get
+        if len(frames) > 1:
+            return lambda: self.run_ocr_batch(frames, regions)
+        return lambda: [self.run_ocr(frame, regions) for frame in frames]
+
+    def close(self):
+        """Останавливает процессы OCR (если используется пул)"""
+        if self.ocr_pool is not None:
+            self.ocr_pool.close()
+            self.ocr_pool = None
+
+    def recognize_frames(self, frames, change_threshold: float = DEFAULT_CHANGE_THRESHOLD,
+                         regions: List[Region] = None, auto_roi_frames: int = 0,
+                         ocr_batch: int = ocr.DEFAULT_OCR_BATCH):
+        """
+        Распознает текст на кадрах, пропуская OCR для неизменившихся кадров
 
-        frames = []
-        frame_count = start_frame
+        Кадры, требующие OCR, распознаются порциями по ocr_batch штук; кадры
+        выдаются в исходном порядке после распознавания своей порции. С пулом
+        процессов в работе одновременно до 2 порций на процесс.
 
-        while frame_count < end_frame:
-            ret, frame = cap.read()
-            if not ret:
+        Args:
+            frames: Итерируемый источник кортежей (номер_кадра, тайм-код, изображение)
+            change_threshold: Доля изменившихся пикселей в клетке кадра, при которой кадр
+                распознается заново (0 - распознавать каждый кадр, см. FrameChangeDetector)
+            regions: Области распознавания; None - весь кадр
+            auto_roi_frames: Если области не заданы - количество первых кадров, по которым
+                определяются зоны текста (0 - не определять, распознавать весь кадр)
+            ocr_batch: Количество кадров в одном пакете OCR (1 - покадрово)
+
+        Yields:
+            Кортежи (номер_кадра, тайм-код, изображение, результаты_OCR, повтор),
+            где повтор=True означает, что результаты взяты с предыдущего кадра
+        """
+        detector = FrameChangeDetector(change_threshold) if change_threshold > 0 else None
+        learner = TextZoneLearner(auto_roi_frames) if auto_roi_frames > 0 and not regions else None
+        results = None
+
+        chunks = _ocr_chunks(frames, detector, max(1, ocr_batch), self.timers)
+        window = 2 * self.ocr_pool.workers if self.ocr_pool is not None else 1
+        in_flight = deque()
+
+        while True:
+            # Держим в работе до window порций, чтобы все процессы были заняты
+            while len(in_flight) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                ocr_frames = [frame for _, _, frame, changed in chunk if changed]
+                in_flight.append((chunk, self._start_ocr(ocr_frames, regions)))
+            if not in_flight:
                 break
 
-            if (frame_count - start_frame) % frame_interval == 0:
-                frames.append((frame_count, frame))
+            chunk, get_results = in_flight.popleft()
+            started = time.perf_counter()
+            batch_results = iter(get_results())
+            if any(changed for _, _, _, changed in chunk):
+                # С пулом процессов - ожидание результатов порции
+                self.timers.add(stage_timers.OCR_BATCH, time.perf_counter() - started)
 
-            frame_count += 1
+            for frame_num, timecode, frame, changed in chunk:
+                if not changed:
+                    yield frame_num, timecode, frame, results, True
+                    continue
 
-        cap.release()
-        print(f"✓ Извлечено {len(frames)} кадров из видео")
-        return frames
+                results = next(batch_results)
+
+                # Найденные зоны применяются к порциям, отправленным после их определения
+                if learner is not None:
+                    learner.observe(frame.shape, results)
+                    if learner.ready:
+                        regions = learner.zones()
+                        learner = None
+                        height, width = frame.shape[:2]
+                        self.log(f"ℹ Зоны текста определены ({coverage(regions, width, height):.0%} кадра): "
+                                 + "; ".join(str(region) for region in regions))
+
+                yield frame_num, timecode, frame, results, False
+
+    def spell_frames(self, recognized):
+        """
+        Стадия проверки орфографии: текст и ошибки для каждого распознанного кадра
+
+        Args:
+            recognized: Итератор результатов recognize_frames()
+
+        Yields:
+            Кортежи (номер_кадра, тайм-код, изображение, результаты_OCR, повтор, текст, ошибки),
+            где ошибки - список Misspelling (варианты исправления подбирает format_error);
+            для неизменившихся кадров текст и ошибки берутся с предыдущего кадра
+        """
+        text, errors = "", []
+        for frame_num, timecode, frame, results, reused in recognized:
+            if not reused:
+                text = self.frame_text(results)
+                if text.strip():
+                    with self.timers.measure(stage_timers.SPELLING):
+                        errors = self.find_misspellings(text)
+                else:
+                    errors = []
+            yield frame_num, timecode, frame, results, reused, text, errors
+
+    def frame_text(self, results: list) -> str:
+        """Текст кадра для проверки орфографии"""
+        return self.results_to_text(results)
+
+    def build_pipeline(self, frames, change_threshold: float = DEFAULT_CHANGE_THRESHOLD,
+                       regions: List[Region] = None, auto_roi_frames: int = 0,
+                       ocr_batch: int = ocr.DEFAULT_OCR_BATCH) -> Pipeline:
+        """
+        Конвейер обработки видео: декодирование -> OCR -> проверка орфографии
+
+        Каждая стадия работает в своем потоке; запись результатов выполняет
+        код, перебирающий run() конвейера.
+
+        Returns:
+            Конвейер, выдающий элементы spell_frames()
+        """
+        return (Pipeline(self.timers.iterate(stage_timers.DECODE, frames), "декодирование")
+                .add_stage("OCR", lambda items: self.recognize_frames(
+                    items, change_threshold, regions, auto_roi_frames, ocr_batch))
+                .add_stage("орфография", self.spell_frames))
+
+    def build_respell_pipeline(self, transcript) -> Pipeline:
+        """
+        Конвейер проверки по сохраненной расшифровке: чтение расшифровки -> проверка орфографии
+
+        Args:
+            transcript: Расшифровка (src.transcript.Transcript) - вместо декодирования и OCR
+
+        Returns:
+            Конвейер, выдающий элементы spell_frames() без изображений кадров
+        """
+        return (Pipeline(transcript, "расшифровка")
+                .add_stage("орфография", self.spell_frames))
 
     def extract_text(self, frame) -> str:
         """
@@ -167,12 +441,18 @@ class VideoSpellChecker:
         Returns:
             Распознанный текст
         """
-        # EasyOCR работает с изображениями в формате RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return self.results_to_text(self.run_ocr(frame))
+
+    def results_to_text(self, results: list) -> str:
+        """
+        Собирает текст из результатов OCR, группируя блоки в строки
 
-        # Распознаем текст с детальной информацией о координатах
-        results = self.reader.readtext(frame_rgb, detail=1)
+        Args:
+            results: Результаты EasyOCR (координаты_блока, текст, уверенность)
 
+        Returns:
+            Текст, строки которого разделены переносами
+        """
         if not results:
             return ""
 
@@ -224,145 +504,350 @@ class VideoSpellChecker:
         Returns:
             Список найденных ошибок с вариантами исправления
         """
-        errors = []
+        return [self.format_error(misspelling) for misspelling in self.find_misspellings(text)]
 
-        # Разделяем текст на строки
-        lines = text.split('\n')
-
-        for line in lines:
-            if not line.strip():
-                continue
+    def suggestions(self, misspelling: Misspelling) -> List[str]:
+        """
+        Варианты исправления слова
 
-            # Извлекаем слова из строки (только буквы)
-            words = re.findall(r'[а-яёА-ЯЁa-zA-Z]+', line)
+        Варианты вычисляются при первом обращении к слову и кэшируются;
+        время вычисления попадает в замеры этапов.
 
-            for word in words:
-                # Пропускаем короткие слова и одиночные символы
-                if len(word) < 3:
-                    continue
+        Args:
+            misspelling: Слово с ошибкой
 
-                # Определяем язык слова
-                cyrillic_count = len(re.findall('[а-яёА-ЯЁ]', word))
-                latin_count = len(re.findall('[a-zA-Z]', word))
+        Returns:
+            Список вариантов (может быть пустым)
+        """
+        spell_checker = self.spell_ru if misspelling.language == 'ru' else self.spell_en
+        computed = self.suggestion_cache.computed
+        started = time.perf_counter()
+        suggestions = self.suggestion_cache.get(spell_checker, misspelling)
+        if self.suggestion_cache.computed != computed:
+            self.timers.add(stage_timers.SUGGESTIONS, time.perf_counter() - started)
+        return suggestions
+
+    def format_error(self, misspelling: Misspelling) -> str:
+        """
+        Описание ошибки с вариантами исправления для отчета
 
-                # Пропускаем смешанные слова
-                if cyrillic_count > 0 and latin_count > 0:
-                    continue
+        Args:
+            misspelling: Слово с ошибкой
 
-                # Выбираем соответствующий словарь
-                if cyrillic_count > 0:
-                    spell_checker = self.spell_ru
-                elif latin_count > 0:
-                    spell_checker = self.spell_en
-                else:
-                    continue
+        Returns:
+            Строка вида "слво (возможно: слово, слава)"
+        """
+        return describe_error(misspelling.word, self.suggestions(misspelling))
 
-                # Если словарь не загружен, пропускаем
-                if spell_checker is None:
-                    continue
+    def frame_findings(self, misspellings: List[Misspelling], results: list) -> list:
+        """
+        Ошибки кадра для объединения во вхождения (src.occurrences)
 
-                # Проверяем, есть ли слово в пользовательском словаре
-                word_lower = word.lower()
-                if word_lower in self.custom_words:
-                    continue  # Слово в whitelist, пропускаем
+        Args:
+            misspellings: Слова с ошибками кадра
+            results: Результаты OCR кадра
 
-                # Проверяем слово в основном словаре (регистронезависимо)
-                if not spell_checker.lookup(word) and not spell_checker.lookup(word.lower()):
-                    # Получаем варианты исправления (suggest возвращает генератор)
-                    suggestions = list(spell_checker.suggest(word))[:3]
+        Returns:
+            Кортежи (слово, язык, описание с вариантами исправления, рамка блока OCR)
+        """
+        boxes = locate([misspelling.word for misspelling in misspellings], results)
+        return [(misspelling.word, misspelling.language, self.format_error(misspelling), box)
+                for misspelling, box in zip(misspellings, boxes)]
 
-                    if suggestions:
-                        errors.append(f"{word} (возможно: {', '.join(suggestions)})")
-                    else:
-                        errors.append(f"{word} (варианты не найдены)")
+    def frame_record(self, frame_num: int, timecode: float, reused: bool, results: list, text: str,
+                     misspellings: List[Misspelling], findings: list,
+                     screenshot: str = None) -> dict:
+        """
+        Запись кадра для файла результатов (src.result_store)
 
-        return errors
+        Args:
+            frame_num: Номер кадра
+            timecode: Тайм-код кадра в секундах
+            reused: Использован предыдущий результат OCR
+            results: Результаты OCR кадра
+            text: Текст кадра
+            misspellings: Слова с ошибками кадра
+            findings: Ошибки кадра из frame_findings() (рамки блоков)
+            screenshot: Имя файла скриншота кадра
+        """
+        errors = [{'word': word, 'language': language, 'suggestions': self.suggestions(misspelling), 'box': box}
+                  for misspelling, (word, language, _, box) in zip(misspellings, findings)]
+        tokens = [token.text for token in tokenize(text)] if text else []
+        return frame_record(frame_num, timecode, reused, results, tokens, errors, screenshot)
 
-    def process_video(self, video_path: str, interval: int = 2,
-                     start_time: float = 0.0, end_time: float = None):
+    def find_misspellings(self, text: str) -> List[Misspelling]:
         """
-        Основной метод обработки видео
+        Находит слова, которых нет в словарях (без подбора вариантов исправления)
 
         Args:
-            video_path: Путь к видеофайлу
-            interval: Интервал в секундах между кадрами
-            start_time: Начальное время в секундах (по умолчанию с начала)
-            end_time: Конечное время в секундах (по умолчанию до конца)
-        """
-        print(f"\n{'='*60}")
-        print(f"Обработка видео: {video_path}")
-        print(f"{'='*60}\n")
+            text: Текст для проверки
 
-        # Извлекаем кадры
-        frames = self.extract_frames(video_path, interval, start_time, end_time)
+        Returns:
+            Список слов с ошибками в порядке появления в тексте
+        """
+        errors = []
 
-        total_errors = 0
-        frames_with_errors = 0
+        # Слова текста (переносы склеены); фрагменты и слова, подпадающие под
+        # правила пользовательского словаря, не проверяются
+        for token in tokenize(text, skip=self.custom_words.filter if self.custom_words else None):
+            word = token.text
 
-        # Обрабатываем каждый кадр
-        for frame_num, frame in frames:
-            print(f"\nОбработка кадра {frame_num}...")
+            # Пропускаем короткие слова и одиночные символы
+            if len(word) < 3:
+                continue
 
-            # Извлекаем текст
-            text = self.extract_text(frame)
+            # Выбираем словарь по алфавиту слова; смешанные слова пропускаем
+            if token.script == CYRILLIC:
+                language, spell_checker = 'ru', self.spell_ru
+            elif token.script == LATIN:
+                language, spell_checker = 'en', self.spell_en
+            else:
+                continue
 
-            if not text.strip():
-                print("  ℹ Текст не обнаружен")
+            # Если словарь не загружен, пропускаем
+            if spell_checker is None:
                 continue
 
-            print(f"  ℹ Распознанный текст: {text[:100]}...")
+            # Проверяем слово в основном словаре (регистронезависимо). Ключ кэша -
+            # слово в исходном регистре: от регистра зависит вердикт Hunspell
+            correct = self.verdict_cache.get((language, word))
+            if correct is None:
+                # Сначала индекс словоформ; при промахе - аффиксный анализ spylls
+                normalized = token.normalized
+                form_index = self.form_indexes.get(language)
+                correct = bool(form_index is not None and (word in form_index or normalized in form_index)
+                               or spell_checker.lookup(word)
+                               or normalized != word and spell_checker.lookup(normalized))
+                self.verdict_cache.put((language, word), correct)
+
+            if not correct:
+                errors.append(Misspelling(word, language))
 
-            # Проверяем орфографию
-            errors = self.check_spelling(text)
+        return errors
 
-            if errors:
-                frames_with_errors += 1
-                total_errors += len(errors)
-                print(f"  ✗ Найдено ошибок: {len(errors)}")
+    def process_video(self, video_path: str, interval: int = 2,
+                     start_time: float = 0.0, end_time: float = None,
+                     sampling: str = 'auto',
+                     change_threshold: float = DEFAULT_CHANGE_THRESHOLD,
+                     regions: List[Region] = None, auto_roi_frames: int = 0,
+                     ocr_batch: int = ocr.DEFAULT_OCR_BATCH,
+                     screenshot_format: ScreenshotFormat = ScreenshotFormat('jpeg'),
+                     result_format: str = DEFAULT_RESULT_FORMAT, cprofile: bool = False):
+        """
+        Основной метод обработки видео
 
-                # Сохраняем скриншот с ошибками
-                output_path = self.output_dir / f"frame_{frame_num}_errors.jpg"
-                cv2.imwrite(str(output_path), frame)
+        Args:
+            video_path: Путь к видеофайлу
+            interval: Интервал в секундах между кадрами
+            start_time: Начальное время в секундах (по умолчанию с начала)
+            end_time: Конечное время в секундах (по умолчанию до конца)
+            sampling: Режим выборки кадров: auto, read, grab или seek
+            change_threshold: Порог изменения кадра для повторного OCR (0 - OCR на каждом кадре)
+            regions: Области распознавания; None - весь кадр
+            auto_roi_frames: Количество кадров для автоопределения зон текста (0 - выключено)
+            ocr_batch: Количество кадров в одном пакете OCR (1 - покадрово)
+            screenshot_format: Формат и качество скриншотов, уменьшенные копии
+            result_format: Формат файла результатов по кадрам: jsonl или sqlite
+            cprofile: Профилировать цикл обработки (cProfile) и сохранить профиль
+                в папку результатов
 
-                # Сохраняем список ошибок в текстовый файл
-                error_file = self.output_dir / f"frame_{frame_num}_errors.txt"
-                with open(error_file, 'w', encoding='utf-8') as f:
-                    f.write(f"Кадр: {frame_num}\n")
-                    # Примечание: точное время рассчитывается на основе FPS видео
-                    f.write(f"Время: ~{frame_num / 30:.1f} сек (приблизительно)\n\n")
-                    f.write(f"Полный текст:\n{text}\n\n")
-                    f.write("Найденные ошибки:\n")
-                    for error in errors:
-                        f.write(f"  - {error}\n")
+        Returns:
+            Итоги обработки: количество кадров и ошибок, вхождения ошибок (errors_details),
+            замеры этапов (stage_timers)
+        """
+        self.log(f"\n{'='*60}")
+        self.log(f"Обработка видео: {video_path}")
+        self.log(f"{'='*60}\n")
+
+        # Открываем источник кадров (кадры декодируются по мере обработки)
+        frames = self.iter_frames(video_path, interval, start_time, end_time, sampling)
+        self.log(f"Анализ видео с {start_time}s до {end_time if end_time else frames.duration:.1f}s")
+        self.log(f"Кадры: {frames.start_frame} - {frames.end_frame} из {frames.total_frames}")
+
+        # Ошибки соседних кадров объединяются во вхождения (src.occurrences)
+        aggregator = ErrorAggregator()
+        processed_frames = 0
+        ocr_skipped = 0
+        self.verdict_cache.reset_stats()
+        self.suggestion_cache.reset_stats()
+        self.custom_words.reset_stats()
+        self.timers = StageTimers()
+
+        # Декодирование, OCR и проверка орфографии идут в отдельных потоках,
+        # здесь - запись результатов; скриншоты кодируются в фоне (src.screenshots)
+        pipeline = self.build_pipeline(frames, change_threshold, regions, auto_roi_frames, ocr_batch)
+        if cprofile:
+            profile_name = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof"
+            pipeline.profiler = LoopProfiler(self.output_dir / profile_name)
+        screenshots = ScreenshotWriter(self.output_dir, screenshot_format, timers=self.timers)
+        store = open_result_store(self.output_dir, result_format)
+        store.start({'video_path': str(video_path), 'interval': interval, 'start_time': start_time,
+                     'end_time': end_time if end_time else frames.duration,
+                     'profile': self.ocr_profile.name, 'profile_title': self.ocr_profile.title,
+                     'fps': frames.fps, 'output_dir': str(self.output_dir.absolute())})
+        try:
+            for frame_num, timecode, frame, results, reused, text, misspellings in pipeline.run("запись"):
+                processed_frames += 1
+                self.log(f"\nОбработка кадра {frame_num}...")
+
+                if reused:
+                    # Кадр не изменился - текст и ошибки те же, что на предыдущем кадре
+                    ocr_skipped += 1
+                    self.log("  ℹ Кадр не изменился, используется предыдущий результат OCR")
+
+                if not text.strip():
+                    self.log("  ℹ Текст не обнаружен")
+                    aggregator.add(frame_num, timecode, [])
+                    with self.timers.measure(stage_timers.RESULTS):
+                        store.add_frame(self.frame_record(frame_num, timecode, reused, results, '', [], []))
+                    continue
 
-                print(f"  ✓ Сохранено: {output_path}")
-            else:
-                print("  ✓ Ошибок не найдено")
+                self.log(f"  ℹ Распознанный текст: {text[:100]}...")
 
-        print(f"\n{'='*60}")
-        print(f"ОБРАБОТКА ЗАВЕРШЕНА!")
-        print(f"{'='*60}")
-        print(f"Всего обработано кадров: {len(frames)}")
-        print(f"Кадров с ошибками: {frames_with_errors}")
-        print(f"Всего найдено ошибок: {total_errors}")
-        print(f"Результаты сохранены в: {self.output_dir.absolute()}")
-        print(f"{'='*60}\n")
+                # Варианты исправления подбираются здесь, один раз на слово
+                findings = self.frame_findings(misspellings, results)
+                started = aggregator.add(frame_num, timecode, findings, text)
+                if findings:
+                    self.log(f"  ✗ Найдено ошибок: {len(findings)}, новых: {len(started)}")
+                else:
+                    self.log("  ✓ Ошибок не найдено")
+
+                screenshot = None
+                if started:
+                    # Скриншот - один на кадр, где начались новые вхождения ошибок
+                    screenshots.submit(frame, f"frame_{frame_num}_errors")
+                    screenshot = screenshots.filename(f"frame_{frame_num}_errors")
+                    for occurrence in started:
+                        occurrence.screenshot = screenshot
+                    self.log(f"  ✓ Сохранение: {self.output_dir / screenshot}")
+                with self.timers.measure(stage_timers.RESULTS):
+                    store.add_frame(self.frame_record(frame_num, timecode, reused, results, text,
+                                                      misspellings, findings, screenshot))
+
+            screenshots.close()
+            store.finish({'stats': [("OCR пропущен для неизменившихся кадров", ocr_skipped),
+                                    ("Загрузка стадий конвейера", pipeline.summary()),
+                                    ("Кэш проверки слов", str(self.verdict_cache)),
+                                    ("Варианты исправления", str(self.suggestion_cache)),
+                                    ("Пользовательский словарь", str(self.custom_words)),
+                                    ("Скриншоты", str(screenshots))],
+                          'timers': self.timers.to_dict(),
+                          'total_frames': processed_frames, 'frames_with_errors': aggregator.frames_with_errors,
+                          'total_errors': len(aggregator)})
+        finally:
+            # Дожидаемся записи скриншотов из очереди
+            screenshots.close()
+            store.close()
+        for failure in screenshots.failed:
+            self.log(f"WARNING Не удалось сохранить скриншот {failure}")
+        profile_path = pipeline.profiler.dump() if pipeline.profiler is not None else None
+
+        # Список ошибок - по строке на вхождение
+        if aggregator.occurrences:
+            with open(self.output_dir / "errors.txt", 'w', encoding='utf-8') as f:
+                for occurrence in aggregator.occurrences:
+                    f.write(f"{format_timecode(occurrence.first_timecode)} - "
+                            f"{format_timecode(occurrence.last_timecode)} "
+                            f"({occurrence.frames} кадр.): {occurrence.error} [{occurrence.screenshot}]\n")
+
+        self.log(f"\n{'='*60}")
+        self.log(f"ОБРАБОТКА ЗАВЕРШЕНА!")
+        self.log(f"{'='*60}")
+        self.log(f"Всего обработано кадров: {processed_frames}")
+        self.log(f"OCR пропущен для неизменившихся кадров: {ocr_skipped}")
+        self.log(f"Загрузка стадий конвейера: {pipeline.summary()}")
+        self.log(f"Кэш проверки слов: {self.verdict_cache}")
+        self.log(f"Варианты исправления: {self.suggestion_cache}")
+        self.log(f"Пользовательский словарь: {self.custom_words}")
+        self.log(f"Скриншоты: {screenshots}")
+        self.log("Время по этапам:")
+        for timer in self.timers:
+            self.log(f"  {timer}")
+        if profile_path is not None:
+            self.log(f"Профиль цикла обработки: {profile_path} (просмотр: python -m pstats {profile_path})")
+        self.log(f"Кадров с ошибками: {aggregator.frames_with_errors}")
+        self.log(f"Всего найдено ошибок: {len(aggregator)}")
+        self.log(f"Результаты сохранены в: {self.output_dir.absolute()}")
+        self.log(f"{'='*60}\n")
+
+        return {
+            'total_frames': processed_frames,
+            'ocr_skipped': ocr_skipped,
+            'stage_utilization': {stats.name: stats.utilization for stats in pipeline.stats},
+            'ignored_tokens': self.custom_words.filtered,
+            'frames_with_errors': aggregator.frames_with_errors,
+            'total_errors': len(aggregator),
+            'output_dir': str(self.output_dir.absolute()),
+            'errors_details': [occurrence.to_dict() for occurrence in aggregator.occurrences],
+            'fps': frames.fps,
+            'results_file': str(store.path),
+            'stage_timers': self.timers.to_dict(),
+            'profile_file': str(profile_path) if profile_path is not None else None
+        }
 
 
 def main():
     """Пример использования"""
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Использование: python video_speller.py <путь_к_видео> [интервал_в_секундах]")
-        print("Пример: python video_speller.py video.mp4 2")
-        sys.exit(1)
-
-    video_path = sys.argv[1]
-    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 2
-
-    checker = VideoSpellChecker(output_dir="screenshots_with_errors")
-    checker.process_video(video_path, interval=interval)
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Проверка орфографии в видео",
+        epilog="Пример: python -m src.video_speller video.mp4 2"
+    )
+    parser.add_argument("video_path", help="Путь к видеофайлу")
+    parser.add_argument("interval", nargs="?", type=int, default=2,
+                        help="Интервал между кадрами в секундах (по умолчанию 2)")
+    parser.add_argument("--sampling", choices=SAMPLING_MODES, default="auto",
+                        help="Режим выборки кадров: auto - выбор по интервалу, "
+                             "read - декодировать все кадры, grab - пропуск без декодирования, "
+                             "seek - переход по позиции (по умолчанию auto)")
+    parser.add_argument("--change-threshold", type=float, default=DEFAULT_CHANGE_THRESHOLD,
+                        help="Доля изменившихся пикселей в клетке кадра, при которой кадр распознается заново; "
+                             "неизменившиеся кадры используют предыдущий результат OCR "
+                             "(по умолчанию 0 - OCR на каждом кадре; рекомендуемое значение "
+                             f"{SUGGESTED_CHANGE_THRESHOLD})")
+    parser.add_argument("--roi", action="append", type=parse_region, metavar="X,Y,W,H",
+                        help="Область распознавания в пикселях или долях кадра "
+                             "(например, 0,0.75,1,0.25 - нижняя четверть); можно указать несколько раз")
+    parser.add_argument("--auto-roi", type=int, default=0, metavar="N",
+                        help="Определить зоны текста по первым N кадрам и распознавать только их")
+    parser.add_argument("--profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE,
+                        help=f"Профиль скорости/точности OCR (по умолчанию {DEFAULT_PROFILE})")
+    parser.add_argument("--ocr-batch", type=int, default=ocr.DEFAULT_OCR_BATCH, metavar="K",
+                        help="Распознавать изменившиеся кадры пакетами по K штук "
+                             f"(по умолчанию {ocr.DEFAULT_OCR_BATCH}, 1 - покадрово)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Количество процессов OCR; потоки torch делятся между ними поровну "
+                             "(по умолчанию 1 - распознавание в основном процессе)")
+    parser.add_argument("--screenshot-format", choices=list(SCREENSHOT_FORMATS), default="jpeg",
+                        help="Формат скриншотов кадров с ошибками (по умолчанию jpeg)")
+    parser.add_argument("--screenshot-quality", type=int, default=None, metavar="Q",
+                        help="Качество JPEG/WebP (1-100) или степень сжатия PNG (0-9); "
+                             "по умолчанию - как в OpenCV")
+    parser.add_argument("--thumbnail-width", type=int, default=0, metavar="PX",
+                        help="Сохранять рядом со скриншотом уменьшенную копию шириной PX пикселей")
+    parser.add_argument("--results", choices=list(RESULT_FORMATS), default=DEFAULT_RESULT_FORMAT,
+                        help="Формат файла результатов по кадрам: jsonl или sqlite (по умолчанию jsonl)")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="Профилировать цикл обработки (cProfile) и сохранить profile-*.prof "
+                             "в папку результатов")
+    args = parser.parse_args()
+    try:
+        screenshot_format = ScreenshotFormat(args.screenshot_format, args.screenshot_quality,
+                                             args.thumbnail_width)
+    except ValueError as e:
+        parser.error(str(e))
+
+    checker = VideoSpellChecker(output_dir="screenshots_with_errors", ocr_profile=args.profile,
+                                workers=args.workers)
+    try:
+        checker.process_video(args.video_path, interval=args.interval, sampling=args.sampling,
+                              change_threshold=args.change_threshold,
+                              regions=args.roi, auto_roi_frames=args.auto_roi,
+                              ocr_batch=args.ocr_batch, screenshot_format=screenshot_format,
+                              result_format=args.results, cprofile=args.cprofile)
+    finally:
+        checker.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Индекс словоформ: быстрая проверка слов до аффиксного анализа spylls
+
+Построитель раскрывает основы словаря Hunspell по правилам аффиксов
+(суффиксы, префиксы, их перекрестные сочетания и вторичные суффиксы) и
+оставляет только формы, которые принимает сам spylls. Формы хранятся как
+отсортированный массив 64-битных хэшей (<имя>.forms.npy рядом со словарем),
+который открывается через mmap и проверяется двоичным поиском.
+
+Попадание в индекс означает, что spylls принимает именно эту строку;
+промах ничего не значит - слово проверяется spylls (составные слова,
+редкие формы, регистр). Вероятность ложного попадания из-за совпадения
+хэшей - порядка n / 2^64 на проверку.
+
+Построение (один раз после загрузки или обновления словарей):
+    python -m src.wordform_index
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from src.dict_snapshot import key_matches, load_dictionary, snapshot_key
+
+INDEX_SUFFIX = '.forms.npy'
+META_SUFFIX = '.forms.json'
+
+
+def form_hash(word: str) -> int:
+    """64-битный хэш словоформы"""
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def index_paths(base_path):
+    """Пути к файлам индекса (base_path - путь к словарю без расширения)"""
+    base_path = Path(base_path)
+    return (base_path.with_name(base_path.name + INDEX_SUFFIX),
+            base_path.with_name(base_path.name + META_SUFFIX))
+
+
+class WordFormIndex:
+    """Множество словоформ в виде отсортированного массива хэшей"""
+
+    def __init__(self, hashes: np.ndarray):
+        self._hashes = hashes
+
+    @classmethod
+    def load(cls, base_path) -> Optional['WordFormIndex']:
+        """
+        Открывает индекс словаря
+
+        Returns:
+            Индекс или None, если его нет или он построен по другим файлам словаря
+        """
+        index_path, meta_path = index_paths(base_path)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                if not key_matches(json.load(f), Path(base_path)):
+                    return None
+            return cls(np.load(index_path, mmap_mode='r'))
+        except (OSError, ValueError):
+            return None
+
+    def __contains__(self, word: str) -> bool:
+        value = np.uint64(form_hash(word))
+        position = np.searchsorted(self._hashes, value)
+        return position < len(self._hashes) and self._hashes[position] == value
+
+    def __len__(self):
+        return len(self._hashes)
+
+
+def _apply_suffix(root: str, suffix) -> Optional[str]:
+    if root.endswith(suffix.strip) and suffix.cond_regexp.search(root):
+        return root[:len(root) - len(suffix.strip)] + suffix.add
+    return None
+
+
+def _apply_prefix(root: str, prefix) -> Optional[str]:
+    if root.startswith(prefix.strip) and prefix.cond_regexp.search(root):
+        return prefix.add + root[len(prefix.strip):]
+    return None
+
+
+def expand_forms(dictionary) -> Iterator[str]:
+    """
+    Генерирует словоформы основ словаря по правилам аффиксов
+
+    Формы могут повторяться и могут не приниматься словарем (например,
+    из-за NEEDAFFIX или ONLYINCOMPOUND) - их отсеивает build_index().
+    """
+    aff = dictionary.aff
+    for word in dictionary.dic.words:
+        stem = word.stem
+        yield stem
+
+        prefixes = [prefix for flag in word.flags for prefix in aff.PFX.get(flag, ())]
+        for prefix in prefixes:
+            form = _apply_prefix(stem, prefix)
+            if form:
+                yield form
+
+        for flag in word.flags:
+            for suffix in aff.SFX.get(flag, ()):
+                form = _apply_suffix(stem, suffix)
+                if not form:
+                    continue
+                yield form
+
+                # Вторичные суффиксы (флаги продолжения у суффикса)
+                for second_flag in suffix.flags:
+                    for second in aff.SFX.get(second_flag, ()):
+                        second_form = _apply_suffix(form, second)
+                        if second_form:
+                            yield second_form
+
+                # Перекрестные сочетания префикса и суффикса
+                if suffix.crossproduct:
+                    for prefix in prefixes:
+                        if prefix.crossproduct:
+                            cross_form = _apply_prefix(form, prefix)
+                            if cross_form:
+                                yield cross_form
+
+
+def build_index(base_path, dictionary=None, log=print) -> WordFormIndex:
+    """
+    Строит индекс словоформ словаря и сохраняет его рядом с .aff/.dic
+
+    Args:
+        base_path: Путь к словарю без расширения (например, dictionaries/ru_RU)
+        dictionary: Уже загруженный словарь spylls (по умолчанию загружается)
+        log: Функция вывода сообщений
+
+    Returns:
+        Построенный индекс
+    """
+    base_path = Path(base_path)
+    if dictionary is None:
+        dictionary, _ = load_dictionary(base_path)
+
+    started = time.perf_counter()
+    candidates = set(expand_forms(dictionary))
+    log(f"  {base_path.name}: {len(dictionary.dic.words)} основ, {len(candidates)} кандидатов")
+
+    # В индекс попадают только формы, которые принимает spylls
+    hashes = np.fromiter((form_hash(form) for form in candidates if dictionary.lookup(form)),
+                         dtype=np.uint64)
+    hashes = np.unique(hashes)
+    log(f"  {base_path.name}: {len(hashes)} словоформ в индексе ({time.perf_counter() - started:.0f} с)")
+
+    index_path, meta_path = index_paths(base_path)
+    tmp_path = index_path.with_name(f"{index_path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, hashes)
+    os.replace(tmp_path, index_path)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot_key(base_path), f, indent=2)
+
+    return WordFormIndex(hashes)
+
+
+def main():
+    """Построение индексов словоформ для словарей из каталога dictionaries"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Построение индекса словоформ словарей Hunspell")
+    parser.add_argument("--dictionaries", default=str(Path(__file__).parent.parent / "dictionaries"),
+                        help="Каталог со словарями")
+    parser.add_argument("names", nargs="*", default=["ru_RU", "en_US"],
+                        help="Имена словарей (по умолчанию ru_RU en_US)")
+    args = parser.parse_args()
+
+    print("Построение индексов словоформ...")
+    for name in args.names:
+        base_path = Path(args.dictionaries) / name
+        if not base_path.with_name(name + '.dic').exists():
+            print(f"WARNING Словарь не найден: {base_path}.dic", file=sys.stderr)
+            continue
+        build_index(base_path)
+    print("OK Индексы построены")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Модули приложения импортируются как src.*
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+AFF = """SET UTF-8
+TRY оеаилнтсрвкмдпуяыьгзбчйхжшюцщэфъё
+
+SFX A Y 2
+SFX A 0 ы .
+SFX A 0 а .
+
+PFX B Y 1
+PFX B 0 пере .
+"""
+
+DIC = ["стол/A", "кот", "писать/B", "Москва"]
+
+
+@pytest.fixture
+def tiny_dictionary(tmp_path):
+    """Маленький словарь Hunspell с аффиксами; возвращает путь без расширения"""
+    base_path = tmp_path / "dictionaries" / "ru_TEST"
+    base_path.parent.mkdir()
+    base_path.with_name("ru_TEST.aff").write_text(AFF, encoding='utf-8')
+    base_path.with_name("ru_TEST.dic").write_text(f"{len(DIC)}\n" + "\n".join(DIC) + "\n", encoding='utf-8')
+    return base_path
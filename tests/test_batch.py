@@ -0,0 +1,103 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.batch import BatchItem, collect_items, output_dirs, parse_time, read_manifest
+from src.ignore_rules import IgnoreRules
+from src.spelling import LruCache, Misspelling, SuggestionCache
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    (90, 90.0),
+    ('75', 75.0),
+    ('1:30', 90.0),
+    ('1:02:03.5', 3723.5),
+])
+def test_parse_time(value, expected):
+    assert parse_time(value) == expected
+
+
+def test_read_manifest_csv(tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("path,start,end,interval\nep01.mp4,0:30,21:00,\n/abs/ep02.mp4,,,5\n", encoding='utf-8')
+
+    first, second = read_manifest(manifest)
+    assert first == BatchItem(tmp_path / "ep01.mp4", 30.0, 1260.0, None)
+    assert second == BatchItem(Path("/abs/ep02.mp4"), 0.0, None, 5)
+
+
+def test_read_manifest_json(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([{'path': 'ep01.mp4', 'start': 90, 'end': '1:00:00', 'interval': 3},
+                                    {'path': 'season/ep02.mp4'}]), encoding='utf-8')
+
+    first, second = read_manifest(manifest)
+    assert first == BatchItem(tmp_path / "ep01.mp4", 90.0, 3600.0, 3)
+    assert second == BatchItem(tmp_path / "season" / "ep02.mp4", 0.0, None, None)
+
+
+def test_read_manifest_csv_with_bom_and_missing_path(tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("\ufeffpath,start\nep01.mp4,1:00\n,0:30\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="запись 2: не указан path"):
+        read_manifest(manifest)
+
+
+def test_manifest_collected_with_other_sources(tmp_path):
+    (tmp_path / "ep01.mp4").write_bytes(b"")
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("path,start\nep02.mp4,10\n", encoding='utf-8')
+
+    items = collect_items([str(tmp_path / "ep01.mp4"), str(manifest)])
+    assert items == [BatchItem(tmp_path / "ep01.mp4"), BatchItem(tmp_path / "ep02.mp4", 10.0, None, None)]
+
+
+def test_read_manifest_json_errors(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({'path': 'ep01.mp4'}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        read_manifest(manifest)
+
+    manifest.write_text(json.dumps([{'path': 'ep01.mp4', 'interval': 'x'}]), encoding='utf-8')
+    with pytest.raises(ValueError, match="запись 1"):
+        read_manifest(manifest)
+
+
+def test_collect_items_and_output_dirs(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    for path in (tmp_path / "a" / "ep.mp4", tmp_path / "b" / "ep.MKV", tmp_path / "a" / "notes.txt"):
+        path.write_bytes(b"")
+
+    items = collect_items([str(tmp_path / "a"), str(tmp_path / "b" / "*.MKV")])
+    assert [item.video_path.name for item in items] == ["ep.mp4", "ep.MKV"]
+    assert [path.name for path in output_dirs(items, tmp_path)] == ["screenshots_ep_errors",
+                                                                     "screenshots_ep_errors_2"]
+
+
+def test_views_share_data_but_not_stats():
+    cache = LruCache(10)
+    view = cache.view()
+    view.put('word', True)
+    assert cache.get('word') is True
+    assert (cache.hits, view.hits, view.misses) == (1, 0, 0)
+    view.reset_stats()
+    assert cache.hits == 1
+
+    suggestions = SuggestionCache()
+    suggestions_view = suggestions.view()
+
+    class Dictionary:
+        def suggest(self, word):
+            yield word + "!"
+
+    assert suggestions_view.get(Dictionary(), Misspelling('слво', 'ru')) == ['слво!']
+    assert (suggestions_view.computed, suggestions.computed) == (1, 0)
+
+    rules = IgnoreRules(['NASA'])
+    rules_view = rules.view()
+    assert rules_view.filter('nasa')
+    assert (rules_view.filtered, rules.filtered) == (1, 0)
@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.change_detector import DEFAULT_CHANGE_THRESHOLD, FrameChangeDetector
+
+
+def caption_frame(text: str, width: int = 1920, height: int = 1080, quality: int = 90) -> np.ndarray:
+    """Кадр со слайдом и строкой субтитров, сжатый в JPEG"""
+    scale = height / 1080
+    frame = np.full((height, width, 3), (40, 90, 160), np.uint8)
+    cv2.rectangle(frame, (0, int(950 * scale)), (width, int(1040 * scale)), (0, 0, 0), -1)
+    cv2.putText(frame, text, (int(400 * scale), int(1010 * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                0.8 * scale, (255, 255, 255), max(1, int(2 * scale)))
+    return cv2.imdecode(cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1], cv2.IMREAD_COLOR)
+
+
+def test_skipping_is_off_by_default():
+    assert DEFAULT_CHANGE_THRESHOLD == 0
+
+
+@pytest.mark.parametrize('width, height', [(1280, 720), (1920, 1080), (3840, 2160)])
+def test_single_letter_in_caption_is_a_change(width, height):
+    detector = FrameChangeDetector()
+    assert detector.is_changed(caption_frame("Today we learn programming basics", width, height))
+    assert detector.is_changed(caption_frame("Today we learn programming baslcs", width, height))
+
+
+def test_compression_noise_is_not_a_change():
+    detector = FrameChangeDetector()
+    assert detector.is_changed(caption_frame("Today we learn programming basics"))
+    assert not detector.is_changed(caption_frame("Today we learn programming basics", quality=60))
+
+
+def test_reference_is_last_changed_frame():
+    detector = FrameChangeDetector()
+    first = caption_frame("Today we learn programming basics")
+    second = caption_frame("Today we learn programming baslcs")
+    assert detector.is_changed(first)
+    assert detector.is_changed(second)
+    assert not detector.is_changed(second.copy())
+    assert detector.is_changed(first)
+
+    detector.reset()
+    assert detector.is_changed(first)
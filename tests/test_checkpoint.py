@@ -0,0 +1,107 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.checkpoint import CheckpointJournal, checkpoint_key
+from src.screenshots import ScreenshotWriter
+
+FINDING = ['слво', 'ru', 'слво (возможно: слово)', [0, 0, 100, 20]]
+
+
+@pytest.fixture
+def key(tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    return checkpoint_key(video, 2, 0.0, None, 'auto', 0.001, None, 0, 'balanced', ['NASA'])
+
+
+def interrupted_run(output_dir, key) -> CheckpointJournal:
+    journal = CheckpointJournal(output_dir, key)
+    assert not journal.load()
+    journal.start(resume=False)
+    journal.record(0, 0.0, False, [FINDING], "слво", "frame_0_errors.png")
+    journal.record(50, 2.0, True)
+    journal.close()
+    return journal
+
+
+def test_resume_after_interruption(tmp_path, key):
+    interrupted_run(tmp_path, key)
+    # Строка, оборванная при сбое
+    with open(tmp_path / "checkpoint.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"frame": 10')
+
+    journal = CheckpointJournal(tmp_path, key)
+    assert journal.load()
+    assert journal.last_frame == 50
+    assert journal.frames[0] == {'frame': 0, 'timecode': 0.0, 'reused': False, 'findings': [FINDING],
+                                 'text': "слво", 'screenshot': "frame_0_errors.png"}
+
+    journal.start(resume=True)
+    journal.record(100, 4.0, False)
+    journal.close()
+    journal = CheckpointJournal(tmp_path, key)
+    assert journal.load()
+    assert [entry['frame'] for entry in journal.frames] == [0, 50, 100]
+
+    journal.complete()
+    assert not (tmp_path / "checkpoint.jsonl").exists()
+
+
+def test_other_settings_start_over(tmp_path, key):
+    interrupted_run(tmp_path, key)
+    assert not CheckpointJournal(tmp_path, {**key, 'interval': 3}).load()
+
+
+def test_key_depends_on_video_and_dictionary(tmp_path, key):
+    video = tmp_path / "video.mp4"
+    assert checkpoint_key(video, 2, 0.0, None, 'auto', 0.001, None, 0, 'balanced', ['NASA']) == key
+    assert checkpoint_key(video, 2, 0.0, None, 'auto', 0.001, None, 0, 'balanced', ['NASA', 'iPhone']) != key
+    video.write_bytes(b"other frames")
+    assert checkpoint_key(video, 2, 0.0, None, 'auto', 0.001, None, 0, 'balanced', ['NASA']) != key
+
+
+def test_frame_is_recorded_after_its_screenshot_is_written(tmp_path, key):
+    writer = ScreenshotWriter(tmp_path, threads=1)
+    release = threading.Event()
+    write = writer._write
+    writer._write = lambda image, filename: (release.wait(5), write(image, filename))
+
+    journal = CheckpointJournal(tmp_path, key)
+    journal.start(resume=False)
+    journal.record(0, 0.0, False)
+    written = writer.submit(np.zeros((8, 8, 3), np.uint8), "frame_50_errors")
+    journal.record(50, 2.0, False, [FINDING], "слво", writer.filename("frame_50_errors"), written)
+    journal.record(100, 4.0, True)
+
+    # Процесс прерван до записи скриншота: в журнале только кадры до него
+    interrupted = CheckpointJournal(tmp_path, key)
+    assert interrupted.load()
+    assert interrupted.last_frame == 0
+    assert not (tmp_path / "frame_50_errors.png").exists()
+
+    release.set()
+    writer.close()
+    journal.close()
+    assert written.result() == "frame_50_errors.png"
+    assert (tmp_path / "frame_50_errors.png").exists()
+    journal = CheckpointJournal(tmp_path, key)
+    assert journal.load()
+    assert [entry['frame'] for entry in journal.frames] == [0, 50, 100]
+    assert journal.frames[1]['screenshot'] == "frame_50_errors.png"
+
+
+def test_failed_screenshot_is_not_referenced(tmp_path, key):
+    writer = ScreenshotWriter(tmp_path / "missing", threads=1)
+    journal = CheckpointJournal(tmp_path, key)
+    journal.start(resume=False)
+    written = writer.submit(np.zeros((8, 8, 3), np.uint8), "frame_0_errors")
+    journal.record(0, 0.0, False, [FINDING], "слво", writer.filename("frame_0_errors"), written)
+    writer.close()
+    journal.close()
+
+    assert writer.failed
+    journal = CheckpointJournal(tmp_path, key)
+    assert journal.load()
+    assert 'screenshot' not in journal.frames[0]
@@ -0,0 +1,157 @@
+import argparse
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src import daemon, engine
+from src.daemon import DONE, FAILED, Job, SpellCheckService, evict_finished, parse_job
+from src.video_speller import VideoSpellChecker
+
+BOX = [[0, 0], [100, 0], [100, 20], [0, 20]]
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"")
+    return str(path)
+
+
+def test_parse_job_defaults(video):
+    params = parse_job({'video_path': video, 'interval': '3', 'ocr_batch': 2})
+    assert params['interval'] == 3
+    assert params['sampling'] == 'auto'
+    assert params['results'] == daemon.DEFAULT_RESULT_FORMAT
+    assert params['output_dir'].endswith("screenshots_video_errors")
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    {'video_path': 'missing.mp4'},
+    {'unknown': 1},
+])
+def test_parse_job_rejects_request(data):
+    with pytest.raises(ValueError):
+        parse_job(data)
+
+
+@pytest.mark.parametrize('field, value', [
+    ('sampling', 'fast'),
+    ('profile', 'unknown'),
+    ('interval', 0),
+    ('interval', 'two'),
+    ('respell', 'yes'),
+    ('results', 'csv'),
+    ('screenshot_quality', 150),
+    ('end_time', 0.0),
+])
+def test_parse_job_rejects_value(video, field, value):
+    with pytest.raises(ValueError):
+        parse_job({'video_path': video, field: value})
+
+
+def test_follow_keeps_last_events(monkeypatch):
+    monkeypatch.setattr(daemon, 'MAX_JOB_EVENTS', 5)
+    job = Job({})
+    for number in range(20):
+        job.log(str(number))
+    job.set_status(DONE, finished=1.0)
+
+    events = list(job.follow())
+    assert len(job.events) == 5
+    assert job.dropped_events == 16
+    assert [event.get('message') for event in events[:-1]] == ['16', '17', '18', '19']
+    assert events[-1]['status'] == DONE
+
+
+def _finished_job(finished: float) -> Job:
+    job = Job({})
+    job.status = FAILED
+    job.finished = finished
+    return job
+
+
+def test_evict_finished_by_ttl_and_count(monkeypatch):
+    monkeypatch.setattr(daemon, 'MAX_FINISHED_JOBS', 2)
+    old = _finished_job(0.0)
+    recent = [_finished_job(float(number)) for number in range(1000, 1003)]
+    running = Job({})
+    jobs = {job.id: job for job in [old, running, *recent]}
+
+    evict_finished(jobs, now=daemon.FINISHED_JOB_TTL + 500)
+
+    assert set(jobs) == {running.id, recent[1].id, recent[2].id}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Сервер на свободном порту с маленькими словарями и OCR без моделей"""
+    dictionaries = tmp_path / "dictionaries"
+    dictionaries.mkdir()
+    for name, words in (('ru_RU', ['мир', 'привет']), ('en_US', ['hello', 'world'])):
+        (dictionaries / f"{name}.aff").write_text("SET UTF-8\n", encoding='utf-8')
+        (dictionaries / f"{name}.dic").write_text(f"{len(words)}\n" + "\n".join(words) + "\n", encoding='utf-8')
+    monkeypatch.setattr(engine, 'get_app_dir', lambda: tmp_path)
+    monkeypatch.setattr('easyocr.Reader', lambda *args, **kwargs: object())
+    recognized = []
+
+    def recognize_frames(self, frames, *args, **kwargs):
+        for frame_num, timecode, frame in frames:
+            recognized.append(frame_num)
+            yield frame_num, timecode, frame, [(BOX, "Превет мир", 0.9)], False
+
+    monkeypatch.setattr(VideoSpellChecker, 'recognize_frames', recognize_frames)
+
+    service = SpellCheckService()
+    http_server = daemon.make_server(service, port=0)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    service.start()
+    http_server.recognized = recognized
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+    service.close()
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 5, (64, 48))
+    for idx in range(15):
+        writer.write(np.full((48, 64, 3), idx * 10, np.uint8))
+    writer.release()
+    return str(path)
+
+
+def submit_args(server, video_path, **options) -> argparse.Namespace:
+    """Аргументы команды submit со значениями по умолчанию"""
+    values = dict(host='127.0.0.1', port=server.server_address[1], socket=None, video_path=video_path,
+                  interval=1, start=0.0, end=None, output_dir=None, profile='balanced', sampling='auto',
+                  ocr_batch=1, respell=False, screenshot_format='jpeg', screenshot_quality=None,
+                  thumbnail_width=0, results='jsonl', cprofile=False, quiet=True)
+    values.update(options)
+    return argparse.Namespace(**values)
+
+
+def test_submit_and_respell(server, clip):
+    # Код возврата 1 - найдены ошибки
+    assert daemon.submit_job(submit_args(server, clip)) == 1
+    assert server.recognized == [0, 5, 10]
+
+    # Повторная проверка по расшифровке: OCR не выполняется
+    assert daemon.submit_job(submit_args(server, clip, respell=True)) == 1
+    assert server.recognized == [0, 5, 10]
+
+    first, second = server.RequestHandlerClass.service.jobs.values()
+    assert (first.status, second.status) == (DONE, DONE)
+    assert (first.result['total_frames'], first.result['total_errors']) == (3, 1)
+    assert second.result['total_errors'] == 1
+    assert second.params['respell'] and not first.params['respell']
+
+
+def test_invalid_job_is_rejected(server, tmp_path, capsys):
+    assert daemon.submit_job(submit_args(server, str(tmp_path / "missing.mp4"))) == 2
+    assert "Видеофайл не найден" in capsys.readouterr().err
+    assert server.RequestHandlerClass.service.jobs == {}
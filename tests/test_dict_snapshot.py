@@ -0,0 +1,50 @@
+import os
+
+from src.dict_snapshot import load_dictionary, load_snapshot, snapshot_path
+
+WORDS = ["стол", "столы", "стола", "кот", "коты", "переписать", "писать", "Москва", "москва", "МОСКВА",
+         "Стол", "стлы"]
+
+
+def test_snapshot_round_trip(tiny_dictionary):
+    parsed, from_snapshot = load_dictionary(tiny_dictionary)
+    assert not from_snapshot
+    assert snapshot_path(tiny_dictionary).exists()
+
+    loaded, from_snapshot = load_dictionary(tiny_dictionary)
+    assert from_snapshot
+    assert [loaded.lookup(word) for word in WORDS] == [parsed.lookup(word) for word in WORDS]
+    assert [list(loaded.suggest(word)) for word in WORDS] == [list(parsed.suggest(word)) for word in WORDS]
+
+
+def test_changed_dictionary_invalidates_snapshot(tiny_dictionary):
+    load_dictionary(tiny_dictionary)
+    dic_path = tiny_dictionary.with_name("ru_TEST.dic")
+    dic_path.write_text("5\nстол/A\nкот\nписать/B\nМосква\nстул/A\n", encoding='utf-8')
+    assert load_snapshot(tiny_dictionary) is None
+
+    dictionary, from_snapshot = load_dictionary(tiny_dictionary)
+    assert not from_snapshot
+    assert dictionary.lookup("стулы")
+
+
+def test_touched_dictionary_keeps_snapshot(tiny_dictionary):
+    load_dictionary(tiny_dictionary)
+    aff_path = tiny_dictionary.with_name("ru_TEST.aff")
+    stat = aff_path.stat()
+    os.utime(aff_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_snapshot(tiny_dictionary) is not None
+
+
+def test_damaged_snapshot_is_ignored(tiny_dictionary):
+    load_dictionary(tiny_dictionary)
+    path = snapshot_path(tiny_dictionary)
+    path.write_bytes(path.read_bytes()[:100])
+    assert load_snapshot(tiny_dictionary) is None
+    dictionary, from_snapshot = load_dictionary(tiny_dictionary)
+    assert not from_snapshot and dictionary.lookup("столы")
+
+
+def test_snapshots_can_be_disabled(tiny_dictionary):
+    assert load_dictionary(tiny_dictionary, use_snapshot=False)[1] is False
+    assert not snapshot_path(tiny_dictionary).exists()
@@ -0,0 +1,129 @@
+import cv2
+import numpy as np
+import pytest
+
+from src import engine as engine_module
+from src.engine import CheckerEngine, ProcessingCancelled
+
+BOX = [[0, 0], [100, 0], [100, 20], [0, 20]]
+
+
+class FakeReader:
+    """easyocr.Reader без моделей"""
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeReader.created += 1
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Папка приложения с маленькими словарями; модели OCR не загружаются"""
+    dictionaries = tmp_path / "dictionaries"
+    dictionaries.mkdir()
+    for name, words in (('ru_RU', ['мир', 'привет']), ('en_US', ['hello', 'world'])):
+        (dictionaries / f"{name}.aff").write_text("SET UTF-8\n", encoding='utf-8')
+        (dictionaries / f"{name}.dic").write_text(f"{len(words)}\n" + "\n".join(words) + "\n", encoding='utf-8')
+    monkeypatch.setattr(engine_module, 'get_app_dir', lambda: tmp_path)
+    monkeypatch.setattr('easyocr.Reader', FakeReader)
+    FakeReader.created = 0
+    return tmp_path
+
+
+class FakePool:
+    """OcrWorkerPool без процессов"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.threads = 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 5, (64, 48))
+    for idx in range(25):
+        writer.write(np.full((48, 64, 3), idx * 10, np.uint8))
+    writer.release()
+    return path
+
+
+def fake_recognize(frames, *args, **kwargs):
+    for frame_num, timecode, frame in frames:
+        yield frame_num, timecode, frame, [(BOX, "Превет мир", 0.9)], False
+
+
+def test_cancel_stops_run_and_keeps_journal(app_dir, video):
+    engine = CheckerEngine()
+    output_dir = app_dir / "out"
+
+    def log(message):
+        if message.startswith("\nОбработка кадра 2/"):
+            engine.cancel()
+
+    with engine.checker(output_dir=output_dir, log_callback=log) as checker:
+        checker.recognize_frames = fake_recognize
+        with pytest.raises(ProcessingCancelled):
+            checker.process_video_with_result(str(video), interval=1)
+    assert (output_dir / "checkpoint.jsonl").exists()
+
+    # Следующий запуск не отменен и продолжает обработку по журналу
+    with engine.checker(output_dir=output_dir, log_callback=lambda message: None) as checker:
+        result = checker.process_video_with_result(str(video), interval=1)
+    assert result['resumed_frames'] == 2
+    assert result['total_frames'] == 5
+    assert not (output_dir / "checkpoint.jsonl").exists()
+    engine.close()
+    assert not engine.loaded
+
+
+def quiet():
+    return {'output_dir': None, 'log_callback': lambda message: None}
+
+
+def test_unchanged_parts_are_reused(app_dir):
+    engine = CheckerEngine()
+    with engine.checker(**quiet()) as checker:
+        reader, spell_ru, custom_words = checker.reader, checker.spell_ru, checker.custom_words
+        verdict_cache = checker.verdict_cache
+    with engine.checker(**quiet()) as checker:
+        assert checker.reader is reader and checker.spell_ru is spell_ru
+        assert checker.custom_words is custom_words and checker.verdict_cache is verdict_cache
+    assert FakeReader.created == 1
+
+
+def test_only_changed_parts_are_reloaded(app_dir, monkeypatch):
+    monkeypatch.setattr(engine_module, 'OcrWorkerPool', FakePool)
+    engine = CheckerEngine()
+    with engine.checker(**quiet()) as checker:
+        spell_ru, spell_en, custom_words = checker.spell_ru, checker.spell_en, checker.custom_words
+        verdict_cache = checker.verdict_cache
+
+    # Пользовательский словарь: словари и кэш проверки слов не перезагружаются
+    (app_dir / "custom_dictionary.txt").write_text("Превет\n", encoding='utf-8')
+    with engine.checker(**quiet()) as checker:
+        assert checker.custom_words is not custom_words
+        assert checker.find_misspellings("Превет мир") == []
+        assert checker.spell_ru is spell_ru and checker.verdict_cache is verdict_cache
+
+    # Словарь Hunspell: словари перезагружаются, кэш сбрасывается, модели OCR остаются
+    (app_dir / "dictionaries" / "ru_RU.dic").write_text("3\nмир\nпривет\nпревет\n", encoding='utf-8')
+    with engine.checker(**quiet()) as checker:
+        assert checker.spell_ru is not spell_ru and checker.spell_en is not spell_en
+        assert checker.verdict_cache is not verdict_cache
+        assert checker.spell_ru.lookup("превет")
+    assert FakeReader.created == 1
+
+    # Количество процессов OCR: перезапускается только OCR
+    with engine.checker(workers=2, **quiet()) as checker:
+        spell_ru = checker.spell_ru
+        pool = checker.ocr_pool
+        assert (checker.reader, pool.workers) == (None, 2)
+    with engine.checker(workers=1, **quiet()) as checker:
+        assert pool.closed and checker.ocr_pool is None
+        assert checker.spell_ru is spell_ru
+    assert FakeReader.created == 2
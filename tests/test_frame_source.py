@@ -0,0 +1,81 @@
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+from src.frame_source import FrameSource
+
+FPS = 10
+FRAMES = 50
+
+
+@pytest.fixture(scope='module')
+def video(tmp_path_factory):
+    """Ролик 5 с при 10 кадрах в секунду; яркость кадра равна 5 * номер"""
+    path = tmp_path_factory.mktemp('video') / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), FPS, (64, 48))
+    for frame_num in range(FRAMES):
+        writer.write(np.full((48, 64, 3), frame_num * 5, np.uint8))
+    writer.release()
+    return str(path)
+
+
+def brightness(frame) -> int:
+    return round(frame.mean() / 5)
+
+
+def test_frames_are_generated_lazily(video):
+    source = FrameSource(video, interval=1)
+    assert len(source) == 5
+    frames = iter(source)
+    assert isinstance(frames, types.GeneratorType)
+    frame_num, timecode, frame = next(frames)
+    assert (frame_num, timecode, brightness(frame)) == (0, 0.0, 0)
+    assert source.cap is not None
+    assert [frame_num for frame_num, _, _ in frames] == [10, 20, 30, 40]
+    # Видео освобождается после чтения, повторно источник не читается
+    assert source.cap is None
+    with pytest.raises(RuntimeError):
+        list(source)
+
+
+def test_time_range(video):
+    source = FrameSource(video, interval=0.5, start_time=1, end_time=3)
+    assert len(source) == 4
+    assert [(frame_num, timecode) for frame_num, timecode, _ in source] == \
+        [(10, 1.0), (15, 1.5), (20, 2.0), (25, 2.5)]
+
+
+@pytest.mark.parametrize('sampling', ['read', 'grab', 'seek', 'auto'])
+def test_sampling_modes_return_same_frames(video, sampling):
+    expected = [(frame_num, timecode, frame) for frame_num, timecode, frame
+                in FrameSource(video, interval=0.7, start_time=0.3, sampling='read')]
+    frames = list(FrameSource(video, interval=0.7, start_time=0.3, sampling=sampling))
+    assert [frame_num for frame_num, _, _ in frames] == [3, 10, 17, 24, 31, 38, 45]
+    assert [brightness(frame) for _, _, frame in frames] == [3, 10, 17, 24, 31, 38, 45]
+    for (frame_num, timecode, frame), (expected_num, expected_timecode, expected_frame) in zip(frames, expected):
+        assert (frame_num, timecode) == (expected_num, expected_timecode)
+        assert np.array_equal(frame, expected_frame)
+
+
+def test_auto_sampling_uses_seek_for_long_intervals(video):
+    assert FrameSource(video, interval=1).sampling == 'grab'
+    assert FrameSource(video, interval=20).sampling == 'seek'
+
+
+@pytest.mark.parametrize('sampling', ['grab', 'seek'])
+def test_resume_after_keeps_frame_grid(video, sampling):
+    source = FrameSource(video, interval=1, start_time=0.5, sampling=sampling)
+    source.resume_after(25)
+    assert len(source) == 2
+    assert [frame_num for frame_num, _, _ in source] == [35, 45]
+
+
+def test_invalid_arguments(video, tmp_path):
+    with pytest.raises(ValueError):
+        FrameSource(video, sampling='decode')
+    with pytest.raises(ValueError):
+        FrameSource(video, start_time=3, end_time=2)
+    with pytest.raises(ValueError):
+        FrameSource(str(tmp_path / "missing.mp4"))
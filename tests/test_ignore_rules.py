@@ -0,0 +1,57 @@
+import pytest
+
+from src.ignore_rules import IgnoreRules
+
+
+def test_words_and_wildcards():
+    rules = IgnoreRules(['ёжик', '=NASA', 'iPhone*', '*Exception', '=Py*'])
+    assert 'Ежик' in rules
+    assert 'NASA' in rules and 'Nasa' not in rules
+    assert 'iphone15' in rules
+    assert 'ValueException' in rules
+    assert 'PyQt' in rules and 'pyqt' not in rules
+    assert 'слово' not in rules
+    assert rules.patterns == 3 and len(rules) == 5
+
+
+def test_regular_expressions():
+    rules = IgnoreRules([r'/[A-Z]{2,}\d+/', '/https?://.*/i', r'/(?P<c>\w)(?P=c)+/'])
+    assert 'ABC123' in rules and 'abc123' not in rules
+    assert 'HTTPS://example.com' in rules
+    assert 'ааа' in rules
+    assert rules.invalid == []
+
+
+@pytest.mark.parametrize('entry', [
+    '/(?i)abc/',
+    '/(?x) b /',
+    r'/(\w)\1/',
+    r'/(a)?(?(1)b|c)/',
+    '/[a-/',
+])
+def test_invalid_regex_does_not_disable_other_rules(entry):
+    rules = IgnoreRules(['=NASA', '/[0-9]+/', entry, 'iPhone*'])
+    assert [invalid for invalid, _ in rules.invalid] == [entry]
+    assert entry not in rules.entries
+    assert 'NASA' in rules and '2024' in rules and 'iPhone15' in rules
+
+
+def test_escaped_backslash_before_digit_is_not_a_reference():
+    rules = IgnoreRules([r'/a\\1/'])
+    assert rules.invalid == []
+    assert 'a\\1' in rules
+
+
+def test_conflicting_group_names():
+    rules = IgnoreRules(['/(?P<x>a+)/', '/(?P<x>b+)/', '/c+/'])
+    assert [entry for entry, _ in rules.invalid] == ['/(?P<x>b+)/']
+    assert 'aaa' in rules and 'ccc' in rules and 'bbb' not in rules
+    assert rules.patterns == 2
+
+
+def test_filter_counts_tokens():
+    rules = IgnoreRules(['NASA'])
+    assert rules.filter('nasa') and not rules.filter('слово')
+    assert rules.filtered == 1
+    rules.reset_stats()
+    assert rules.filtered == 0
@@ -0,0 +1,70 @@
+import pytest
+
+from src.occurrences import ErrorAggregator, block_box, describe_error, format_timecode, locate, overlap
+
+BOX = (10, 10, 110, 40)
+
+
+def test_block_box():
+    assert block_box([[10.4, 20], [99.6, 20], [99.6, 50.5], [10.4, 50.5]]) == (10, 20, 100, 50)
+
+
+def test_overlap():
+    assert overlap(BOX, BOX) == 1.0
+    assert overlap(BOX, (200, 10, 300, 40)) == 0.0
+    assert overlap((0, 0, 10, 10), (5, 0, 15, 10)) == pytest.approx(50 / 150)
+    assert overlap(None, None) == 1.0
+    assert overlap(BOX, None) == 0.0
+
+
+def test_format_timecode():
+    assert format_timecode(65.4) == '1:05.40'
+    assert format_timecode(0) == '0:00.00'
+
+
+def test_describe_error():
+    assert describe_error('слво', ['слово', 'слава']) == 'слво (возможно: слово, слава)'
+    assert describe_error('ббб', []) == 'ббб (варианты не найдены)'
+
+
+def test_locate():
+    results = [([[0, 0], [50, 0], [50, 20], [0, 20]], 'Превет мир', 0.9),
+               ([[0, 30], [50, 30], [50, 50], [0, 50]], 'Опечатко', 0.8)]
+    assert locate(['Опечатко', 'Превет', 'информационные'], results) == [(0, 30, 50, 50), (0, 0, 50, 20), None]
+
+
+def test_occurrence_continues_while_word_stays_in_place():
+    aggregator = ErrorAggregator()
+    started = aggregator.add(0, 0.0, [('слво', 'ru', 'слво (возможно: слово)', BOX)], text='слво')
+    assert [occurrence.word for occurrence in started] == ['слво']
+    assert aggregator.add(25, 1.0, [('слво', 'ru', 'слво (возможно: слово)', (12, 11, 112, 41))]) == []
+
+    occurrence, = aggregator.occurrences
+    assert (occurrence.first_frame, occurrence.last_frame, occurrence.frames) == (0, 25, 2)
+    assert occurrence.last_timecode == 1.0
+    assert occurrence.box == (12, 11, 112, 41)
+    assert occurrence.text == 'слво'
+    assert aggregator.frames_with_errors == 2
+
+
+def test_new_occurrence_after_gap_or_move():
+    aggregator = ErrorAggregator()
+    aggregator.add(0, 0.0, [('слво', 'ru', 'слво', BOX)])
+    # Слово в другом месте кадра - новое вхождение
+    assert len(aggregator.add(25, 1.0, [('слво', 'ru', 'слво', (300, 300, 400, 330))])) == 1
+    # Кадр без ошибки завершает вхождение
+    aggregator.add(50, 2.0, [])
+    assert len(aggregator.add(75, 3.0, [('слво', 'ru', 'слво', (300, 300, 400, 330))])) == 1
+
+    assert [occurrence.first_frame for occurrence in aggregator.occurrences] == [0, 25, 75]
+    assert aggregator.frames_with_errors == 3
+    assert len(aggregator) == 3
+
+
+def test_repeated_word_in_same_block_is_counted_once():
+    aggregator = ErrorAggregator()
+    started = aggregator.add(0, 0.0, [('слво', 'ru', 'слво', BOX), ('слво', 'ru', 'слво', BOX)])
+    assert len(started) == 1
+    aggregator.add(25, 1.0, [('слво', 'ru', 'слво', BOX), ('слво', 'ru', 'слво', BOX)])
+    occurrence, = aggregator.occurrences
+    assert occurrence.frames == 2
@@ -0,0 +1,97 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src import ocr
+from src.ocr_profiles import get_profile
+from src.roi import Region
+
+HALF_SIZE = replace(get_profile('balanced'), downscale=0.5)
+
+
+def caption_frame(brightness: int, x: int):
+    """Кадр 400x200 с одной «строкой текста» - прямоугольником заданной яркости"""
+    frame = np.zeros((200, 400, 3), np.uint8)
+    if brightness:
+        frame[160:180, x:x + 120] = brightness
+    return frame
+
+
+class FakeReader:
+    """Детектор находит светлые прямоугольники; распознаватель подменяется в тестах"""
+    character = 'abc'
+    lang_char = 'abc'
+    recognizer = converter = None
+    device = 'cpu'
+
+    def __init__(self):
+        self.detect_batches = []
+
+    def detect(self, batch, **kwargs):
+        self.detect_batches.append(batch.shape)
+        horizontal = []
+        for image in batch:
+            ys, xs = np.nonzero(image[..., 0])
+            horizontal.append([[int(xs.min()), int(xs.max()) + 1, int(ys.min()), int(ys.max()) + 1]]
+                              if len(xs) else [])
+        return horizontal, [[] for _ in batch]
+
+    def readtext(self, image, **kwargs):
+        horizontal, _ = self.detect(image[None])
+        return [fake_result(image[y0:y1, x0:x1], x0, y0, x1, y1) for x0, x1, y0, y1 in horizontal[0]]
+
+
+def fake_result(line, x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]], f"яркость {int(round(line.mean()))}", 0.9
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    recognized_batches = []
+
+    def get_text(character, model_height, width, recognizer, converter, image_list, *args, **kwargs):
+        recognized_batches.append(len(image_list))
+        return [(box, fake_result(line, 0, 0, 0, 0)[1], 0.9) for box, line in image_list]
+
+    monkeypatch.setattr('easyocr.recognition.get_text', get_text)
+    reader = FakeReader()
+    reader.recognized_batches = recognized_batches
+    return reader
+
+
+def texts(results):
+    return [[text for _, text, _ in frame_results] for frame_results in results]
+
+
+def test_map_results():
+    bbox = [[10, 20], [30, 20], [30, 40], [10, 40]]
+    assert ocr.map_results([(bbox, 'a', 0.5)], 1.0, 0, 0)[0][0] is bbox
+    assert ocr.map_results([(bbox, 'a', 0.5)], 0.5, 100, 200)[0][0] == \
+        [[120, 240], [160, 240], [160, 280], [120, 280]]
+
+
+def test_batch_keeps_frame_order(reader):
+    frames = [caption_frame(200, 10), caption_frame(0, 0), caption_frame(100, 250)]
+    results = ocr.recognize_batch(reader, frames, profile='balanced')
+    assert texts(results) == [['яркость 200'], [], ['яркость 100']]
+    # Кадры одного размера - один вызов детектора, строки - один пакет распознавателя
+    assert reader.detect_batches == [(3, 200, 400, 3)]
+    assert reader.recognized_batches == [2]
+
+
+def test_batch_matches_per_frame_coordinates(reader):
+    frames = [caption_frame(200, 10), caption_frame(100, 250)]
+    regions = [Region(0, 0.75, 1, 0.25)]
+    batched = ocr.recognize_batch(reader, frames, regions, HALF_SIZE)
+    single = [ocr.recognize(reader, frame, regions, HALF_SIZE) for frame in frames]
+    assert [[bbox for bbox, _, _ in frame_results] for frame_results in batched] == \
+        [[bbox for bbox, _, _ in frame_results] for frame_results in single] == \
+        [[[[10, 160], [130, 160], [130, 180], [10, 180]]],
+         [[[250, 160], [370, 160], [370, 180], [250, 180]]]]
+    assert texts(batched) == texts(single)
+
+
+def test_single_frame_uses_readtext(reader):
+    assert texts(ocr.recognize_batch(reader, [caption_frame(200, 10)])) == [['яркость 200']]
+    assert reader.recognized_batches == []
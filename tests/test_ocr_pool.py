@@ -0,0 +1,35 @@
+import queue
+
+import pytest
+
+from src.ocr_pool import OcrWorkerPool
+
+
+def waiting_pool(workers, statuses) -> OcrWorkerPool:
+    """Пул без процессов: сообщения инициализаторов уже в очереди"""
+    pool = OcrWorkerPool.__new__(OcrWorkerPool)
+    pool.workers = workers
+    pool._status = queue.Queue()
+    for status in statuses:
+        pool._status.put(status)
+    return pool
+
+
+def test_every_worker_reports_ready():
+    waiting_pool(2, [(101, "ready"), (102, "ready")])._wait_ready(1)
+
+
+def test_worker_answering_twice_is_not_enough():
+    with pytest.raises(RuntimeError, match="готово 1 из 2"):
+        waiting_pool(2, [(101, "ready"), (101, "ready")])._wait_ready(0.1)
+
+
+def test_failed_worker_is_reported():
+    pool = waiting_pool(2, [(101, "ready"), (102, "ValueError: ({'xx'}, 'is not supported')")])
+    with pytest.raises(RuntimeError, match="is not supported"):
+        pool._wait_ready(1)
+
+
+def test_restarted_worker_counts_once_ready():
+    # Процесс, завершившийся после загрузки, перезапускается пулом с новым PID
+    waiting_pool(2, [(101, "ready"), (101, "ready"), (103, "ready")])._wait_ready(1)
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from src.pipeline import Pipeline
+
+
+def doubled(items):
+    for item in items:
+        yield item * 2
+
+
+def pairs(items):
+    """Стадия с состоянием: выдает элементы парами, последний - без пары"""
+    pending = []
+    for item in items:
+        pending.append(item)
+        if len(pending) == 2:
+            yield tuple(pending)
+            pending = []
+    if pending:
+        yield tuple(pending)
+
+
+def test_items_keep_order():
+    pipeline = Pipeline(range(7), "источник", queue_size=1).add_stage("x2", doubled).add_stage("пары", pairs)
+    assert list(pipeline.run("запись")) == [(0, 2), (4, 6), (8, 10), (12,)]
+    assert [stats.name for stats in pipeline.stats] == ["источник", "x2", "пары", "запись"]
+    assert [stats.items for stats in pipeline.stats] == [7, 7, 4, 4]
+    assert pipeline.summary().startswith("источник ")
+    assert not any(thread.is_alive() for thread in pipeline._threads)
+
+
+def test_stage_error_reaches_caller():
+    def failing(items):
+        for item in items:
+            if item == 3:
+                raise ValueError("ошибка стадии")
+            yield item
+
+    received = []
+    pipeline = Pipeline(range(10), "источник").add_stage("проверка", failing)
+    with pytest.raises(ValueError, match="ошибка стадии"):
+        for item in pipeline.run("запись"):
+            received.append(item)
+    assert received == [0, 1, 2]
+    assert not any(thread.is_alive() for thread in pipeline._threads)
+
+
+def test_source_error_reaches_caller():
+    def source():
+        yield 1
+        raise OSError("видео повреждено")
+
+    with pytest.raises(OSError, match="видео повреждено"):
+        list(Pipeline(source(), "источник").add_stage("x2", doubled).run("запись"))
+
+
+def test_early_exit_stops_stages_and_closes_source():
+    produced = []
+    closed = threading.Event()
+
+    def source():
+        try:
+            for item in range(1000):
+                produced.append(item)
+                yield item
+        finally:
+            closed.set()
+
+    pipeline = Pipeline(source(), "источник", queue_size=1).add_stage("x2", doubled)
+    for item in pipeline.run("запись"):
+        if item == 4:
+            break
+    assert closed.is_set()
+    assert not any(thread.is_alive() for thread in pipeline._threads)
+    # Очереди ограничены: источник не ушел далеко вперед
+    assert len(produced) < 10
@@ -0,0 +1,97 @@
+import pytest
+
+from src.result_store import RESULT_FORMATS, frame_record, open_result_store, read_results, write_report
+
+RUN = {'video_path': 'lecture.mp4', 'interval': 1.0, 'profile': 'balanced', 'profile_title': 'Сбалансированный',
+       'output_dir': 'out'}
+BBOX = [[0, 0], [100.4, 0], [100.4, 30], [0, 30]]
+
+
+def record(frame_num, errors=()):
+    errors = [{'word': word, 'language': 'ru', 'suggestions': ['слово'], 'box': (0, 0, 100, 30)}
+              for word in errors]
+    return frame_record(frame_num, frame_num / 25, False, [(BBOX, 'Это слво', 0.91234)],
+                        ['Это', 'слво'], errors, screenshot=f'frame_{frame_num}.jpg' if errors else None)
+
+
+def write_run(path_dir, result_format, frames, summary=None, resume_after=None):
+    store = open_result_store(path_dir, result_format, resume_after)
+    store.start(RUN)
+    for frame_num, errors in frames:
+        store.add_frame(record(frame_num, errors))
+    if summary is not None:
+        store.finish(summary)
+    store.close()
+    return store.path
+
+
+def test_frame_record():
+    entry = record(25, ['слво'])
+    assert entry['boxes'] == [{'box': [[0, 0], [100, 0], [100, 30], [0, 30]], 'text': 'Это слво',
+                               'confidence': 0.912}]
+    assert entry['errors'][0]['box'] == [0, 0, 100, 30]
+    assert entry['timecode'] == 1.0
+    assert entry['screenshot'] == 'frame_25.jpg'
+
+
+@pytest.mark.parametrize('result_format', sorted(RESULT_FORMATS))
+def test_write_and_read(tmp_path, result_format):
+    path = write_run(tmp_path, result_format, [(0, ['слво']), (25, [])], summary={'stats': []})
+    entries = list(read_results(path))
+    assert [kind for kind, _ in entries] == ['run', 'frame', 'frame', 'summary']
+    assert entries[0][1]['video_path'] == 'lecture.mp4'
+    assert entries[1][1] == record(0, ['слво'])
+    assert entries[2][1]['errors'] == []
+
+
+@pytest.mark.parametrize('result_format', sorted(RESULT_FORMATS))
+def test_resume_keeps_frames_up_to_checkpoint(tmp_path, result_format):
+    write_run(tmp_path, result_format, [(0, ['слво']), (25, ['слво']), (50, [])])
+    path = write_run(tmp_path, result_format, [(50, ['ошибко'])], resume_after=25)
+    frames = [entry for kind, entry in read_results(path) if kind == 'frame']
+    assert [entry['frame'] for entry in frames] == [0, 25, 50]
+    assert frames[2]['errors'][0]['word'] == 'ошибко'
+
+
+@pytest.mark.parametrize('result_format', sorted(RESULT_FORMATS))
+def test_new_run_replaces_results(tmp_path, result_format):
+    write_run(tmp_path, result_format, [(0, ['слво'])])
+    path = write_run(tmp_path, result_format, [])
+    assert [kind for kind, _ in read_results(path)] == ['run']
+
+
+def test_truncated_line_is_ignored(tmp_path):
+    path = write_run(tmp_path, 'jsonl', [(0, [])])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "frame", "fra')
+    assert [kind for kind, _ in read_results(path)] == ['run', 'frame']
+
+
+def test_missing_file(tmp_path):
+    assert list(read_results(tmp_path / 'results.jsonl')) == []
+
+
+def test_report(tmp_path):
+    timers = {'проверка слов': {'count': 2, 'total': 0.01, 'p50': 0.004, 'p95': 0.006, 'max': 0.006}}
+    path = write_run(tmp_path, 'jsonl', [(0, ['слво']), (25, ['слво']), (50, [])],
+                     summary={'stats': [['Проверено слов', 4]], 'timers': timers})
+    aggregator = write_report(path, tmp_path / 'report.txt')
+    report = (tmp_path / 'report.txt').read_text(encoding='utf-8')
+
+    occurrence, = aggregator.occurrences
+    assert (occurrence.frames, occurrence.screenshot) == (2, 'frame_0.jpg')
+    assert 'Всего обработано кадров: 3' in report
+    assert 'Проверено слов: 4' in report
+    assert 'Кадров с ошибками: 2' in report
+    assert 'ВРЕМЯ ПО ЭТАПАМ' in report
+    assert 'слво (возможно: слово)' in report
+    assert 'Обработка не завершена' not in report
+
+
+def test_report_of_unfinished_run(tmp_path):
+    path = write_run(tmp_path, 'sqlite', [(0, ['слво'])])
+    write_report(path, tmp_path / 'report.txt')
+    report = (tmp_path / 'report.txt').read_text(encoding='utf-8')
+    assert 'Обработка не завершена' in report
+    assert 'ВРЕМЯ ПО ЭТАПАМ' not in report
+    assert 'Всего найдено ошибок: 1' in report
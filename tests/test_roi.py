@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src import ocr
+from src.roi import Region, TextZoneLearner, coverage, crop_regions, parse_region
+
+
+def box(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+def test_parse_region():
+    assert parse_region("0, 0.75, 1, 0.25") == Region(0, 0.75, 1, 0.25)
+    assert parse_region("0,820,1920,260").relative is False
+    for spec in ("0,0,1", "0,0,0,1", "-1,0,1,1", "a,b,c,d"):
+        with pytest.raises(ValueError):
+            parse_region(spec)
+
+
+def test_bounds_are_clipped_to_frame():
+    assert Region(0, 0.75, 1, 0.25).bounds(1920, 1080) == (0, 810, 1920, 1080)
+    assert Region(1800, 1000, 300, 200).bounds(1920, 1080) == (1800, 1000, 1920, 1080)
+    assert str(Region(0, 0.75, 1, 0.25)) == "0,0.75,1,0.25"
+
+
+def test_crop_regions_skips_empty():
+    frame = np.zeros((100, 200, 3), np.uint8)
+    crops = crop_regions(frame, [Region(10, 20, 30, 40), Region(300, 0, 10, 10)])
+    assert [(dx, dy, crop.shape) for dx, dy, crop in crops] == [(10, 20, (40, 30, 3))]
+
+
+def test_coverage():
+    assert coverage(None, 100, 100) == 1.0
+    assert coverage([Region(0, 0.75, 1, 0.25)], 1920, 1080) == pytest.approx(0.25)
+    assert coverage([Region(0, 0, 1, 1), Region(0, 0, 1, 1)], 100, 100) == 1.0
+
+
+def test_zones_learned_from_text_boxes():
+    learner = TextZoneLearner(frames=2)
+    learner.observe((1080, 1920, 3), [(box(400, 960, 1500, 1000), 'субтитр', 0.9)])
+    assert not learner.ready
+    learner.observe((1080, 1920, 3), [(box(420, 965, 1480, 1005), 'субтитр', 0.9),
+                                      (box(1700, 40, 1880, 80), 'логотип', 0.9)])
+    assert learner.ready
+    assert learner.zones() == [Region(1672, 16, 240, 96), Region(376, 936, 1152, 96)]
+
+
+def test_learning_waits_for_text():
+    learner = TextZoneLearner(frames=1)
+    learner.observe((1080, 1920, 3), [])
+    assert not learner.ready
+    assert learner.zones() == []
+
+
+class FakeReader:
+    """readtext() находит один блок в левом верхнем углу фрагмента"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def readtext(self, image, **kwargs):
+        self.shapes.append(image.shape)
+        return [(box(0, 0, 50, 10), 'текст', 0.9)]
+
+
+def test_recognize_maps_region_boxes_to_frame():
+    reader = FakeReader()
+    frame = np.zeros((1080, 1920, 3), np.uint8)
+    results = ocr.recognize(reader, frame, [Region(0, 0.75, 1, 0.25), Region(100, 50, 200, 100)])
+    assert reader.shapes == [(270, 1920, 3), (100, 200, 3)]
+    assert [bbox for bbox, _, _ in results] == [box(0, 810, 50, 820), box(100, 50, 150, 60)]
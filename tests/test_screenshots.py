@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.screenshots import ScreenshotFormat, ScreenshotWriter
+from src.stage_timers import SCREENSHOTS, StageTimers
+
+
+def frame(width=320, height=180):
+    image = np.zeros((height, width, 3), np.uint8)
+    cv2.putText(image, "ошибко", (10, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    image[:, width // 2:] = (40, 90, 160)
+    return image
+
+
+@pytest.mark.parametrize('screenshot_format, quality, extension', [
+    ('png', 9, '.png'),
+    ('jpeg', 80, '.jpg'),
+    ('webp', 80, '.webp'),
+])
+def test_formats(tmp_path, screenshot_format, quality, extension):
+    timers = StageTimers()
+    writer = ScreenshotWriter(tmp_path, ScreenshotFormat(screenshot_format, quality), timers=timers)
+    assert writer.submit(frame(), "frame_000025").result(timeout=10) == "frame_000025" + extension
+    writer.close()
+
+    image = cv2.imread(str(tmp_path / ("frame_000025" + extension)))
+    assert image.shape == (180, 320, 3)
+    if screenshot_format == 'png':
+        assert np.array_equal(image, frame())
+    assert writer.written == 1 and not writer.failed
+    assert timers.to_dict()[SCREENSHOTS]['count'] == 1
+    assert str(writer).startswith(f"сохранено 1 ({screenshot_format})")
+
+
+def test_params():
+    assert ScreenshotFormat('jpeg').params() == []
+    assert ScreenshotFormat('jpeg', 70).params() == [cv2.IMWRITE_JPEG_QUALITY, 70]
+    assert ScreenshotFormat('png', 3).params() == [cv2.IMWRITE_PNG_COMPRESSION, 3]
+
+
+@pytest.mark.parametrize('screenshot_format, quality, thumbnail_width', [
+    ('bmp', None, 0),
+    ('png', 10, 0),
+    ('jpeg', 0, 0),
+    ('webp', 101, 0),
+    ('png', None, -1),
+])
+def test_invalid_format(screenshot_format, quality, thumbnail_width):
+    with pytest.raises(ValueError):
+        ScreenshotFormat(screenshot_format, quality, thumbnail_width)
+
+
+def test_thumbnails(tmp_path):
+    writer = ScreenshotWriter(tmp_path / "кадры", ScreenshotFormat('jpeg', thumbnail_width=160))
+    (tmp_path / "кадры").mkdir()
+    writer.submit(frame(), "large").result(timeout=10)
+    # Кадр не шире уменьшенной копии сохраняется без нее
+    writer.submit(frame(120, 60), "small").result(timeout=10)
+    writer.close()
+
+    assert sorted(path.name for path in (tmp_path / "кадры").iterdir()) == \
+        ["large.jpg", "large_thumb.jpg", "small.jpg"]
+    assert cv2.imread(str(tmp_path / "кадры" / "large_thumb.jpg")).shape == (90, 160, 3)
+
+
+def test_write_error_is_reported(tmp_path):
+    writer = ScreenshotWriter(tmp_path / "missing", ScreenshotFormat('png'))
+    written = writer.submit(frame(), "frame")
+    with pytest.raises(Exception):
+        written.result(timeout=10)
+    writer.close()
+    assert writer.written == 0
+    assert len(writer.failed) == 1 and writer.failed[0].startswith("frame.png: ")
+    assert "ошибок записи: 1" in str(writer)
@@ -0,0 +1,148 @@
+import time
+
+from src.spelling import LruCache, Misspelling, SuggestionCache
+from src.video_speller import VideoSpellChecker
+
+MISSPELLING = Misspelling('слво', 'ru')
+
+
+class SlowSuggester:
+    """Suggest из spylls: проверяет кандидатов через lookup и перебирает словарь"""
+
+    def __init__(self, found=()):
+        self.lookup = self
+        self.words_for_ngram = ['слово'] * 100000
+        self.found = found
+        self.checked = 0
+
+    def good_forms(self, word, **kwargs):
+        time.sleep(0.001)
+        self.checked += 1
+        return iter(())
+
+    def __call__(self, word):
+        yield from self.found
+        for candidate in 'абвгдежзийклмнопрстуфхцчшщ' * 100:
+            if any(self.lookup.good_forms(word + candidate)):
+                yield word + candidate
+        for _ in self.words_for_ngram:
+            pass
+
+
+class Dictionary:
+    def __init__(self, suggester):
+        self.suggester = suggester
+        self.calls = 0
+
+    def suggest(self, word):
+        self.calls += 1
+        yield from self.suggester(word)
+
+
+def test_limit_and_cache():
+    dictionary = Dictionary(SlowSuggester(found=['слово', 'слава', 'сливо', 'сова']))
+    cache = SuggestionCache(limit=3)
+    assert cache.get(dictionary, MISSPELLING) == ['слово', 'слава', 'сливо']
+    assert cache.get(dictionary, MISSPELLING) == ['слово', 'слава', 'сливо']
+    assert cache.computed == 1
+    assert cache.timed_out == 0
+
+
+def test_search_without_suggestions_is_interrupted():
+    suggester = SlowSuggester()
+    cache = SuggestionCache(timeout=0.05)
+    started = time.perf_counter()
+    assert cache.get(Dictionary(suggester), MISSPELLING) == []
+    assert time.perf_counter() - started < 0.5
+    assert cache.timed_out == 1
+    # Словарь не изменен: поиск прерывался в копии Suggest
+    assert suggester.lookup is suggester
+
+
+def test_dictionary_scan_is_interrupted():
+    suggester = SlowSuggester()
+    suggester.words_for_ngram = range(10 ** 9)
+    suggester.good_forms = lambda word, **kwargs: iter(())
+    cache = SuggestionCache(timeout=0.05)
+    started = time.perf_counter()
+    assert cache.get(Dictionary(suggester), MISSPELLING) == []
+    assert time.perf_counter() - started < 0.5
+    assert cache.timed_out == 1
+
+
+def test_suggestions_found_before_deadline_are_kept():
+    cache = SuggestionCache(timeout=0.05)
+    assert cache.get(Dictionary(SlowSuggester(found=['слово'])), MISSPELLING) == ['слово']
+    assert cache.timed_out == 1
+
+
+def test_other_dictionaries_checked_between_suggestions():
+    class Slow:
+        def suggest(self, word):
+            while True:
+                time.sleep(0.01)
+                yield word
+
+    cache = SuggestionCache(limit=1000, timeout=0.05)
+    started = time.perf_counter()
+    assert 0 < len(cache.get(Slow(), MISSPELLING)) < 1000
+    assert time.perf_counter() - started < 0.5
+    assert cache.timed_out == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LruCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert str(cache) == "попаданий 3, промахов 1 (75%)"
+
+
+def test_lru_cache_view_shares_entries():
+    cache = LruCache(10)
+    cache.put('a', False)
+    view = cache.view()
+    assert view.get('a') is False
+    view.put('b', True)
+    assert cache.get('b') is True
+    assert (view.hits, cache.hits) == (1, 1)
+    cache.reset_stats()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 2)
+
+
+class CountingDictionary:
+    """Словарь spylls, считающий обращения к lookup"""
+
+    def __init__(self, words):
+        self.words = set(words)
+        self.lookups = []
+
+    def lookup(self, word):
+        self.lookups.append(word)
+        return word in self.words
+
+
+def checker_without_models(ru_words=(), en_words=()):
+    checker = VideoSpellChecker.__new__(VideoSpellChecker)
+    checker.custom_words = None
+    checker.form_indexes = {}
+    checker.spell_ru = CountingDictionary(ru_words)
+    checker.spell_en = CountingDictionary(en_words)
+    checker._init_spelling_cache()
+    return checker
+
+
+def test_verdicts_are_cached_per_language_and_word():
+    checker = checker_without_models(ru_words=['мир'], en_words=['world'])
+    assert checker.find_misspellings("мир world мпр") == [Misspelling('мпр', 'ru')]
+    assert checker.find_misspellings("мир world мпр World") == [Misspelling('мпр', 'ru')]
+    # Повторные слова не доходят до словаря; слово в другом регистре - отдельный ключ
+    assert checker.spell_ru.lookups == ['мир', 'мпр']
+    assert checker.spell_en.lookups == ['world', 'World', 'world']
+    assert (checker.verdict_cache.hits, checker.verdict_cache.misses) == (3, 4)
+    assert checker.verdict_cache.get(('en', 'мир')) is None
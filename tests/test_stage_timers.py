@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from src import stage_timers
+from src.stage_timers import (DECODE, OCR_BATCH, RESULTS, SPELLING, LoopProfiler, StageTimer, StageTimers,
+                              format_duration)
+
+
+def timer_with(values) -> StageTimer:
+    timer = StageTimer("этап")
+    for value in values:
+        timer.add(value)
+    return timer
+
+
+@pytest.mark.parametrize('count, q, expected', [
+    (1, 50, 1), (1, 95, 1),
+    (4, 50, 2), (5, 50, 3), (10, 50, 5),
+    (20, 95, 19), (100, 95, 95), (101, 95, 96),
+    (10, 0, 1), (10, 100, 10),
+])
+def test_percentile_is_nearest_rank(count, q, expected):
+    # Значения добавляются в обратном порядке: процентиль не зависит от порядка
+    assert timer_with(range(count, 0, -1)).percentile(q) == expected
+
+
+def test_empty_timer():
+    timer = StageTimer("этап")
+    assert timer.percentile(50) == 0.0
+    assert timer.to_dict() == {'count': 0, 'total': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+
+def test_to_dict_and_str():
+    timer = timer_with([0.004, 0.001, 0.002, 0.003])
+    assert timer.to_dict() == {'count': 4, 'total': 0.01, 'p50': 0.002, 'p95': 0.004, 'max': 0.004}
+    assert str(timer) == "этап: 4 раз, всего 0.01 с, медиана 2.0 мс, p95 4.0 мс, макс. 4.0 мс"
+
+
+def test_samples_are_bounded(monkeypatch):
+    monkeypatch.setattr(stage_timers, 'MAX_SAMPLES', 100)
+    timer = timer_with(range(1, 1001))
+    assert len(timer._samples) == 100
+    assert (timer.count, timer.total, timer.max) == (1000, 500500, 1000)
+    # Случайная выборка из всех операций, а не первые MAX_SAMPLES
+    assert 350 < timer.percentile(50) < 650
+
+
+def test_stages_in_processing_order():
+    timers = StageTimers()
+    for name in (RESULTS, "свой этап", SPELLING, DECODE, OCR_BATCH):
+        timers.add(name, 0.1)
+    with timers.measure(SPELLING):
+        pass
+    assert list(timers.to_dict()) == [DECODE, OCR_BATCH, SPELLING, RESULTS, "свой этап"]
+    assert timers.to_dict()[SPELLING]['count'] == 2
+
+
+def test_iterate_measures_each_item():
+    timers = StageTimers()
+    assert list(timers.iterate(DECODE, iter("абв"))) == ["а", "б", "в"]
+    assert timers.to_dict()[DECODE]['count'] == 3
+
+
+def test_add_from_threads():
+    timers = StageTimers()
+    threads = [threading.Thread(target=lambda: [timers.add(SPELLING, 0.001) for _ in range(1000)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timers.to_dict()[SPELLING]['count'] == 4000
+
+
+@pytest.mark.parametrize('seconds, expected', [
+    (0, "0:00"), (59.6, "1:00"), (65, "1:05"), (3725, "1:02:05"),
+])
+def test_format_duration(seconds, expected):
+    assert format_duration(seconds) == expected
+
+
+def test_loop_profiler(tmp_path):
+    profiler = LoopProfiler(tmp_path / "profile.prof")
+    assert profiler.dump() is None
+    with profiler.thread():
+        sum(range(1000))
+    assert profiler.dump() == tmp_path / "profile.prof"
+    assert (tmp_path / "profile.prof").stat().st_size > 0
@@ -0,0 +1,71 @@
+import random
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_end_to_end import SENTENCES_EN, SENTENCES_RU, SUITES, make_slides, misspell, plant_typo
+from benchmarks.synthetic import Slide, TextRenderer, slide_at, write_slides_video
+from src.spelling import Misspelling
+from src.tokenizer import normalize
+
+
+class Checker:
+    """Проверка со словарем из слов эталонных фраз"""
+
+    def __init__(self):
+        self.words = {normalize(word) for line in SENTENCES_RU + SENTENCES_EN for word in line.split()}
+
+    def find_misspellings(self, text):
+        return [Misspelling(word, 'ru') for word in text.split() if normalize(word) not in self.words]
+
+
+def test_slides_video(tmp_path):
+    slides = [Slide(("Welcome to the course",), 0.4), Slide(("Chapter one", "Data types"), 0.2, caption=True)]
+    path = str(tmp_path / "slides.avi")
+    spans = write_slides_video(path, slides, size=(320, 180), fps=10, background=False,
+                               renderer=TextRenderer())
+    assert [(span.start_frame, span.end_frame) for span in spans] == [(0, 4), (4, 6)]
+    assert [slide_at(spans, frame_num) for frame_num in (0, 3, 4, 5, 6)] == \
+        [slides[0], slides[0], slides[1], slides[1], None]
+
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    assert len(frames) == 6
+    # Текст отрисован; субтитры - в нижней половине кадра
+    bright = [np.argwhere(frame.max(axis=2) > 128) for frame in frames]
+    assert all(len(points) for points in bright)
+    assert bright[0][:, 0].mean() < 120 < bright[4][:, 0].min()
+
+
+def test_misspell_is_reproducible():
+    words = ["программирования", "Variables", "внимание"]
+    first = [misspell(word, random.Random(7)) for word in words]
+    assert first == [misspell(word, random.Random(7)) for word in words]
+    for word, typo in zip(words, first):
+        assert abs(len(typo) - len(word)) <= 1
+        assert typo[0] == word[0]
+
+
+def test_planted_typo_is_an_error():
+    checker = Checker()
+    line, typo = plant_typo("Сегодня мы изучим основы программирования", checker, random.Random(3))
+    assert typo is not None and typo in line.split()
+    assert checker.find_misspellings(line) == [Misspelling(typo, 'ru')]
+    # В строке без длинных слов опечатку не вносим
+    assert plant_typo("мы и он", checker, random.Random(3)) == ("мы и он", None)
+
+
+def test_make_slides():
+    scenario = SUITES['quick'][2]
+    slides, planted = make_slides(scenario, SENTENCES_RU, Checker(), 1.0, random.Random("1:captions"))
+    assert (slides, planted) == make_slides(scenario, SENTENCES_RU, Checker(), 1.0, random.Random("1:captions"))
+    assert len(slides) == scenario.slides
+    assert all(slide.caption and len(slide.lines) == 1 for slide in slides)
+    found = {normalize(m.word) for slide in slides for m in Checker().find_misspellings(slide.lines[0])}
+    assert planted == found and planted
@@ -0,0 +1,58 @@
+from src.tokenizer import CYRILLIC, LATIN, MIXED, normalize, script_of, tokenize
+
+
+def test_normalize():
+    assert normalize('Ёлка') == 'елка'
+    assert normalize('NASA') == 'nasa'
+
+
+def test_script_of():
+    assert script_of('слово') == CYRILLIC
+    assert script_of('кто-то') == CYRILLIC
+    assert script_of('word') == LATIN
+    assert script_of('Wi-Fi') == LATIN
+    assert script_of('сoм') == MIXED  # латинская "o"
+
+
+def test_words_and_punctuation():
+    tokens = tokenize('«Привет», мир! Hello, world...')
+    assert [token.text for token in tokens] == ['Привет', 'мир', 'Hello', 'world']
+    assert [token.script for token in tokens] == [CYRILLIC, CYRILLIC, LATIN, LATIN]
+    assert tokens[2].normalized == 'hello'
+
+
+def test_normalized_form():
+    token, = tokenize('Ёжик')
+    assert token.text == 'Ёжик'
+    assert token.normalized == 'ежик'
+    assert token.script == CYRILLIC
+
+
+def test_hyphenated_words_stay_whole():
+    assert [token.text for token in tokenize('кто-то прислал e-mail')] == ['кто-то', 'прислал', 'e-mail']
+
+
+def test_line_break_hyphenation_is_joined():
+    tokens = tokenize('информа-\nционные  техноло- \n гии')
+    assert [token.text for token in tokens] == ['информационные', 'технологии']
+
+
+def test_words_inside_chunk():
+    tokens = tokenize('iPhone15Pro 2024г. 123 --')
+    assert [(token.text, token.script) for token in tokens] == [('iPhone', LATIN), ('Pro', LATIN), ('г', CYRILLIC)]
+
+
+def test_mixed_script_word():
+    token, = tokenize('Tеst')  # кириллическая "е"
+    assert token.script == MIXED
+
+
+def test_skip_chunk_and_words():
+    skipped = {'https://example.com/page', 'Pro'}
+    tokens = tokenize('см. https://example.com/page и iPhone15Pro', skip=skipped.__contains__)
+    assert [token.text for token in tokens] == ['см', 'и', 'iPhone']
+
+
+def test_empty_text():
+    assert tokenize('') == []
+    assert tokenize(' \n\t.,') == []
@@ -0,0 +1,118 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src import transcript
+from src.transcript import (HASH_CACHE_NAME, Transcript, TranscriptWriter, content_hash, transcript_key,
+                            transcript_key_async, transcript_path)
+
+FRAMES = SimpleNamespace(fps=25.0, total_frames=300, start_frame=0, end_frame=300, frame_interval=50)
+BOX = [[0, 0], [100, 0], [100, 20], [0, 20]]
+
+
+def make_key(video, **settings):
+    values = {'interval': 2, 'start_time': 0.0, 'end_time': None, 'sampling': 'auto',
+              'change_threshold': 0.001, 'regions': None, 'auto_roi_frames': 0, 'ocr_profile': 'balanced'}
+    values.update(settings)
+    return transcript_key(video, **values)
+
+
+def test_write_and_load(tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    key = make_key(video)
+    path = transcript_path(tmp_path, key)
+
+    writer = TranscriptWriter(tmp_path, key, FRAMES)
+    writer.add(0, 0.0, False, [(BOX, "Превет", 0.91234)])
+    writer.add(50, 2.0, True, None)
+    writer.add(100, 4.0, False, [])
+    assert not path.exists()
+    assert writer.complete() == path
+    assert sorted(tmp_path.iterdir()) == sorted([video, path])
+
+    loaded = Transcript.load(path, key)
+    assert loaded.fps == 25.0 and len(loaded) == 3
+    assert list(loaded) == [
+        (0, 0.0, None, [(BOX, "Превет", 0.912)], False),
+        (50, 2.0, None, [(BOX, "Превет", 0.912)], True),
+        (100, 4.0, None, [], False),
+    ]
+    loaded.resume_after(50)
+    assert loaded.start_frame == 100 and len(loaded) == 1
+
+    assert Transcript.load(path, make_key(video, interval=3)) is None
+
+
+def test_discard_leaves_nothing(tmp_path):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    key = make_key(video)
+    writer = TranscriptWriter(tmp_path, key, FRAMES)
+    writer.add(0, 0.0, False, [])
+    writer.discard()
+    assert list(tmp_path.iterdir()) == [video]
+
+
+def test_key_computed_while_writing(tmp_path, monkeypatch):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    release = threading.Event()
+    hash_file = transcript.content_hash
+
+    def slow_hash(path, cache_dir=None):
+        release.wait(5)
+        return hash_file(path, cache_dir)
+
+    monkeypatch.setattr(transcript, 'content_hash', slow_hash)
+    settings = {'interval': 2, 'start_time': 0.0, 'end_time': None, 'sampling': 'auto',
+                'change_threshold': 0.001, 'regions': None, 'auto_roi_frames': 0, 'ocr_profile': 'balanced'}
+    key = transcript_key_async(video, **settings, cache_dir=tmp_path)
+
+    # Кадры пишутся, пока видео хэшируется
+    writer = TranscriptWriter(tmp_path, key, FRAMES)
+    writer.add(0, 0.0, False, [(BOX, "Превет", 0.9)])
+    assert not key.done()
+
+    release.set()
+    path = writer.complete()
+    assert path == transcript_path(tmp_path, make_key(video))
+    loaded = Transcript.load(path, make_key(video))
+    assert list(loaded) == [(0, 0.0, None, [(BOX, "Превет", 0.9)], False)]
+
+
+def test_key_error_discards_transcript(tmp_path):
+    key = transcript_key_async(tmp_path / "missing.mp4", 2, 0.0, None, 'auto', 0.001, None, 0, 'balanced')
+    writer = TranscriptWriter(tmp_path, key, FRAMES)
+    writer.add(0, 0.0, False, [])
+    with pytest.raises(FileNotFoundError):
+        writer.complete()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_key_follows_content_not_path(tmp_path):
+    first, second = tmp_path / "a.mp4", tmp_path / "b.mp4"
+    first.write_bytes(b"same")
+    second.write_bytes(b"same")
+    assert make_key(first) == make_key(second)
+    assert make_key(first) != make_key(first, regions=["0,0,1,0.5"])
+
+
+def test_content_hash_is_cached(tmp_path, monkeypatch):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"frames")
+    expected = content_hash(video, tmp_path)
+    saved = json.loads((tmp_path / HASH_CACHE_NAME).read_text(encoding='utf-8'))
+    assert saved[str(video.resolve())]['hash'] == expected
+
+    # Новый процесс: хэш берется из файла, видео не читается
+    monkeypatch.setattr(transcript, '_hashes', {})
+    monkeypatch.setattr(transcript.hashlib, 'blake2b', None)
+    assert content_hash(video, tmp_path) == expected
+
+    # Изменившийся файл хэшируется заново
+    monkeypatch.undo()
+    video.write_bytes(b"other frames")
+    assert content_hash(video, tmp_path) != expected
@@ -0,0 +1,72 @@
+from spylls.hunspell import Dictionary
+
+from src.wordform_index import WordFormIndex, build_index, expand_forms
+
+AFF = """SET UTF-8
+NEEDAFFIX X
+
+SFX A Y 2
+SFX A 0 ы .
+SFX A 0 ами/C .
+
+SFX C Y 1
+SFX C 0 ся .
+
+PFX B Y 1
+PFX B 0 пере .
+"""
+
+DIC = ["стол/A", "писать/AB", "корень/AX", "кот"]
+
+# Слова, которых нет в индексе: отсутствующие в словаре и формы в другом
+# регистре (их принимает spylls, но без помощи индекса)
+OTHER_WORDS = ["коты", "корень", "столся", "пере", "перекот", "Стол", "СТОЛЫ"]
+
+
+def write_dictionary(base_path, aff: str, words: list):
+    base_path.with_name(base_path.name + ".aff").write_text(aff, encoding='utf-8')
+    base_path.with_name(base_path.name + ".dic").write_text(f"{len(words)}\n" + "\n".join(words) + "\n",
+                                                           encoding='utf-8')
+
+
+def agrees_with_spylls(index: WordFormIndex, dictionary: Dictionary, words) -> bool:
+    """Каждое попадание в индекс принимает spylls, и все принятые spylls формы основ есть в индексе"""
+    forms = set(expand_forms(dictionary))
+    return (all(dictionary.lookup(word) for word in words if word in index)
+            and all(form in index for form in forms if dictionary.lookup(form)))
+
+
+def test_index_agrees_with_spylls(tmp_path):
+    base_path = tmp_path / "ru_TEST"
+    write_dictionary(base_path, AFF, DIC)
+    dictionary = Dictionary.from_files(str(base_path))
+    index = build_index(base_path, dictionary, log=lambda message: None)
+
+    forms = set(expand_forms(dictionary))
+    assert {"столы", "столами", "столамися", "переписать", "переписатьы", "кореньы"} <= forms
+    assert agrees_with_spylls(index, dictionary, forms | set(OTHER_WORDS))
+    # Основа с NEEDAFFIX в индекс не попадает
+    assert "корень" in forms and "корень" not in index
+    for word in OTHER_WORDS:
+        assert word not in index
+    assert len(index) == sum(1 for form in forms if dictionary.lookup(form))
+
+
+def test_bundled_fixture_dictionary(tiny_dictionary):
+    dictionary = Dictionary.from_files(str(tiny_dictionary))
+    index = build_index(tiny_dictionary, dictionary, log=lambda message: None)
+    assert agrees_with_spylls(index, dictionary, set(expand_forms(dictionary)) | set(OTHER_WORDS))
+    assert "Москва" in index and "москва" not in index
+
+
+def test_load_checks_dictionary_files(tmp_path):
+    base_path = tmp_path / "ru_TEST"
+    write_dictionary(base_path, AFF, DIC)
+    assert WordFormIndex.load(base_path) is None
+
+    build_index(base_path, log=lambda message: None)
+    index = WordFormIndex.load(base_path)
+    assert "столы" in index
+
+    write_dictionary(base_path, AFF, DIC + ["стул/A"])
+    assert WordFormIndex.load(base_path) is None